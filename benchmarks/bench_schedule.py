@@ -0,0 +1,116 @@
+"""Benchmark the schedule codec against the original bit-walking decoder.
+
+Simulates one poll worth of schedule diagnostic sensor reads (70 AM/PM pairs:
+DHW, heat pump, silent mode and seven circuits) using the schedule words from
+the test fixture, and times the original per-bit loop against the cached codec.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_schedule [--number N]
+"""
+
+import argparse
+import json
+from pathlib import Path
+import timeit
+
+from custom_components.econext.climate import CIRCUITS
+from custom_components.econext.const import DHW_SCHEDULE, HEATPUMP_SCHEDULE, SILENT_MODE_SCHEDULE
+from custom_components.econext.schedule import decode_day, mask_runs
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "parameters.json"
+
+
+def legacy_decode_schedule_bitfield(value: int, is_am: bool = True) -> str:
+    """Copy of the original sensor.decode_schedule_bitfield, kept as the baseline."""
+    if value == 0:
+        return "No active periods"
+
+    ranges = []
+    start_bit = None
+    start_offset = 0 if is_am else 24
+
+    for bit in range(24):
+        is_set = (value >> bit) & 1
+
+        if is_set and start_bit is None:
+            start_bit = bit
+        elif not is_set and start_bit is not None:
+            start_hour = (start_offset + start_bit) // 2
+            start_min = ((start_offset + start_bit) % 2) * 30
+            end_hour = (start_offset + bit) // 2
+            end_min = ((start_offset + bit) % 2) * 30
+            ranges.append(f"{start_hour:02d}:{start_min:02d}-{end_hour:02d}:{end_min:02d}")
+            start_bit = None
+
+    if start_bit is not None:
+        start_hour = (start_offset + start_bit) // 2
+        start_min = ((start_offset + start_bit) % 2) * 30
+        end_hour = (start_offset + 24) // 2
+        end_min = 0
+        ranges.append(f"{start_hour:02d}:{start_min:02d}-{end_hour:02d}:{end_min:02d}")
+
+    return ", ".join(ranges)
+
+
+def legacy_decode_day(am: int, pm: int) -> str:
+    """Combine AM and PM the way the original diagnostic sensor did."""
+    am_decoded = legacy_decode_schedule_bitfield(am, is_am=True)
+    pm_decoded = legacy_decode_schedule_bitfield(pm, is_am=False)
+    if am_decoded == "No active periods" and pm_decoded == "No active periods":
+        return "No active periods"
+    if am_decoded == "No active periods":
+        return pm_decoded
+    if pm_decoded == "No active periods":
+        return am_decoded
+    return f"{am_decoded}, {pm_decoded}"
+
+
+def load_pairs() -> list[tuple[int, int]]:
+    """Return the (am, pm) word pairs of every schedule in the fixture."""
+    params = json.loads(FIXTURE.read_text())
+    param_ids = [
+        *DHW_SCHEDULE.param_ids,
+        *HEATPUMP_SCHEDULE.param_ids,
+        *SILENT_MODE_SCHEDULE.param_ids,
+        *(pair for circuit in CIRCUITS.values() for pair in circuit.schedule_param_ids),
+    ]
+    # Circuits missing from the fixture count as empty schedules
+    return [(int(params.get(am, {}).get("value", 0)), int(params.get(pm, {}).get("value", 0))) for am, pm in param_ids]
+
+
+def main() -> None:
+    """Run the benchmark and print per-poll timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Polls to simulate per measurement")
+    args = parser.parse_args()
+
+    pairs = load_pairs()
+    mismatches = [pair for pair in pairs if legacy_decode_day(*pair) != decode_day(*pair)]
+    if mismatches:
+        raise SystemExit(f"Codec output differs from the original for {mismatches}")
+
+    def run_legacy() -> None:
+        for am, pm in pairs:
+            legacy_decode_day(am, pm)
+
+    def run_codec() -> None:
+        for am, pm in pairs:
+            decode_day(am, pm)
+
+    def run_codec_cold() -> None:
+        decode_day.cache_clear()
+        mask_runs.cache_clear()
+        run_codec()
+
+    print(f"{len(pairs)} schedule reads per poll, {args.number} polls")
+    results = {}
+    for name, func in (("legacy", run_legacy), ("codec (cold)", run_codec_cold), ("codec (cached)", run_codec)):
+        seconds = min(timeit.repeat(func, number=args.number, repeat=5))
+        results[name] = seconds
+        print(f"  {name:<16} {seconds / args.number * 1e6:9.1f} us/poll")
+    print(f"  speedup (cached) {results['legacy'] / results['codec (cached)']:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Shared fixtures for the benchmarks.
+
+Builds the controller data the benchmarks run against: the test fixture as
+is, a variant with all seven heating circuits active, the gateway wire formats
+(JSON, and MessagePack if installed) of either, and a minimal aiohttp session
+that serves a prepared payload.
+"""
+
+import copy
+from dataclasses import fields
+import json
+from pathlib import Path
+from typing import Any, Self
+
+from custom_components.econext.climate import CIRCUITS
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "parameters.json"
+
+# The only circuit active in the fixture; the others are cloned from it
+TEMPLATE_CIRCUIT = 2
+
+
+def load_params() -> dict[str, dict[str, Any]]:
+    """Load the fixture parameters, keyed by index."""
+    return json.loads(FIXTURE.read_text())
+
+
+def seven_circuit_params() -> dict[str, dict[str, Any]]:
+    """Return the fixture with every circuit active.
+
+    Each circuit parameter takes the value of the matching circuit 2
+    parameter; parameters missing from the fixture are added, named after
+    the circuit field so writes could address them.
+    """
+    params = copy.deepcopy(load_params())
+    template = CIRCUITS[TEMPLATE_CIRCUIT]
+    for number, circuit in CIRCUITS.items():
+        if number == TEMPLATE_CIRCUIT:
+            continue
+        for field in fields(circuit):
+            source = params.get(getattr(template, field.name))
+            if source is None:
+                continue
+            param_id = getattr(circuit, field.name)
+            target = params.setdefault(param_id, {**source, "name": f"circuit{number}_{field.name}"})
+            target["value"] = f"Circuit {number}" if field.name == "name_param" else source["value"]
+    return params
+
+
+def gateway_payload(params: dict[str, dict[str, Any]]) -> bytes:
+    """Encode parameters the way the gateway sends them."""
+    parameters = {
+        index: {
+            "index": int(index),
+            "name": param.get("name"),
+            "value": param.get("value"),
+            "type": param.get("type"),
+            "unit": param.get("unit"),
+            "writable": param.get("writable", False),
+            "min": param.get("minv"),
+            "max": param.get("maxv"),
+        }
+        for index, param in params.items()
+    }
+    return json.dumps({"timestamp": "2026-02-06T12:00:00", "parameters": parameters}).encode()
+
+
+def gateway_binary_payloads(params: dict[str, dict[str, Any]]) -> tuple[bytes, bytes]:
+    """Encode parameters in the MessagePack wire format; return the poll and schema bodies."""
+    parameters = json.loads(gateway_payload(params))["parameters"]
+    schema = [{key: value for key, value in param.items() if key != "value"} for param in parameters.values()]
+    poll = {
+        "timestamp": "2026-02-06T12:00:00",
+        "schema": "benchmark",
+        "values": [p["value"] for p in parameters.values()],
+    }
+    return msgpack.packb(poll), msgpack.packb({"schema": "benchmark", "parameters": schema})
+
+
+class _Response:
+    """Async context manager standing in for an aiohttp response."""
+
+    def __init__(self, body: bytes, headers: dict[str, str]) -> None:
+        self.status = 200
+        self.headers = headers
+        self._body = body
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self) -> Any:
+        return json.loads(self._body)
+
+
+class FakeSession:
+    """Serve fixed bodies for GET requests, keyed by URL path suffix.
+
+    ``headers`` are sent with every response, e.g. a Content-Encoding
+    matching pre-compressed bodies.
+    """
+
+    def __init__(self, bodies: dict[str, bytes], headers: dict[str, str] | None = None) -> None:
+        self._bodies = bodies
+        self._headers = headers or {}
+
+    def get(self, url: str, **kwargs: Any) -> _Response:
+        for suffix, body in self._bodies.items():
+            if url.endswith(suffix):
+                return _Response(body, self._headers)
+        raise KeyError(url)
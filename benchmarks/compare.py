@@ -0,0 +1,137 @@
+"""Compare benchmark results against a baseline.
+
+A benchmark regresses when its fastest-round time or its peak memory grows by
+more than the tolerance over the baseline. Faster or leaner results never
+fail, and benchmarks missing from either side are reported but not judged.
+
+Compare two saved runs:
+
+    python -m benchmarks.compare benchmarks/baseline.json results.json [--tolerance 0.25]
+
+or run and compare in one go with ``python -m benchmarks.run --compare``.
+"""
+
+import argparse
+from dataclasses import dataclass
+import json
+from pathlib import Path
+from typing import Any
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+
+# Metrics judged against the baseline; higher is worse for all of them
+METRICS = ("min_us", "peak_kib")
+
+# Peak memory below this is noise from the allocator and the tracer itself
+MIN_PEAK_KIB = 16.0
+
+
+@dataclass(slots=True)
+class Delta:
+    """Change of one metric of one benchmark relative to the baseline."""
+
+    benchmark: str
+    metric: str
+    baseline: float | None
+    current: float | None
+    tolerance: float
+
+    @property
+    def ratio(self) -> float | None:
+        """Return current / baseline, or None if either side is missing."""
+        if self.baseline is None or self.current is None:
+            return None
+        if self.baseline == 0:
+            return 1.0 if self.current == 0 else float("inf")
+        return self.current / self.baseline
+
+    @property
+    def status(self) -> str:
+        """Return ok, regressed, new or missing."""
+        if self.baseline is None:
+            return "new"
+        if self.current is None:
+            return "missing"
+        if self.metric == "peak_kib" and max(self.baseline, self.current) < MIN_PEAK_KIB:
+            return "ok"
+        return "regressed" if self.ratio > 1 + self.tolerance else "ok"
+
+
+def load(path: Path) -> dict[str, dict[str, Any]]:
+    """Load the per-benchmark results of a saved run."""
+    return json.loads(path.read_text())["benchmarks"]
+
+
+def compare(
+    baseline: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[Delta]:
+    """Return the deltas of every metric of every benchmark on either side."""
+    deltas: list[Delta] = []
+    for name in [*current, *(name for name in baseline if name not in current)]:
+        for metric in METRICS:
+            deltas.append(
+                Delta(
+                    benchmark=name,
+                    metric=metric,
+                    baseline=baseline.get(name, {}).get(metric),
+                    current=current.get(name, {}).get(metric),
+                    tolerance=tolerance,
+                )
+            )
+    return deltas
+
+
+def regressions(deltas: list[Delta]) -> list[Delta]:
+    """Return the deltas that exceed their tolerance."""
+    return [delta for delta in deltas if delta.status == "regressed"]
+
+
+def _format_value(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def print_deltas(deltas: list[Delta]) -> None:
+    """Print a per-benchmark delta table."""
+    print(f"{'benchmark':<26} {'metric':<9} {'baseline':>11} {'current':>11} {'delta':>9}  status")
+    for delta in deltas:
+        ratio = delta.ratio
+        change = "-" if ratio is None else f"{(ratio - 1) * 100:+.1f}%"
+        print(
+            f"{delta.benchmark:<26} {delta.metric:<9} {_format_value(delta.baseline):>11} "
+            f"{_format_value(delta.current):>11} {change:>9}  {delta.status}"
+        )
+
+
+def check(
+    baseline: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> bool:
+    """Print the delta table and a verdict; return True if nothing regressed."""
+    deltas = compare(baseline, current, tolerance)
+    print_deltas(deltas)
+    failed = regressions(deltas)
+    if failed:
+        print(f"\n{len(failed)} metric(s) regressed by more than {tolerance:.0%}")
+        return False
+    print(f"\nNo regressions beyond {tolerance:.0%}")
+    return True
+
+
+def main() -> None:
+    """Compare two saved runs and exit non-zero on a regression."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path, help="Baseline results JSON")
+    parser.add_argument("current", type=Path, help="Results JSON to check")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed growth, 0.25 = 25%%")
+    args = parser.parse_args()
+
+    if not check(load(args.baseline), load(args.current), args.tolerance):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Replay a recorded gateway session through the coordinator and all platforms.
+
+Feeds every poll of a session recorded with the ``econext.record_session``
+service to a coordinator with the full entity set attached, and reports the
+per-poll decode, mapping and dispatch cost on that real data.
+
+Run from the repository root:
+
+    python -m benchmarks.replay econext_session_<uid>_<stamp>.jsonl.gz [--speed N]
+
+Without ``--speed`` polls are replayed back-to-back; ``--speed 1`` replays at
+the recorded pace and ``--speed 60`` an hour per minute.
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+import time
+from typing import Any
+
+from custom_components.econext.api import map_gateway_params
+from custom_components.econext.metrics import RollingHistogram
+from custom_components.econext.recorder import read_session
+from custom_components.econext.replay import ReplayApi, async_replay
+
+from .run import Environment, stub_state_machine
+
+
+async def async_run(records: list[dict[str, Any]], speed: float | None) -> dict[str, Any]:
+    """Replay the records and return per-poll cost summaries."""
+    first = next(
+        (record for record in records if record["kind"] == "parameters" and record["status"] == 200),
+        None,
+    )
+    if first is None:
+        raise SystemExit("The session contains no parameter polls")
+
+    env = Environment(map_gateway_params(first["body"]))
+    await env.async_add_entities()
+    coordinator = env.coordinator
+    api = ReplayApi(records, speed)
+
+    dispatch_ms = RollingHistogram(api.polls)
+    notify = coordinator.async_update_listeners
+
+    def timed_update_listeners() -> None:
+        start = time.perf_counter()
+        notify()
+        dispatch_ms.add((time.perf_counter() - start) * 1000)
+
+    coordinator.async_update_listeners = timed_update_listeners
+
+    start = time.perf_counter()
+    polls = await async_replay(coordinator, api)
+    elapsed = time.perf_counter() - start
+
+    metrics = coordinator.metrics
+    return {
+        "polls": polls,
+        "entities": sum(len(entities) for entities in env.entities.values()),
+        "elapsed_s": round(elapsed, 3),
+        "decode_ms": metrics.decode_ms.summary(),
+        "mapping_ms": metrics.mapping_ms.summary(),
+        "dispatch_ms": dispatch_ms.summary(),
+        "changed_params": metrics.changed_params.summary(),
+        "state_writes": metrics.state_writes.summary(),
+    }
+
+
+def print_summary(summary: dict[str, Any]) -> None:
+    """Print the replay summary as a table."""
+    print(f"{summary['polls']} polls, {summary['entities']} entities, {summary['elapsed_s']}s")
+    print(f"{'per poll':<16} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for name in ("decode_ms", "mapping_ms", "dispatch_ms", "changed_params", "state_writes"):
+        stats = summary[name]
+        if not stats["count"]:
+            continue
+        print(f"{name:<16} {stats['mean']:9.2f} {stats['p50']:9.2f} {stats['p95']:9.2f} {stats['max']:9.2f}")
+
+
+def main() -> None:
+    """Replay a session file and print the per-poll costs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("session", type=Path, help="Session file from econext.record_session")
+    parser.add_argument("--speed", type=float, help="Replay speed, 1 = recorded pace (default: back-to-back)")
+    args = parser.parse_args()
+
+    records = list(read_session(args.session))
+    with stub_state_machine():
+        summary = asyncio.run(async_run(records, args.speed))
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
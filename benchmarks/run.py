@@ -0,0 +1,353 @@
+"""Benchmark the integration's hot paths.
+
+Times the work done on every poll and at startup, against the test fixture
+with all seven heating circuits active:
+
+- ``api_parse``: ``EconextApi.async_fetch_all_params`` decoding and mapping
+  the gateway payload (served from memory, no network)
+- ``api_parse_gzip``: the same with a gzip-encoded payload, adding the
+  decompression cost
+- ``api_parse_msgpack``: the same in the positional MessagePack format (only
+  if msgpack is installed)
+- ``coordinator_fanout``: notifying every entity of a data update, each one
+  rendering its state and attributes as it would for the state machine
+- ``setup_<platform>``: each platform's ``async_setup_entry``
+- ``decode_schedule_bitfield``: the AM/PM words of every schedule
+- ``climate_properties``: the climate properties read on each state write
+
+Each benchmark reports the per-operation time of the fastest, median and mean
+round (rounds are lengthened to at least 0.1s), and the peak memory allocated by one operation (traced separately, so
+tracemalloc does not skew the timings).
+
+Run from the repository root:
+
+    python -m benchmarks.run [--rounds N] [--filter NAME] [--output results.json]
+
+With ``--compare`` the run is checked against ``benchmarks/baseline.json`` (or
+the given file) and the command exits non-zero if a benchmark regressed by
+more than ``--tolerance``. Baselines are machine specific; refresh the
+committed one with ``--output benchmarks/baseline.json`` on the machine that
+runs the gate.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import gzip
+import importlib
+import inspect
+import json
+from pathlib import Path
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from homeassistant.helpers.entity import Entity
+from homeassistant.util.unit_system import METRIC_SYSTEM
+
+from custom_components.econext.api import EconextApi
+from custom_components.econext.climate import CIRCUITS, CircuitClimate
+from custom_components.econext.const import (
+    API_ENDPOINT_ALARMS,
+    API_ENDPOINT_PARAMETERS,
+    API_ENDPOINT_SCHEMA,
+    DHW_SCHEDULE,
+    DOMAIN,
+    HEATPUMP_SCHEDULE,
+    PLATFORMS,
+    SILENT_MODE_SCHEDULE,
+)
+from custom_components.econext.coordinator import EconextCoordinator
+from custom_components.econext.sensor import decode_schedule_bitfield
+from custom_components.econext.wire import MSGPACK_CONTENT_TYPE, binary_supported
+
+from .compare import DEFAULT_BASELINE, DEFAULT_TOLERANCE, check, load
+from .common import FakeSession, gateway_binary_payloads, gateway_payload, seven_circuit_params
+
+ENTRY_ID = "benchmark"
+
+# Rounds are lengthened until they take at least this long
+MIN_ROUND_SECONDS = 0.1
+
+CLIMATE_PROPERTIES = (
+    "current_temperature",
+    "target_temperature",
+    "hvac_mode",
+    "hvac_modes",
+    "hvac_action",
+    "preset_mode",
+    "supported_features",
+    "available",
+)
+
+
+@dataclass
+class Benchmark:
+    """A timed operation."""
+
+    name: str
+    func: Callable[[], Any | Awaitable[Any]]
+    # Minimum operations per timed round
+    number: int
+
+
+@dataclass
+class Result:
+    """Per-operation timings and peak memory of a benchmark."""
+
+    min_us: float
+    median_us: float
+    mean_us: float
+    peak_kib: float
+    number: int
+    rounds: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result rounded for the JSON report."""
+        return {
+            "min_us": round(self.min_us, 3),
+            "median_us": round(self.median_us, 3),
+            "mean_us": round(self.mean_us, 3),
+            "peak_kib": round(self.peak_kib, 3),
+            "number": self.number,
+            "rounds": self.rounds,
+        }
+
+
+def _render_state(self: Entity) -> None:
+    """Stand-in for ``Entity.async_write_ha_state`` that renders but does not store the state."""
+    self._async_calculate_state()
+
+
+class Environment:
+    """A coordinator, its entities and a mock hass, shared by the benchmarks."""
+
+    def __init__(self, params: dict[str, dict[str, Any]] | None = None) -> None:
+        """Build the environment from the given parameters, or the seven-circuit fixture."""
+        self.params = params if params is not None else seven_circuit_params()
+        self.payload = gateway_payload(self.params)
+        session = FakeSession({API_ENDPOINT_PARAMETERS: self.payload, API_ENDPOINT_ALARMS: b'{"alarms": []}'})
+        self.api = EconextApi("gateway.local", 8000, session)
+        gzip_session = FakeSession(
+            {API_ENDPOINT_PARAMETERS: gzip.compress(self.payload, compresslevel=6)}, {"Content-Encoding": "gzip"}
+        )
+        self.gzip_api = EconextApi("gateway.local", 8000, gzip_session)
+        self.binary_api: EconextApi | None = None
+        if binary_supported():
+            poll, schema = gateway_binary_payloads(self.params)
+            binary_session = FakeSession(
+                {API_ENDPOINT_PARAMETERS: poll, API_ENDPOINT_SCHEMA: schema}, {"Content-Type": MSGPACK_CONTENT_TYPE}
+            )
+            self.binary_api = EconextApi("gateway.local", 8000, binary_session)
+
+        self.hass = MagicMock()
+        self.hass.loop_thread_id = threading.get_ident()
+        self.hass.config.units = METRIC_SYSTEM
+        self.hass.is_stopping = False
+        self.entry = MagicMock(entry_id=ENTRY_ID)
+        self.coordinator = EconextCoordinator(self.hass, self.api)
+        self.coordinator.data = self.params
+        self.hass.data = {DOMAIN: {ENTRY_ID: {"coordinator": self.coordinator}}}
+
+        self.entities: dict[str, list[Entity]] = {}
+
+    async def async_setup_platform(self, platform_name: str) -> list[Entity]:
+        """Run a platform's async_setup_entry and return the entities it created."""
+        module = importlib.import_module(f"custom_components.econext.{platform_name}")
+        entities: list[Entity] = []
+        await module.async_setup_entry(self.hass, self.entry, entities.extend)
+        return entities
+
+    async def async_add_entities(self) -> None:
+        """Set up every platform and subscribe its entities to the coordinator."""
+        for platform_name in PLATFORMS:
+            self.entities[platform_name] = await self.async_setup_platform(platform_name)
+            for index, entity in enumerate(self.entities[platform_name]):
+                entity.hass = self.hass
+                entity.platform = SimpleNamespace(
+                    platform_name=DOMAIN,
+                    domain=platform_name,
+                    platform_translations={},
+                    component_translations={},
+                    default_language_platform_translations={},
+                )
+                entity.entity_id = f"{platform_name}.{DOMAIN}_{index}"
+                self.coordinator.async_add_listener(entity._handle_coordinator_update)
+
+
+def schedule_words() -> list[tuple[int, bool]]:
+    """Return (word, is_am) for every schedule word of a seven-circuit controller."""
+    params = seven_circuit_params()
+    pairs = [
+        *DHW_SCHEDULE.param_ids,
+        *HEATPUMP_SCHEDULE.param_ids,
+        *SILENT_MODE_SCHEDULE.param_ids,
+        *(pair for circuit in CIRCUITS.values() for pair in circuit.schedule_param_ids),
+    ]
+    words: list[tuple[int, bool]] = []
+    for am, pm in pairs:
+        words.append((int(params.get(am, {}).get("value", 0)), True))
+        words.append((int(params.get(pm, {}).get("value", 0)), False))
+    return words
+
+
+def build_benchmarks(env: Environment) -> list[Benchmark]:
+    """Return the benchmarks, in report order."""
+    words = schedule_words()
+    climates: list[CircuitClimate] = env.entities["climate"]
+
+    def decode_words() -> None:
+        for value, is_am in words:
+            decode_schedule_bitfield(value, is_am)
+
+    def read_climate_properties() -> None:
+        for entity in climates:
+            for name in CLIMATE_PROPERTIES:
+                getattr(entity, name)
+
+    benchmarks = [
+        Benchmark("api_parse", env.api.async_fetch_all_params, 50),
+        Benchmark("api_parse_gzip", env.gzip_api.async_fetch_all_params, 50),
+        *([Benchmark("api_parse_msgpack", env.binary_api.async_fetch_all_params, 50)] if env.binary_api else []),
+        Benchmark("coordinator_fanout", env.coordinator.async_update_listeners, 20),
+        *(Benchmark(f"setup_{name}", lambda name=name: env.async_setup_platform(name), 20) for name in PLATFORMS),
+        Benchmark("decode_schedule_bitfield", decode_words, 2000),
+        Benchmark("climate_properties", read_climate_properties, 500),
+    ]
+    return benchmarks
+
+
+async def _call(func: Callable[[], Any | Awaitable[Any]]) -> None:
+    """Call a benchmarked function, awaiting it if it is async."""
+    result = func()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def _async_time_round(func: Callable[[], Any | Awaitable[Any]], number: int) -> float:
+    """Return the seconds taken by ``number`` calls."""
+    start = time.perf_counter()
+    for _ in range(number):
+        await _call(func)
+    return time.perf_counter() - start
+
+
+async def async_measure(benchmark: Benchmark, rounds: int) -> Result:
+    """Time a benchmark over several rounds, then trace one operation's peak memory."""
+    await _call(benchmark.func)  # Warm up caches and lazy imports
+
+    # Grow short rounds until they outlast timer and scheduler noise
+    number = benchmark.number
+    while await _async_time_round(benchmark.func, number) < MIN_ROUND_SECONDS:
+        number *= 2
+
+    timings: list[float] = []
+    for _ in range(rounds):
+        timings.append(await _async_time_round(benchmark.func, number) / number * 1e6)
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        await _call(benchmark.func)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        min_us=min(timings),
+        median_us=statistics.median(timings),
+        mean_us=statistics.fmean(timings),
+        peak_kib=peak / 1024,
+        number=number,
+        rounds=rounds,
+    )
+
+
+async def async_run(rounds: int, selected: str | None = None) -> dict[str, Result]:
+    """Run the benchmarks whose name contains ``selected`` (all if None)."""
+    env = Environment()
+    await env.async_add_entities()
+
+    results: dict[str, Result] = {}
+    for benchmark in build_benchmarks(env):
+        if selected and selected not in benchmark.name:
+            continue
+        results[benchmark.name] = await async_measure(benchmark, rounds)
+    return results
+
+
+@contextmanager
+def stub_state_machine() -> Iterator[None]:
+    """Let entities render state against the mock hass without a state machine."""
+    with (
+        patch("homeassistant.helpers.frame.report_usage"),
+        patch("homeassistant.helpers.entity_platform.async_get_current_platform"),
+        patch.object(Entity, "async_write_ha_state", _render_state),
+    ):
+        yield
+
+
+def run(rounds: int, selected: str | None = None) -> dict[str, Result]:
+    """Run the benchmarks with Home Assistant's state machine stubbed out."""
+    with stub_state_machine():
+        return asyncio.run(async_run(rounds, selected))
+
+
+def report(results: dict[str, Result]) -> dict[str, Any]:
+    """Return the JSON report of a run."""
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": {name: result.as_dict() for name, result in results.items()},
+    }
+
+
+def print_results(results: dict[str, Result]) -> None:
+    """Print a table of the results."""
+    print(f"{'benchmark':<26} {'min us':>11} {'median us':>11} {'mean us':>11} {'peak KiB':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<26} {result.min_us:11.1f} {result.median_us:11.1f} {result.mean_us:11.1f} {result.peak_kib:10.1f}"
+        )
+
+
+def main() -> None:
+    """Run the benchmarks, print and optionally save the results, then check them against a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per benchmark")
+    parser.add_argument("--filter", dest="selected", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help="Fail if the results regressed against this baseline (default: benchmarks/baseline.json)",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed growth, 0.25 = 25%%")
+    args = parser.parse_args()
+
+    results = run(args.rounds, args.selected)
+    print_results(results)
+    current = report(results)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        print(f"\nCompared with {args.compare}:")
+        if not check(load(args.compare), current["benchmarks"], args.tolerance):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
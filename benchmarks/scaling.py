@@ -0,0 +1,109 @@
+"""Measure how parsing and coordinator updates scale with controller size.
+
+Runs against synthetic controllers from ``benchmarks.synthetic``:
+
+- ``parse``: ``EconextApi.async_fetch_all_params`` on payloads of each
+  parameter count
+- ``update``: a sequence of polls at each change rate replayed through a
+  coordinator with every platform attached, reporting per-poll decode,
+  mapping and dispatch cost, changed parameters and state writes
+
+Run from the repository root:
+
+    python -m benchmarks.scaling [--sizes 2000 5000 10000] [--change-rates 0.01 0.1 0.5] [--output scaling.json]
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+from .common import gateway_payload
+from .replay import async_run as async_replay_records
+from .run import Benchmark, Environment, async_measure, stub_state_machine
+from .synthetic import generate_controller, snapshot_sequence
+
+DEFAULT_SIZES = (2000, 5000, 10000, 20000)
+DEFAULT_CHANGE_RATES = (0.01, 0.1, 0.5)
+# Controller size the change-rate sequences run against
+UPDATE_SIZE = 5000
+POLLS = 20
+
+
+def snapshot_records(params: dict[str, dict[str, Any]], polls: int, change_rate: float) -> list[dict[str, Any]]:
+    """Return a poll sequence as session records, starting from ``params``."""
+    snapshots = [params, *snapshot_sequence(params, polls, change_rate)]
+    return [
+        {"t": float(index), "kind": "parameters", "status": 200, "body": json.loads(gateway_payload(snapshot))}
+        for index, snapshot in enumerate(snapshots)
+    ]
+
+
+async def async_measure_parse(sizes: list[int], rounds: int) -> dict[str, Any]:
+    """Return the parse timings per parameter count."""
+    results: dict[str, Any] = {}
+    for size in sizes:
+        env = Environment(generate_controller(size))
+        result = await async_measure(Benchmark(f"parse_{size}", env.api.async_fetch_all_params, 5), rounds)
+        results[str(size)] = {**result.as_dict(), "payload_kib": round(len(env.payload) / 1024, 1)}
+    return results
+
+
+async def async_measure_updates(change_rates: list[float], size: int, polls: int) -> dict[str, Any]:
+    """Return the per-poll update costs per change rate."""
+    params = generate_controller(size)
+    results: dict[str, Any] = {}
+    for rate in change_rates:
+        results[str(rate)] = await async_replay_records(snapshot_records(params, polls, rate), None)
+    return results
+
+
+def print_report(report: dict[str, Any]) -> None:
+    """Print the parse and update tables."""
+    print(f"{'params':>8} {'payload KiB':>12} {'min us':>11} {'median us':>11} {'peak KiB':>10}")
+    for size, result in report["parse"].items():
+        print(
+            f"{size:>8} {result['payload_kib']:12.1f} {result['min_us']:11.1f} "
+            f"{result['median_us']:11.1f} {result['peak_kib']:10.1f}"
+        )
+    print(f"\n{report['update_size']} params, {report['polls']} polls per change rate (p50 per poll)")
+    print(f"{'rate':>6} {'decode ms':>10} {'mapping ms':>11} {'dispatch ms':>12} {'changed':>8} {'writes':>7}")
+    for rate, summary in report["update"].items():
+        print(
+            f"{rate:>6} {summary['decode_ms']['p50']:10.2f} {summary['mapping_ms']['p50']:11.2f} "
+            f"{summary['dispatch_ms']['p50']:12.2f} {summary['changed_params']['p50']:8.0f} "
+            f"{summary['state_writes']['p50']:7.0f}"
+        )
+
+
+def main() -> None:
+    """Run the scaling measurements and print or save them."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Parameter counts")
+    parser.add_argument(
+        "--change-rates", type=float, nargs="+", default=list(DEFAULT_CHANGE_RATES), help="Changed fraction per poll"
+    )
+    parser.add_argument("--update-size", type=int, default=UPDATE_SIZE, help="Parameter count for update runs")
+    parser.add_argument("--polls", type=int, default=POLLS, help="Polls per change rate")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    async def async_main() -> dict[str, Any]:
+        return {
+            "parse": await async_measure_parse(args.sizes, args.rounds),
+            "update_size": args.update_size,
+            "polls": args.polls,
+            "update": await async_measure_updates(args.change_rates, args.update_size, args.polls),
+        }
+
+    with stub_state_machine():
+        report = asyncio.run(async_main())
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
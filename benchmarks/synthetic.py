@@ -0,0 +1,159 @@
+"""Synthetic controller fixtures for scaling measurements.
+
+``generate_controller`` starts from the seven-circuit fixture (all circuits,
+DHW and heat pump present), gives every schedule its own random week, and pads
+the parameter table with synthetic entries up to the requested size.
+``snapshot_sequence`` then yields successive polls of that controller in which
+a chosen fraction of the parameters changes each time.
+
+Write a fixture, or a fixture plus a snapshot sequence, from the command line:
+
+    python -m benchmarks.synthetic --params 10000 --output big.json
+    python -m benchmarks.synthetic --params 5000 --snapshots 100 --change-rate 0.05 --output polls.jsonl
+"""
+
+import argparse
+from collections.abc import Iterator
+import json
+from pathlib import Path
+import random
+from typing import Any
+
+from custom_components.econext.climate import CIRCUITS
+from custom_components.econext.const import DHW_SCHEDULE, HEATPUMP_SCHEDULE, SILENT_MODE_SCHEDULE
+from custom_components.econext.schedule import WORD_MASK
+
+from .common import seven_circuit_params
+
+# Controller identity and circuit presence; never changed between snapshots
+FIXED_PARAMS = frozenset({"0", "1", "9", "10", "374", *(circuit.active_param for circuit in CIRCUITS.values())})
+
+SENSOR_NOT_CONNECTED = 999.0
+
+# Name prefix of the filler parameters
+SYNTHETIC_PREFIX = "Synthetic"
+
+
+def schedule_param_ids() -> list[str]:
+    """Return the AM/PM word param IDs of every schedule."""
+    pairs = [
+        *DHW_SCHEDULE.param_ids,
+        *HEATPUMP_SCHEDULE.param_ids,
+        *SILENT_MODE_SCHEDULE.param_ids,
+        *(pair for circuit in CIRCUITS.values() for pair in circuit.schedule_param_ids),
+    ]
+    return [param_id for pair in pairs for param_id in pair]
+
+
+def _random_word(rng: random.Random) -> int:
+    """Return a schedule word with one to three active periods."""
+    word = 0
+    for _ in range(rng.randint(1, 3)):
+        start = rng.randrange(24)
+        word |= ((1 << rng.randint(1, 24 - start)) - 1) << start
+    return word & WORD_MASK
+
+
+def _synthetic_param(index: int, rng: random.Random) -> dict[str, Any]:
+    """Return a filler parameter: mostly integers, some floats and strings, like the real table."""
+    kind = rng.random()
+    if kind < 0.85:
+        value: Any = rng.randint(0, 100)
+    elif kind < 0.93:
+        value = round(rng.uniform(-20, 80), 1)
+    else:
+        value = f"Synthetic {index}"
+    return {"value": value, "name": f"{SYNTHETIC_PREFIX}{index}", "minv": 0, "maxv": 0}
+
+
+def generate_controller(param_count: int = 5000, seed: int | None = 0) -> dict[str, dict[str, Any]]:
+    """Return a controller with all circuits, DHW and heat pump, padded to ``param_count`` parameters."""
+    rng = random.Random(seed)
+    params = seven_circuit_params()
+    if param_count < len(params):
+        raise ValueError(f"A full controller has {len(params)} parameters, cannot generate {param_count}")
+
+    for param_id in schedule_param_ids():
+        if param_id in params:
+            params[param_id]["value"] = _random_word(rng)
+
+    index = max(int(param_id) for param_id in params) + 1
+    while len(params) < param_count:
+        params[str(index)] = _synthetic_param(index, rng)
+        index += 1
+    return params
+
+
+def _mutable_params(params: dict[str, dict[str, Any]]) -> list[str]:
+    """Return the IDs of parameters that may change between polls.
+
+    These are telemetry floats, schedule words and synthetic numbers; real
+    integers are left alone since many of them are enum codes.
+    """
+    schedules = set(schedule_param_ids())
+    return [
+        param_id
+        for param_id, param in params.items()
+        if param_id not in FIXED_PARAMS
+        and param["value"] != SENSOR_NOT_CONNECTED
+        and (
+            isinstance(param["value"], float)
+            or (param_id in schedules and isinstance(param["value"], int))
+            or (str(param.get("name")).startswith(SYNTHETIC_PREFIX) and type(param["value"]) is int)
+        )
+    ]
+
+
+def snapshot_sequence(
+    params: dict[str, dict[str, Any]],
+    count: int,
+    change_rate: float,
+    seed: int | None = 0,
+) -> Iterator[dict[str, dict[str, Any]]]:
+    """Yield ``count`` successive polls, each changing ``change_rate`` of all parameters.
+
+    Floats drift by 0.1, synthetic integers by 1 and schedule words toggle
+    one slot. The rate is capped by the parameters that may change at all
+    (identity, circuit presence, enum codes, strings and disconnected sensors
+    stay put). Every snapshot is a fresh dict, as a poll would return.
+    """
+    rng = random.Random(seed)
+    schedules = set(schedule_param_ids())
+    mutable = _mutable_params(params)
+    changes = min(round(change_rate * len(params)), len(mutable))
+    current = {param_id: dict(param) for param_id, param in params.items()}
+
+    for _ in range(count):
+        for param_id in rng.sample(mutable, changes):
+            param = current[param_id]
+            value = param["value"]
+            if param_id in schedules:
+                param["value"] = value ^ (1 << rng.randrange(24))
+            elif isinstance(value, float):
+                param["value"] = round(value + rng.choice((-0.1, 0.1)), 1)
+            else:
+                param["value"] = value + 1 if value % 2 == 0 else value - 1
+        yield {param_id: dict(param) for param_id, param in current.items()}
+
+
+def main() -> None:
+    """Write a synthetic fixture or snapshot sequence."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--params", type=int, default=5000, help="Parameter count")
+    parser.add_argument("--snapshots", type=int, help="Write this many polls as JSON lines instead of one fixture")
+    parser.add_argument("--change-rate", type=float, default=0.05, help="Fraction of parameters changed per poll")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    params = generate_controller(args.params, args.seed)
+    if args.snapshots is None:
+        args.output.write_text(json.dumps(params, indent=4) + "\n")
+        return
+    with args.output.open("w") as file:
+        for snapshot in snapshot_sequence(params, args.snapshots, args.change_rate, args.seed):
+            file.write(json.dumps(snapshot) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,90 @@
 """The ecoNEXT integration."""
 
+from functools import partial
 import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .api import EconextConnectionError, EconextApi
-from .const import DEFAULT_PORT, DOMAIN, PLATFORMS
+from homeassistant.helpers.typing import ConfigType
+
+from .api import EconextConnectionError, EconextApi, create_gateway_session
+from .const import (
+    CONF_DEDICATED_CONNECTION,
+    CONF_MAX_STALENESS,
+    CONF_PUSH_UPDATES,
+    CONF_STALE_FAILURES,
+    DATA_LOOP_LAG,
+    DATA_SCHEDULER,
+    DEFAULT_DEDICATED_CONNECTION,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_PORT,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_STALE_FAILURES,
+    DOMAIN,
+    PLATFORMS,
+)
 from .coordinator import EconextCoordinator
+from .loop_lag import LoopLagMonitor
+from .metrics import PoolStats
+from .scheduler import PollScheduler
+from .services import async_setup_services
+from .websocket_api import async_register_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type EconextConfigEntry = ConfigEntry[EconextCoordinator]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the ecoNEXT integration."""
+    async_setup_services(hass)
+    async_register_websocket_api(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: EconextConfigEntry) -> bool:
     """Set up ecoNEXT from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    # Create API client
-    session = async_get_clientsession(hass)
+    # Create API client, on its own connection pool if enabled
+    pool_stats: PoolStats | None = None
+    if entry.options.get(CONF_DEDICATED_CONNECTION, DEFAULT_DEDICATED_CONNECTION):
+        pool_stats = PoolStats()
+        session = create_gateway_session(pool_stats)
+        entry.async_on_unload(session.close)
+    else:
+        session = async_get_clientsession(hass)
     api = EconextApi(
         host=entry.data[CONF_HOST],
         port=entry.data.get(CONF_PORT, DEFAULT_PORT),
         session=session,
+        pool_stats=pool_stats,
     )
 
+    # Join the poll scheduler shared by all gateways
+    scheduler: PollScheduler = hass.data.setdefault(DATA_SCHEDULER, PollScheduler())
+    scheduler_entry = scheduler.add_entry(entry.entry_id)
+    entry.async_on_unload(partial(scheduler.remove_entry, entry.entry_id))
+
+    # Share one event loop lag monitor between all gateways
+    loop_lag: LoopLagMonitor = hass.data.setdefault(DATA_LOOP_LAG, LoopLagMonitor())
+
     # Create coordinator
-    coordinator = EconextCoordinator(hass, api)
+    coordinator = EconextCoordinator(
+        hass,
+        api,
+        stale_failures=entry.options.get(CONF_STALE_FAILURES, DEFAULT_STALE_FAILURES),
+        max_staleness=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+        push_updates=entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES),
+        scheduler_entry=scheduler_entry,
+        loop_lag=loop_lag,
+    )
 
     # Fetch initial data
     try:
@@ -44,6 +98,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: EconextConfigEntry) -> b
 
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+    coordinator.async_start_stream()
+    loop_lag.start(hass.loop)
 
     _LOGGER.info(
         "ecoNEXT integration set up for %s (%s)",
@@ -54,11 +111,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: EconextConfigEntry) -> b
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: EconextConfigEntry) -> None:
+    """Reload the entry to apply changed options."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: EconextConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["coordinator"].async_stop_recording()
+        # Stop measuring the loop lag once the last gateway is gone
+        if not hass.data[DOMAIN] and (loop_lag := hass.data.pop(DATA_LOOP_LAG, None)) is not None:
+            loop_lag.stop()
 
     return unload_ok
@@ -1,14 +1,45 @@
 """API client for ecoNEXT (GM3 Gateway)."""
 
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
+import json
 import logging
+import time
 from typing import Any
+import zlib
 
 import aiohttp
 
-from .const import API_ENDPOINT_ALARMS, API_ENDPOINT_PARAMETERS
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from .const import (
+    API_ENDPOINT_ALARMS,
+    API_ENDPOINT_PARAMETERS,
+    API_ENDPOINT_SCHEMA,
+    API_ENDPOINT_STREAM,
+    CONNECTION_LIMIT,
+    DNS_CACHE_SECONDS,
+    IDENTITY_MAX_AGE,
+    IDENTITY_PARAMS,
+    KEEPALIVE_SECONDS,
+    PROBE_TIMEOUT,
+    REQUEST_TIMEOUT,
+    STREAM_HEARTBEAT,
+)
+from .metrics import FetchStats, PoolStats
+from .recorder import SessionRecorder
+from .wire import MSGPACK_CONTENT_TYPE, ParameterSchema, binary_supported, unpack
 
 _LOGGER = logging.getLogger(__name__)
 
+# Encodings offered to the gateway for the parameters payload; brotli only if installed
+ACCEPT_ENCODING = "br, gzip, deflate" if brotli is not None else "gzip, deflate"
+
 
 class EconextApiError(Exception):
     """Base exception for API errors."""
@@ -18,6 +49,91 @@ class EconextConnectionError(EconextApiError):
     """Connection error."""
 
 
+class EconextUnsupportedError(EconextApiError):
+    """The gateway does not offer the requested endpoint."""
+
+
+def map_gateway_params(data: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Map a gateway parameters payload to the integration's format, keyed by index."""
+    gateway_params = data.get("parameters", data)
+    return {
+        index_str: {
+            "value": param_data.get("value"),
+            "name": param_data.get("name"),
+            "minv": param_data.get("min"),
+            "maxv": param_data.get("max"),
+            "writable": param_data.get("writable", False),
+            "type": param_data.get("type"),
+            "unit": param_data.get("unit"),
+        }
+        for index_str, param_data in gateway_params.items()
+    }
+
+
+def create_gateway_session(stats: PoolStats) -> aiohttp.ClientSession:
+    """Create a session with its own keep-alive connection pool for one gateway.
+
+    The caller owns the session and must close it. Requests, new and reused
+    connections and DNS cache use are counted in ``stats``.
+    """
+    trace = aiohttp.TraceConfig()
+
+    def _counter(field: str) -> Callable[..., Awaitable[None]]:
+        async def _count(*_args: Any) -> None:
+            setattr(stats, field, getattr(stats, field) + 1)
+
+        return _count
+
+    trace.on_request_start.append(_counter("requests"))
+    trace.on_connection_create_end.append(_counter("connections_created"))
+    trace.on_connection_reuseconn.append(_counter("connections_reused"))
+    trace.on_dns_cache_hit.append(_counter("dns_cache_hits"))
+    trace.on_dns_cache_miss.append(_counter("dns_cache_misses"))
+
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT,
+        keepalive_timeout=KEEPALIVE_SECONDS,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_SECONDS,
+    )
+    return aiohttp.ClientSession(connector=connector, trace_configs=[trace])
+
+
+def _inflate(body: bytes) -> bytes:
+    """Decompress a deflate body, zlib-wrapped or raw (servers disagree on which deflate means)."""
+    try:
+        return zlib.decompress(body)
+    except zlib.error:
+        return zlib.decompress(body, wbits=-zlib.MAX_WBITS)
+
+
+_DECOMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": partial(zlib.decompress, wbits=zlib.MAX_WBITS | 16),
+    "deflate": _inflate,
+}
+_DECOMPRESS_ERRORS: tuple[type[Exception], ...] = (zlib.error,)
+if brotli is not None:
+    _DECOMPRESSORS["br"] = brotli.decompress
+    _DECOMPRESS_ERRORS += (brotli.error,)
+
+
+def decompress_body(body: bytes, encoding: str) -> bytes:
+    """Decompress a response body sent with the given Content-Encoding.
+
+    Raises:
+        EconextApiError: If the encoding is not supported or the body is corrupt.
+
+    """
+    if encoding in ("", "identity"):
+        return body
+    if (decompress := _DECOMPRESSORS.get(encoding)) is None:
+        raise EconextApiError(f"Unsupported content encoding from gateway: {encoding}")
+    try:
+        return decompress(body)
+    except _DECOMPRESS_ERRORS as err:
+        raise EconextApiError(f"Invalid {encoding} body from gateway: {err}") from err
+
+
 class EconextApi:
     """API client for the econext-gateway.
 
@@ -29,12 +145,34 @@ class EconextApi:
         host: str,
         port: int,
         session: aiohttp.ClientSession,
+        pool_stats: PoolStats | None = None,
     ) -> None:
-        """Initialize the API client."""
+        """Initialize the API client.
+
+        ``pool_stats`` are the counters of a session from
+        ``create_gateway_session``, if the client uses one.
+        """
         self._host = host
         self._port = port
         self._session = session
         self._base_url = f"http://{host}:{port}"
+        self._timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        self._probe_timeout = aiohttp.ClientTimeout(total=PROBE_TIMEOUT)
+        self.pool_stats = pool_stats
+        # Binary polls are requested while msgpack is installed and the gateway has a schema
+        self._binary = binary_supported()
+        self._schema: ParameterSchema | None = None
+        self._last_fetch: FetchStats | None = None
+        # Result of the last full fetch and when it finished, for identity lookups
+        self._snapshot: dict[str, dict[str, Any]] | None = None
+        self._snapshot_at = 0.0
+        # Cleared once the gateway turns out not to serve single parameters
+        self._single_reads = True
+        # Fetches in flight by resource, and calls that joined one instead of sending their own
+        self._in_flight: dict[str, asyncio.Task[Any]] = {}
+        self.coalesced: Counter[str] = Counter()
+        # Set while a session is being recorded
+        self.recorder: SessionRecorder | None = None
 
     @property
     def host(self) -> str:
@@ -46,68 +184,192 @@ class EconextApi:
         """Return the port."""
         return self._port
 
+    @property
+    def last_fetch(self) -> FetchStats | None:
+        """Return timings and payload size of the last successful parameter fetch."""
+        return self._last_fetch
+
+    async def _async_single_flight[T](self, resource: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fetch``, or join the fetch of ``resource`` already in flight.
+
+        Every caller gets the same result (or exception). The fetch runs as
+        its own task, so a caller that is cancelled does not cancel it for
+        the others.
+        """
+        if (task := self._in_flight.get(resource)) is not None:
+            self.coalesced[resource] += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(fetch())
+        self._in_flight[resource] = task
+
+        def _done(finished: asyncio.Task[T]) -> None:
+            self._in_flight.pop(resource, None)
+            # Retrieve the exception in case every caller was cancelled
+            if not finished.cancelled():
+                finished.exception()
+
+        task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
     async def async_fetch_all_params(self) -> dict[str, dict[str, Any]]:
         """Fetch all parameters from the gateway.
 
         The gateway returns parameters already keyed by index (as string):
             {"timestamp": "...", "parameters": {"0": {"index": 0, "name": "PS", "value": 42, ...}}}
 
+        If the msgpack module is installed, the compact binary format of
+        ``wire`` is requested as well; gateways without it answer in JSON.
+        The payload is requested compressed (see ``ACCEPT_ENCODING``) and
+        decompressed here rather than by aiohttp, so both the bytes on the
+        wire and the decompression time can be measured. Timings and payload
+        sizes of the fetch are left in ``last_fetch``.
+
+        Calls made while a fetch is in flight share its result, the same
+        dictionary, instead of sending their own request.
+
         Returns:
             Dictionary of parameters keyed by index (as string).
 
         """
+        return await self._async_single_flight("parameters", self._async_fetch_all_params)
+
+    async def _async_fetch_all_params(self) -> dict[str, dict[str, Any]]:
+        """Fetch and decode all parameters (see ``async_fetch_all_params``)."""
         url = f"{self._base_url}{API_ENDPOINT_PARAMETERS}"
-        timeout = aiohttp.ClientTimeout(total=10)
+        accept = f"{MSGPACK_CONTENT_TYPE}, application/json;q=0.9" if self._binary else "application/json"
 
+        start = time.perf_counter()
         try:
-            async with self._session.get(url, timeout=timeout) as response:
+            async with self._session.get(
+                url,
+                timeout=self._timeout,
+                headers={"Accept": accept, "Accept-Encoding": ACCEPT_ENCODING},
+                auto_decompress=False,
+            ) as response:
                 if response.status != 200:
+                    self._record("parameters", response.status, None)
                     raise EconextApiError(f"API returned status {response.status}")
 
-                data = await response.json()
+                raw = await response.read()
+                encoding = response.headers.get("Content-Encoding", "identity").strip().lower()
+                content_type = response.headers.get("Content-Type", "application/json").split(";")[0].strip().lower()
 
-        except aiohttp.ClientError as err:
+        except (aiohttp.ClientError, TimeoutError) as err:
             raise EconextConnectionError(f"Connection error: {err}") from err
-
-        gateway_params = data.get("parameters", data)
-
-        # Map gateway field names to what the integration expects
-        params: dict[str, dict[str, Any]] = {}
-        for index_str, param_data in gateway_params.items():
-            params[index_str] = {
-                "value": param_data.get("value"),
-                "name": param_data.get("name"),
-                "minv": param_data.get("min"),
-                "maxv": param_data.get("max"),
-                "writable": param_data.get("writable", False),
-                "type": param_data.get("type"),
-                "unit": param_data.get("unit"),
-            }
-
+        received = time.perf_counter()
+
+        body = decompress_body(raw, encoding)
+        decompressed = time.perf_counter()
+
+        if content_type == MSGPACK_CONTENT_TYPE:
+            try:
+                data = unpack(body)
+            except ValueError as err:
+                raise EconextApiError(f"Invalid MessagePack from gateway: {err}") from err
+            if not isinstance(data, dict):
+                raise EconextApiError(f"Expected a map from gateway, got {type(data).__name__}")
+            decoded = time.perf_counter()
+
+            if self._schema is None or data.get("schema") != self._schema.id:
+                self._schema = await self._async_fetch_schema()
+                if self._schema is None:
+                    _LOGGER.warning("Gateway sent MessagePack without a schema, falling back to JSON")
+                    self._binary = False
+                    return await self._async_fetch_all_params()
+                # The schema request is network time, not mapping
+                decoded = time.perf_counter()
+
+            try:
+                params = self._schema.map_values(data["values"])
+            except (KeyError, TypeError, ValueError) as err:
+                self._schema = None
+                raise EconextApiError(f"Values do not match the gateway schema: {err}") from err
+            if self.recorder is not None:
+                self._record("parameters", 200, self._schema.gateway_format(data.get("timestamp"), data["values"]))
+            wire_format = "msgpack"
+        else:
+            try:
+                data = json.loads(body)
+            except ValueError as err:
+                raise EconextApiError(f"Invalid JSON from gateway: {err}") from err
+            if not isinstance(data, dict):
+                raise EconextApiError(f"Expected an object from gateway, got {type(data).__name__}")
+            decoded = time.perf_counter()
+
+            self._record("parameters", 200, data)
+
+            # Map gateway field names to what the integration expects
+            params = map_gateway_params(data)
+            wire_format = "json"
+
+        self._last_fetch = FetchStats(
+            latency_ms=(received - start) * 1000,
+            bytes_received=len(raw),
+            decode_ms=(decoded - decompressed) * 1000,
+            mapping_ms=(time.perf_counter() - decoded) * 1000,
+            bytes_decoded=len(body),
+            decompress_ms=(decompressed - received) * 1000,
+            encoding=encoding or "identity",
+            wire_format=wire_format,
+        )
+        self._snapshot, self._snapshot_at = params, time.monotonic()
         _LOGGER.debug("Fetched %d parameters from gateway", len(params))
         return params
 
+    async def _async_fetch_schema(self) -> ParameterSchema | None:
+        """Fetch the metadata table binary polls are aligned with; None if the gateway has none."""
+        url = f"{self._base_url}{API_ENDPOINT_SCHEMA}"
+
+        try:
+            async with self._session.get(
+                url, timeout=self._timeout, headers={"Accept": MSGPACK_CONTENT_TYPE}
+            ) as response:
+                if response.status == 404:
+                    return None
+                if response.status != 200:
+                    raise EconextApiError(f"Schema API returned status {response.status}")
+
+                body = await response.read()
+
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise EconextConnectionError(f"Connection error fetching schema: {err}") from err
+
+        try:
+            data = unpack(body)
+            schema = ParameterSchema(data["schema"], data["parameters"])
+        except (KeyError, TypeError, ValueError) as err:
+            raise EconextApiError(f"Invalid schema from gateway: {err}") from err
+        _LOGGER.debug("Fetched gateway schema %s with %d parameters", schema.id, len(schema))
+        return schema
+
     async def async_fetch_alarms(self) -> list[dict[str, Any]]:
         """Fetch alarm history from the gateway.
 
         Returns:
             List of alarm dicts with keys: index, code, from_date, to_date.
-            to_date is None for active (unresolved) alarms.
+            to_date is None for active (unresolved) alarms. Concurrent calls
+            share one request and the same list.
 
         """
+        return await self._async_single_flight("alarms", self._async_fetch_alarms)
+
+    async def _async_fetch_alarms(self) -> list[dict[str, Any]]:
+        """Fetch the alarm history (see ``async_fetch_alarms``)."""
         url = f"{self._base_url}{API_ENDPOINT_ALARMS}"
-        timeout = aiohttp.ClientTimeout(total=10)
 
         try:
-            async with self._session.get(url, timeout=timeout) as response:
+            async with self._session.get(url, timeout=self._timeout) as response:
                 if response.status != 200:
+                    self._record("alarms", response.status, None)
                     raise EconextApiError(f"Alarms API returned status {response.status}")
 
                 data = await response.json()
 
-        except aiohttp.ClientError as err:
+        except (aiohttp.ClientError, TimeoutError) as err:
             raise EconextConnectionError(f"Connection error fetching alarms: {err}") from err
 
+        self._record("alarms", 200, data)
         alarms = data.get("alarms", [])
         _LOGGER.debug("Fetched %d alarms from gateway", len(alarms))
         return alarms
@@ -124,34 +386,177 @@ class EconextApi:
 
         """
         url = f"{self._base_url}{API_ENDPOINT_PARAMETERS}/{name}"
-        timeout = aiohttp.ClientTimeout(total=10)
 
         try:
-            async with self._session.post(url, json={"value": value}, timeout=timeout) as response:
+            async with self._session.post(url, json={"value": value}, timeout=self._timeout) as response:
+                self._record("write", response.status, {"name": name, "value": value})
                 if response.status != 200:
                     raise EconextApiError(f"API returned status {response.status}")
 
                 _LOGGER.debug("Set param %s to %s", name, value)
                 return True
 
-        except aiohttp.ClientError as err:
+        except (aiohttp.ClientError, TimeoutError) as err:
             raise EconextConnectionError(f"Connection error: {err}") from err
 
-    async def async_test_connection(self) -> dict[str, Any]:
-        """Test the connection and return device info.
+    async def async_stream_changes(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield parameter changes pushed by the gateway until the stream ends.
 
-        Returns:
-            Dictionary with basic device info (UID, name, etc.)
+        Subscribes over a WebSocket; the gateway sends one JSON message per
+        batch of changed values, keyed by index (as string):
+            {"type": "changes", "timestamp": "...", "values": {"61": 45.8, ...}}
+
+        An empty batch is yielded as soon as the subscription is open, so the
+        caller knows the stream is up before the first change arrives.
+        Returns when the gateway closes the stream.
+
+        Raises:
+            EconextUnsupportedError: If the gateway has no stream endpoint.
+            EconextConnectionError: If the connection fails or drops.
+            EconextApiError: If the gateway sends an invalid message.
 
         """
-        params = await self.async_fetch_all_params()
+        url = f"{self._base_url}{API_ENDPOINT_STREAM}"
+
+        try:
+            async with asyncio.timeout(REQUEST_TIMEOUT):
+                ws = await self._session.ws_connect(url, heartbeat=STREAM_HEARTBEAT)
+        except aiohttp.WSServerHandshakeError as err:
+            if err.status == 404:
+                raise EconextUnsupportedError("Gateway does not stream parameter changes") from err
+            raise EconextApiError(f"Stream API returned status {err.status}") from err
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise EconextConnectionError(f"Connection error opening stream: {err}") from err
+
+        try:
+            yield {}
+            async for message in ws:
+                if message.type is aiohttp.WSMsgType.ERROR:
+                    raise EconextConnectionError(f"Stream error: {ws.exception()}")
+                if message.type is not aiohttp.WSMsgType.TEXT:
+                    continue
+                try:
+                    data = json.loads(message.data)
+                except ValueError as err:
+                    raise EconextApiError(f"Invalid JSON in stream: {err}") from err
+                if not isinstance(data, dict) or data.get("type") != "changes":
+                    continue
+                self._record("changes", 200, data)
+                yield {str(index): value for index, value in data.get("values", {}).items()}
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise EconextConnectionError(f"Stream dropped: {err}") from err
+        finally:
+            await ws.close()
+
+    async def async_probe(self) -> None:
+        """Check the gateway answers, without downloading the parameters.
+
+        Requests the alarm history, which is a fraction of the size of the
+        parameters payload, with a short timeout.
+
+        Raises:
+            EconextConnectionError: If the gateway cannot be reached.
+            EconextApiError: If the gateway answers with an error.
 
-        # Extract device info from params (same indexes as original)
-        uid = params.get("10", {}).get("value", "unknown")
-        name = params.get("374", {}).get("value", "ecoMAX360i")
+        """
+        url = f"{self._base_url}{API_ENDPOINT_ALARMS}"
+
+        try:
+            async with self._session.get(url, timeout=self._probe_timeout) as response:
+                if response.status != 200:
+                    raise EconextApiError(f"Probe returned status {response.status}")
+                await response.read()
+
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise EconextConnectionError(f"Probe failed: {err}") from err
+
+    def _record(self, kind: str, status: int, body: Any) -> None:
+        """Pass a gateway response to the session recorder, if one is attached."""
+        if self.recorder is not None:
+            self.recorder.record(kind, status, body)
+
+    async def async_fetch_identity(self) -> dict[str, Any]:
+        """Return the controller's UID and name without downloading every parameter.
+
+        A full fetch in flight is joined, and one that finished at most
+        ``IDENTITY_MAX_AGE`` seconds ago is reused. Otherwise only the
+        identity parameters are requested, by name and with the probe
+        timeout. Gateways that cannot read single parameters get a full
+        fetch instead.
+
+        Returns:
+            Dictionary with uid, name and param_count (None unless the
+            identity came from a full fetch).
 
+        """
+        if "parameters" in self._in_flight:
+            return self._identity(await self.async_fetch_all_params())
+        if self._snapshot is not None and time.monotonic() - self._snapshot_at <= IDENTITY_MAX_AGE:
+            return self._identity(self._snapshot)
+
+        if self._single_reads:
+            try:
+                uid, name = await asyncio.gather(*(self._async_fetch_param(name) for name in IDENTITY_PARAMS.values()))
+            except EconextUnsupportedError as err:
+                _LOGGER.debug("Gateway cannot read single parameters (%s), using full fetches", err)
+                self._single_reads = False
+            else:
+                return {
+                    "uid": uid if uid is not None else "unknown",
+                    "name": name if name is not None else "ecoMAX360i",
+                    "param_count": None,
+                }
+
+        return self._identity(await self.async_fetch_all_params())
+
+    @staticmethod
+    def _identity(params: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        """Return the device info held in a full set of parameters."""
+        uid_index, name_index = IDENTITY_PARAMS
         return {
-            "uid": uid,
-            "name": name,
+            "uid": params.get(uid_index, {}).get("value", "unknown"),
+            "name": params.get(name_index, {}).get("value", "ecoMAX360i"),
             "param_count": len(params),
         }
+
+    async def _async_fetch_param(self, name: str) -> Any:
+        """Read a single parameter's value by name, with the probe timeout.
+
+        Raises:
+            EconextUnsupportedError: If the gateway does not serve the
+                parameter on its own.
+            EconextConnectionError: If the gateway cannot be reached.
+            EconextApiError: If the gateway answers with an error.
+
+        """
+        url = f"{self._base_url}{API_ENDPOINT_PARAMETERS}/{name}"
+
+        try:
+            async with self._session.get(url, timeout=self._probe_timeout) as response:
+                if response.status in (404, 405):
+                    raise EconextUnsupportedError(f"Reading {name} returned status {response.status}")
+                if response.status != 200:
+                    raise EconextApiError(f"API returned status {response.status}")
+
+                data = await response.json(content_type=None)
+
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise EconextConnectionError(f"Connection error: {err}") from err
+        except ValueError as err:
+            raise EconextApiError(f"Invalid JSON from gateway: {err}") from err
+
+        # Gateways that ignore the name answer with something else, e.g. every parameter
+        if not isinstance(data, dict) or data.get("name") != name or "value" not in data:
+            raise EconextUnsupportedError(f"Reading {name} did not return that parameter")
+        return data["value"]
+
+    async def async_test_connection(self) -> dict[str, Any]:
+        """Test the connection and return device info.
+
+        Only the identity parameters are fetched (see ``async_fetch_identity``).
+
+        Returns:
+            Dictionary with basic device info (UID, name, etc.)
+
+        """
+        return await self.async_fetch_identity()
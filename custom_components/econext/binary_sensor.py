@@ -1,16 +1,64 @@
 """Binary sensor platform for ecoNEXT integration."""
 
+import logging
+from typing import Any
+
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
 
-from .const import DOMAIN, get_alarm_name
+from .climate import CIRCUITS
+from .const import (
+    CIRCUIT_SCHEDULE,
+    DHW_SCHEDULE,
+    DOMAIN,
+    HEATPUMP_SCHEDULE,
+    SCHEDULE_DAYS,
+    SCHEDULE_SLOTS_PER_DAY,
+    SERVICE_SET_SCHEDULE,
+    SILENT_MODE_SCHEDULE,
+    EconextScheduleEntityDescription,
+    get_alarm_name,
+)
 from .coordinator import EconextCoordinator
 from .entity import EconextEntity
+from .schedule import ScheduleTracker, decode_week, encode_ranges, is_slot_active
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_DAYS = "days"
+ATTR_SLOTS = "slots"
+
+
+def _day_ranges(value: Any) -> int:
+    """Validate a list of HH:MM-HH:MM periods and encode it as a day mask."""
+    try:
+        return encode_ranges(cv.ensure_list(value))
+    except (AttributeError, ValueError) as err:
+        raise vol.Invalid(str(err)) from err
+
+
+SET_SCHEDULE_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Optional(ATTR_SLOTS): vol.All(
+                cv.ensure_list,
+                [vol.All(vol.Coerce(int), vol.Range(min=0, max=(1 << SCHEDULE_SLOTS_PER_DAY) - 1))],
+                vol.Length(min=len(SCHEDULE_DAYS), max=len(SCHEDULE_DAYS)),
+            ),
+            vol.Optional(ATTR_DAYS): {vol.In(SCHEDULE_DAYS): _day_ranges},
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_SLOTS, ATTR_DAYS),
+)
 
 
 async def async_setup_entry(
@@ -21,7 +69,76 @@ async def async_setup_entry(
     """Set up ecoNEXT binary sensor entities from a config entry."""
     coordinator: EconextCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
-    async_add_entities([EconextAlarmActiveBinarySensor(coordinator)])
+    entities: list[BinarySensorEntity] = [EconextAlarmActiveBinarySensor(coordinator)]
+    entities.extend(
+        EconextScheduleBinarySensor(coordinator, description, device_id=device_id)
+        for description, device_id in get_schedules(coordinator)
+    )
+
+    async_add_entities(entities)
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(SERVICE_SET_SCHEDULE, SET_SCHEDULE_SCHEMA, _async_set_schedule)
+
+
+async def _async_set_schedule(entity: BinarySensorEntity, call: ServiceCall) -> None:
+    """Handle econext.set_schedule for one targeted entity.
+
+    The service is registered for every ecoNEXT binary sensor, so entities
+    other than schedules are turned away here.
+    """
+    if not isinstance(entity, EconextScheduleBinarySensor):
+        raise ServiceValidationError(f"{entity.entity_id} is not an ecoNEXT schedule")
+    await entity.async_set_schedule(slots=call.data.get(ATTR_SLOTS), days=call.data.get(ATTR_DAYS))
+
+
+def get_schedules(
+    coordinator: EconextCoordinator,
+) -> list[tuple[EconextScheduleEntityDescription, str | None]]:
+    """Return the (description, device_id) of every schedule present on the controller."""
+    schedules: list[tuple[EconextScheduleEntityDescription, str | None]] = []
+
+    # Add DHW schedule if DHW device should be created
+    dhw_temp_param = coordinator.get_param("61")
+    if dhw_temp_param is not None:
+        dhw_temp_value = dhw_temp_param.get("value")
+        if dhw_temp_value is not None and dhw_temp_value != 999.0:
+            _add_schedule(coordinator, schedules, DHW_SCHEDULE)
+
+    # Add heat pump and silent mode schedules if heat pump device should be created
+    if coordinator.get_param("1133") is not None:
+        _add_schedule(coordinator, schedules, HEATPUMP_SCHEDULE, device_id="heatpump")
+        _add_schedule(coordinator, schedules, SILENT_MODE_SCHEDULE, device_id="heatpump")
+
+    # Add circuit schedules if circuit is active
+    for circuit_num, circuit in CIRCUITS.items():
+        active = coordinator.get_param(circuit.active_param)
+        if active and active.get("value", 0) > 0:
+            circuit_desc = EconextScheduleEntityDescription(
+                key=CIRCUIT_SCHEDULE.key,
+                param_ids=circuit.schedule_param_ids,
+                device_type=CIRCUIT_SCHEDULE.device_type,
+                icon=CIRCUIT_SCHEDULE.icon,
+            )
+            _add_schedule(coordinator, schedules, circuit_desc, device_id=f"circuit_{circuit_num}")
+
+    return schedules
+
+
+def _add_schedule(
+    coordinator: EconextCoordinator,
+    schedules: list[tuple[EconextScheduleEntityDescription, str | None]],
+    description: EconextScheduleEntityDescription,
+    device_id: str | None = None,
+) -> None:
+    """Add a schedule if all of its AM/PM params exist."""
+    missing = [
+        param_id for pair in description.param_ids for param_id in pair if coordinator.get_param(param_id) is None
+    ]
+    if missing:
+        _LOGGER.debug("Skipping schedule %s - parameters %s not found", description.key, missing)
+        return
+    schedules.append((description, device_id))
 
 
 class EconextAlarmActiveBinarySensor(EconextEntity, BinarySensorEntity):
@@ -55,3 +172,122 @@ class EconextAlarmActiveBinarySensor(EconextEntity, BinarySensorEntity):
     def _is_value_valid(self) -> bool:
         """Alarm data is always valid if coordinator is updating."""
         return True
+
+
+class EconextScheduleBinarySensor(EconextEntity, BinarySensorEntity):
+    """A whole weekly schedule as one entity.
+
+    Replaces the 14 AM/PM bitfield number entities of a schedule. The state is
+    on while the current half-hour slot is active. The week is carried in the
+    ``slots`` attribute as seven 48-bit day masks, Sunday first, where bit 0 is
+    00:00-00:30 and bit 47 is 23:30-24:00.
+    """
+
+    # The grid only changes on edits; keep it out of the recorder
+    _unrecorded_attributes = frozenset({ATTR_SLOTS})
+
+    _low_priority = True
+
+    def __init__(
+        self,
+        coordinator: EconextCoordinator,
+        description: EconextScheduleEntityDescription,
+        device_id: str | None = None,
+    ) -> None:
+        """Initialize the schedule entity."""
+        # Use provided device_id or determine from device_type
+        if device_id is None and description.device_type != "controller":
+            device_id = description.device_type
+
+        super().__init__(coordinator, description.key, device_id)
+
+        self._description = description
+        self._attr_translation_key = description.key
+        if description.icon:
+            self._attr_icon = description.icon
+
+        # Last (available, words, is_on) written to the state machine
+        self._written_state: tuple | None = None
+
+        # Flips the state at slot boundaries while the entity is added to hass
+        self._schedule_tracker: ScheduleTracker | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start following the schedule."""
+        await super().async_added_to_hass()
+        self._schedule_tracker = self._async_follow_schedule(self._description.param_ids, self._async_write_if_changed)
+
+    def _get_words(self) -> tuple[int, ...] | None:
+        """Return the raw AM/PM words in day order, or None if any is missing."""
+        return self.coordinator.get_schedule_words(self._description.param_ids)
+
+    @property
+    def slots(self) -> list[int] | None:
+        """Return the week as seven 48-bit day masks, Sunday first."""
+        words = self._get_words()
+        if words is None:
+            return None
+        return list(decode_week(words))
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the current half-hour slot is active."""
+        if self._schedule_tracker is not None:
+            return self._schedule_tracker.active
+        slots = self.slots
+        if slots is None:
+            return None
+        return is_slot_active(slots, dt_util.now())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the compact slot grid."""
+        return {ATTR_SLOTS: self.slots}
+
+    def _is_value_valid(self) -> bool:
+        """Check that all AM/PM words are present."""
+        return self._get_words() is not None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update state if the schedule or the active slot changed."""
+        if self._async_defer_update():
+            return
+        self._async_write_if_changed()
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write state only when the schedule or the active slot changed."""
+        state = (self.available, self._get_words(), self.is_on)
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
+
+    async def async_set_schedule(
+        self,
+        slots: list[int] | None = None,
+        days: dict[str, int] | None = None,
+    ) -> None:
+        """Write a week in one batch, touching only the changed words.
+
+        ``slots`` replaces the whole week; ``days`` replaces single days, given
+        as already-encoded day masks (see ``SET_SCHEDULE_SCHEMA``). Replacing
+        only some days needs the current week, so that the others are kept.
+        """
+        if slots is None:
+            slots = self.slots
+        if slots is None:
+            if len(days or {}) < len(SCHEDULE_DAYS):
+                raise HomeAssistantError(
+                    f"The current schedule of {self.entity_id} is unknown, give all {len(SCHEDULE_DAYS)} days"
+                )
+            slots = [0] * len(SCHEDULE_DAYS)
+        slots = list(slots)
+        for day, day_mask in (days or {}).items():
+            slots[SCHEDULE_DAYS.index(day)] = day_mask
+
+        values = self.coordinator.build_schedule_values(self._description.param_ids, slots)
+
+        _LOGGER.debug("Setting %s (%s) to %s", self._description.key, self._device_id, slots)
+        await self.coordinator.async_set_params(values)
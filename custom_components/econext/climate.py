@@ -20,6 +20,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .const import DOMAIN
 from .coordinator import EconextCoordinator
 from .entity import EconextEntity
+from .schedule import ScheduleTracker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -89,6 +90,19 @@ class Circuit:
     schedule_saturday_am: str
     schedule_saturday_pm: str
 
+    @property
+    def schedule_param_ids(self) -> tuple[tuple[str, str], ...]:
+        """Return the (AM, PM) schedule param IDs per day, Sunday first."""
+        return (
+            (self.schedule_sunday_am, self.schedule_sunday_pm),
+            (self.schedule_monday_am, self.schedule_monday_pm),
+            (self.schedule_tuesday_am, self.schedule_tuesday_pm),
+            (self.schedule_wednesday_am, self.schedule_wednesday_pm),
+            (self.schedule_thursday_am, self.schedule_thursday_pm),
+            (self.schedule_friday_am, self.schedule_friday_pm),
+            (self.schedule_saturday_am, self.schedule_saturday_pm),
+        )
+
 
 CIRCUITS = {
     1: Circuit(
@@ -400,6 +414,7 @@ async def async_setup_entry(
                     circuit.comfort_param,
                     circuit.eco_param,
                     circuit.room_temp_setpoint_param,
+                    schedule_param_ids=circuit.schedule_param_ids,
                 )
             )
             _LOGGER.debug("Adding climate entity for Circuit %s", circuit_num)
@@ -438,6 +453,7 @@ class CircuitClimate(EconextEntity, ClimateEntity):
         comfort_param: str,
         eco_param: str,
         room_temp_setpoint_param: str,
+        schedule_param_ids: tuple[tuple[str, str], ...] = (),
     ) -> None:
         """Initialize the climate entity."""
         # Use work_state_param as primary param for entity base
@@ -451,6 +467,7 @@ class CircuitClimate(EconextEntity, ClimateEntity):
         self._comfort_param = comfort_param
         self._eco_param = eco_param
         self._room_temp_setpoint_param = room_temp_setpoint_param
+        self._schedule_param_ids = schedule_param_ids
 
         # Get custom circuit name from controller
         name_param_data = coordinator.get_param(name_param)
@@ -465,6 +482,15 @@ class CircuitClimate(EconextEntity, ClimateEntity):
         # Track last preset mode to restore when switching back to HEAT
         self._last_preset: str | None = None
 
+        # Follows the circuit schedule while the entity is added to hass
+        self._schedule_tracker: ScheduleTracker | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start following the circuit schedule."""
+        await super().async_added_to_hass()
+        if self._schedule_param_ids:
+            self._schedule_tracker = self._async_follow_schedule(self._schedule_param_ids, self.async_write_ha_state)
+
     @property
     def hvac_modes(self) -> list[HVACMode]:
         """Return available HVAC modes.
@@ -600,7 +626,16 @@ class CircuitClimate(EconextEntity, ClimateEntity):
         return None
 
     def _detect_active_preset(self) -> str | None:
-        """Detect which preset is currently active in AUTO mode by comparing setpoint."""
+        """Detect which preset is currently active in AUTO mode.
+
+        Uses the decoded circuit schedule when it is being tracked, so the preset
+        flips exactly at the slot boundary. Otherwise falls back to comparing the
+        room setpoint to the eco and comfort temperatures.
+        """
+        if self._schedule_tracker is not None and self._schedule_tracker.active is not None:
+            self._last_preset = PRESET_COMFORT if self._schedule_tracker.active else PRESET_ECO
+            return self._last_preset
+
         # Get current room temperature setpoint (the target temp the system is using)
         setpoint_param = self.coordinator.get_param(self._room_temp_setpoint_param)
         if not setpoint_param:
@@ -1,16 +1,33 @@
 """Config flow for ecoNEXT integration."""
 
+from ipaddress import ip_network
 import logging
 from typing import Any
 
-from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
+from homeassistant.components import network
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import voluptuous as vol
 
 from .api import EconextConnectionError, EconextApi
-from .const import DEFAULT_PORT, DOMAIN
+from .const import (
+    CONF_DEDICATED_CONNECTION,
+    CONF_GATEWAY,
+    CONF_MAX_STALENESS,
+    CONF_NETWORK,
+    CONF_PUSH_UPDATES,
+    CONF_STALE_FAILURES,
+    DEFAULT_DEDICATED_CONNECTION,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_PORT,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_STALE_FAILURES,
+    DOMAIN,
+)
+from .discovery import DiscoveredGateway, async_discover_gateways, scan_network
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +44,11 @@ class EconextConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        # Gateways found by the discovery step and not set up yet, by UID
+        self._discovered: dict[str, DiscoveredGateway] = {}
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
@@ -34,7 +56,73 @@ class EconextConfigFlow(ConfigFlow, domain=DOMAIN):
         return EconextOptionsFlow(config_entry)
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
-        """Handle the initial step."""
+        """Handle the initial step: scan the network or enter the gateway address."""
+        return self.async_show_menu(step_id="user", menu_options=["discover", "manual"])
+
+    async def async_step_discover(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Scan a subnet, by default the /24 Home Assistant is on, for gateways."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                subnet = scan_network(user_input[CONF_NETWORK])
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                found = await async_discover_gateways(
+                    async_get_clientsession(self.hass), subnet, port=user_input[CONF_PORT]
+                )
+                configured = self._async_current_ids(include_ignore=False)
+                self._discovered = {gateway.uid: gateway for gateway in found if gateway.uid not in configured}
+                if self._discovered:
+                    return await self.async_step_pick()
+                errors["base"] = "no_devices_found"
+
+        defaults = user_input or {CONF_NETWORK: await self._async_local_network(), CONF_PORT: DEFAULT_PORT}
+        return self.async_show_form(
+            step_id="discover",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NETWORK, default=defaults[CONF_NETWORK]): str,
+                    vol.Optional(CONF_PORT, default=defaults[CONF_PORT]): int,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_pick(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Set up one of the discovered gateways."""
+        if user_input is not None:
+            gateway = self._discovered[user_input[CONF_GATEWAY]]
+            await self.async_set_unique_id(gateway.uid)
+            self._abort_if_unique_id_configured()
+
+            return self.async_create_entry(
+                title=gateway.name,
+                data={CONF_HOST: gateway.host, CONF_PORT: gateway.port},
+            )
+
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_GATEWAY): vol.In(
+                        {uid: f"{gateway.name} at {gateway.host} ({uid})" for uid, gateway in self._discovered.items()}
+                    )
+                }
+            ),
+        )
+
+    async def _async_local_network(self) -> str:
+        """Return the /24 of Home Assistant's own address."""
+        try:
+            source_ip = await network.async_get_source_ip(self.hass)
+        except HomeAssistantError:
+            return "192.168.1.0/24"
+        return str(ip_network(f"{source_ip}/24", strict=False))
+
+    async def async_step_manual(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Set up a gateway from its address."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -56,7 +144,7 @@ class EconextConfigFlow(ConfigFlow, domain=DOMAIN):
                 )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
@@ -94,16 +182,33 @@ class EconextConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
     async def _async_validate_input(self, data: dict[str, Any]) -> dict[str, Any]:
-        """Validate the user input and return device info."""
-        session = async_get_clientsession(self.hass)
-        api = EconextApi(
-            host=data[CONF_HOST],
-            port=data[CONF_PORT],
-            session=session,
-        )
+        """Validate the user input and return device info.
+
+        A gateway that is already set up is checked through its entry's API
+        client, whose latest poll usually answers without a request.
+        """
+        api = self._async_loaded_api(data)
+        if api is None:
+            api = EconextApi(
+                host=data[CONF_HOST],
+                port=data[CONF_PORT],
+                session=async_get_clientsession(self.hass),
+            )
 
         return await api.async_test_connection()
 
+    @callback
+    def _async_loaded_api(self, data: dict[str, Any]) -> EconextApi | None:
+        """Return the API client of a loaded entry for the same gateway, if any."""
+        for entry in self._async_current_entries(include_ignore=False):
+            if (
+                entry.state is ConfigEntryState.LOADED
+                and entry.data.get(CONF_HOST) == data[CONF_HOST]
+                and entry.data.get(CONF_PORT, DEFAULT_PORT) == data[CONF_PORT]
+            ):
+                return entry.runtime_data.api
+        return None
+
 
 class EconextOptionsFlow(OptionsFlow):
     """Handle options flow for ecoNEXT."""
@@ -113,6 +218,36 @@ class EconextOptionsFlow(OptionsFlow):
         self._config_entry = config_entry
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
-        """Manage the options."""
-        # For now, redirect to reconfigure since all settings are in data, not options
-        return self.async_abort(reason="reconfigure_instead")
+        """Manage the options.
+
+        Connection settings live in the entry data and are changed through
+        reconfigure; the options tune how failed polls are handled, how the
+        gateway is connected to and whether it pushes changes.
+        """
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self._config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_STALE_FAILURES,
+                        default=options.get(CONF_STALE_FAILURES, DEFAULT_STALE_FAILURES),
+                    ): vol.All(int, vol.Range(min=1, max=100)),
+                    vol.Required(
+                        CONF_MAX_STALENESS,
+                        default=options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+                    ): vol.All(int, vol.Range(min=0, max=86400)),
+                    vol.Required(
+                        CONF_DEDICATED_CONNECTION,
+                        default=options.get(CONF_DEDICATED_CONNECTION, DEFAULT_DEDICATED_CONNECTION),
+                    ): bool,
+                    vol.Required(
+                        CONF_PUSH_UPDATES,
+                        default=options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES),
+                    ): bool,
+                }
+            ),
+        )
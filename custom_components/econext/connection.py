@@ -0,0 +1,133 @@
+"""Connection state tracking for the ecoNEXT gateway.
+
+``ConnectionBreaker`` decides how soon the coordinator polls again after the
+gateway stops answering:
+
+- ``connected``: polls run at the normal interval.
+- ``backoff``: after a failure, full polls continue at exponentially growing
+  intervals with jitter, so several controllers do not retry in lockstep.
+  The first retry waits about twice the poll interval, so even with jitter
+  it comes later than the poll it replaces.
+- ``open``: after ``failure_threshold`` consecutive failures the breaker
+  opens. Refreshes are rejected without touching the network until the
+  open period has passed, then a cheap probe must succeed before full polls
+  resume.
+
+The time spent in each state is kept for the diagnostics download.
+"""
+
+from enum import StrEnum
+import random
+import time
+from typing import Any
+
+from .const import (
+    BACKOFF_MAX_SECONDS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_OPEN_SECONDS,
+    UPDATE_INTERVAL,
+)
+
+
+class ConnectionState(StrEnum):
+    """State of the connection to the gateway."""
+
+    CONNECTED = "connected"
+    BACKOFF = "backoff"
+    OPEN = "open"
+
+
+class ConnectionBreaker:
+    """Backoff and circuit breaker for gateway polls."""
+
+    def __init__(
+        self,
+        *,
+        base_delay: float = UPDATE_INTERVAL,
+        max_delay: float = BACKOFF_MAX_SECONDS,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        open_seconds: float = BREAKER_OPEN_SECONDS,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the breaker in the connected state."""
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.random = random.Random(seed)
+
+        self.state = ConnectionState.CONNECTED
+        self.failures = 0
+        # Refreshes turned away while open, and probes sent to close the breaker
+        self.rejected = 0
+        self.probes = 0
+        self.transitions = 0
+        self._retry_at = 0.0
+        self._since = time.monotonic()
+        self._durations = dict.fromkeys(ConnectionState, 0.0)
+
+    def _jitter(self, delay: float) -> float:
+        """Return a delay between three quarters and all of ``delay``."""
+        return delay * 3 / 4 + self.random.uniform(0, delay / 4)
+
+    def _set_state(self, state: ConnectionState) -> None:
+        """Move to ``state``, booking the time spent in the previous one."""
+        if state is self.state:
+            return
+        now = time.monotonic()
+        self._durations[self.state] += now - self._since
+        self._since = now
+        self.state = state
+        self.transitions += 1
+
+    def allow_request(self) -> bool:
+        """Return True if a request may go out now; count it as rejected if not."""
+        if self.state is ConnectionState.OPEN and time.monotonic() < self._retry_at:
+            self.rejected += 1
+            return False
+        return True
+
+    @property
+    def needs_probe(self) -> bool:
+        """Return True if a probe must succeed before the next full poll."""
+        return self.state is ConnectionState.OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the breaker lets the next request through."""
+        return max(self._retry_at - time.monotonic(), 0.0)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful poll."""
+        self.failures = 0
+        self._set_state(ConnectionState.CONNECTED)
+
+    def record_failure(self) -> float:
+        """Count a failed poll or probe; return the seconds until the next attempt."""
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._set_state(ConnectionState.OPEN)
+            delay = self._jitter(self.open_seconds)
+        else:
+            self._set_state(ConnectionState.BACKOFF)
+            delay = self._jitter(min(self.base_delay * 2**self.failures, self.max_delay))
+        self._retry_at = time.monotonic() + delay
+        return delay
+
+    def time_in_state(self) -> dict[str, float]:
+        """Return the seconds spent in each state, including the current one."""
+        durations = dict(self._durations)
+        durations[self.state] += time.monotonic() - self._since
+        return {str(state): round(seconds, 3) for state, seconds in durations.items()}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state and counters for diagnostics."""
+        return {
+            "state": str(self.state),
+            "consecutive_failures": self.failures,
+            "retry_in": round(self.retry_in, 1),
+            "rejected": self.rejected,
+            "probes": self.probes,
+            "transitions": self.transitions,
+            "seconds_in_state": self.time_in_state(),
+        }
@@ -7,8 +7,10 @@ from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import (
     PERCENTAGE,
     EntityCategory,
+    UnitOfInformation,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
 
 DOMAIN = "econext"
@@ -27,17 +29,115 @@ PLATFORMS: list[str] = [
 # Configuration keys
 CONF_HOST = "host"
 CONF_PORT = "port"
+CONF_STALE_FAILURES = "stale_failures"
+CONF_MAX_STALENESS = "max_staleness"
+CONF_DEDICATED_CONNECTION = "dedicated_connection"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_NETWORK = "network"
+CONF_GATEWAY = "gateway"
 
 # Default values
 DEFAULT_PORT = 8000
 
+# Stale-data grace: entities keep showing the last data through failed polls
+# until this many polls failed in a row or the data is this many seconds old
+DEFAULT_STALE_FAILURES = 3
+DEFAULT_MAX_STALENESS = 120
+
+# Dedicated gateway connection pool: connections kept open between polls
+# (longer than UPDATE_INTERVAL so every poll reuses one), at most
+# CONNECTION_LIMIT at a time, with the host lookup cached for DNS_CACHE_SECONDS
+DEFAULT_DEDICATED_CONNECTION = False
+CONNECTION_LIMIT = 2
+KEEPALIVE_SECONDS = 60
+DNS_CACHE_SECONDS = 300
+
+# Push updates: while the gateway streams parameter changes, full polls only run
+# every STREAM_RESYNC_INTERVAL as a safety net. A dropped stream falls back to
+# polling and is reconnected after STREAM_RETRY_SECONDS, doubling per attempt up
+# to BACKOFF_MAX_SECONDS; heartbeats every STREAM_HEARTBEAT seconds detect a
+# connection that died silently
+DEFAULT_PUSH_UPDATES = False
+STREAM_RESYNC_INTERVAL = 300
+STREAM_RETRY_SECONDS = 5
+STREAM_HEARTBEAT = 30
+
 # API endpoints
 API_ENDPOINT_PARAMETERS = "/api/parameters"
 API_ENDPOINT_ALARMS = "/api/alarms"
+API_ENDPOINT_SCHEMA = "/api/schema"
+API_ENDPOINT_STREAM = "/api/ws"
 
 # Update interval in seconds
 UPDATE_INTERVAL = 10
 
+# Shared poll scheduler (in hass.data under DATA_SCHEDULER): fetches of
+# different gateways start at least the interval divided by the number of
+# gateways apart, but no more than POLL_SPACING_MAX seconds, and at most
+# POLL_MAX_CONCURRENT fetch and decode at once
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+POLL_SPACING_MAX = 1.0
+POLL_MAX_CONCURRENT = 2
+
+# Load shedding (monitor in hass.data under DATA_LOOP_LAG): the event loop lag
+# is sampled every LOOP_LAG_INTERVAL seconds. While the median of the last
+# LOOP_LAG_WINDOW samples exceeds LOOP_LAG_THRESHOLD_MS, alarm fetches and state
+# updates of configuration, schedule and diagnostic entities are deferred, but
+# none for longer than SHED_MAX_DEFER_SECONDS
+DATA_LOOP_LAG = f"{DOMAIN}_loop_lag"
+LOOP_LAG_INTERVAL = 1.0
+LOOP_LAG_THRESHOLD_MS = 100
+LOOP_LAG_WINDOW = 10
+SHED_MAX_DEFER_SECONDS = 60
+
+# Request timeouts in seconds; the probe only checks the gateway answers at all
+REQUEST_TIMEOUT = 10
+PROBE_TIMEOUT = 3
+
+# Controller identity: UID and device name, by index and gateway name. A full
+# fetch at most IDENTITY_MAX_AGE seconds old answers identity lookups.
+IDENTITY_PARAMS = {"10": "UID", "374": "Nazwa"}
+IDENTITY_MAX_AGE = 60
+
+# Discovery: addresses probed at once, seconds to wait for the gateway port to
+# accept a connection and for an open port to answer with its identity, and
+# the largest subnet scanned
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_CONNECT_TIMEOUT = 0.5
+DISCOVERY_VERIFY_TIMEOUT = 5
+DISCOVERY_MAX_HOSTS = 1024
+
+# Connection backoff: failed polls are retried after twice UPDATE_INTERVAL,
+# doubling per failure up to BACKOFF_MAX_SECONDS. After BREAKER_FAILURE_THRESHOLD failures in
+# a row polls stop for BREAKER_OPEN_SECONDS and resume once a probe succeeds.
+BACKOFF_MAX_SECONDS = 120
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_OPEN_SECONDS = 300
+
+# Number of polls kept in the rolling poll metrics (one hour at the default interval)
+METRICS_WINDOW = 360
+
+# Diagnostics download
+# Parameters holding network details: WiFi SSID/password, WiFi and LAN IP/mask/gateway
+DIAGNOSTICS_REDACT_PARAMS: frozenset[str] = frozenset(
+    {"377", "379", "381", "382", "383", "384", "385", "386", "860", "861", "862", "863", "864", "865"}
+)
+DIAGNOSTICS_MAX_PARAMS = 5000
+DIAGNOSTICS_MAX_ALARMS = 50
+# Parameters copied into the snapshot before yielding to the event loop
+DIAGNOSTICS_CHUNK_SIZE = 250
+
+# Schedule layout: 7 days (Sunday first), each split into an AM and a PM word
+# of 24 half-hour slots. A day is 48 slots.
+SCHEDULE_DAYS: list[str] = ["sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
+SCHEDULE_SLOTS_PER_WORD = 24
+SCHEDULE_SLOTS_PER_DAY = 48
+
+# Services
+SERVICE_SET_SCHEDULE = "set_schedule"
+SERVICE_PROFILE = "profile"
+SERVICE_RECORD_SESSION = "record_session"
+
 # Device info
 MANUFACTURER = "Plum"
 
@@ -177,6 +277,7 @@ class EconextSensorEntityDescription:
     value_map: dict[int, str] | None = None  # Map raw values to enum strings
     param_id_am: str | None = None  # For schedule diagnostic sensors - AM param
     param_id_pm: str | None = None  # For schedule diagnostic sensors - PM param
+    entity_registry_enabled_default: bool = True
 
 
 @dataclass(frozen=True)
@@ -194,6 +295,7 @@ class EconextNumberEntityDescription:
     native_step: float = 1.0
     min_value_param_id: str | None = None  # Dynamic min from another param's value
     max_value_param_id: str | None = None  # Dynamic max from another param's value
+    entity_registry_enabled_default: bool = True
 
 
 @dataclass(frozen=True)
@@ -223,6 +325,27 @@ class EconextSwitchEntityDescription:
     invert_logic: bool = False  # If True, bit=0 means ON, bit=1 means OFF
 
 
+@dataclass(frozen=True)
+class EconextScheduleEntityDescription:
+    """Describes an Econext weekly schedule entity."""
+
+    key: str  # Translation key
+    param_ids: tuple[tuple[str, str], ...]  # (AM, PM) param IDs per day, Sunday first
+    device_type: DeviceType = DeviceType.CONTROLLER
+    icon: str | None = None
+
+
+@dataclass(frozen=True)
+class EconextMetricSensorEntityDescription:
+    """Describes an Econext poll metric sensor entity."""
+
+    key: str  # Translation key
+    metric: str  # Histogram name in PollMetrics
+    native_unit_of_measurement: str | None = None
+    icon: str | None = None
+    precision: int | None = None
+
+
 @dataclass(frozen=True)
 class EconextButtonEntityDescription:
     """Describes an Econext button entity."""
@@ -783,6 +906,15 @@ SILENT_MODE_SCHEDULE_DIAGNOSTIC_SENSORS: tuple[EconextSensorEntityDescription, .
 )
 
 
+# Silent mode weekly schedule - one entity holding all 14 AM/PM words
+SILENT_MODE_SCHEDULE: EconextScheduleEntityDescription = EconextScheduleEntityDescription(
+    key="silent_mode_schedule",
+    param_ids=tuple((str(am_id), str(pm_id)) for _, am_id, pm_id in _SILENT_MODE_SCHEDULE_DAYS),
+    device_type=DeviceType.HEATPUMP,
+    icon="mdi:calendar-clock",
+)
+
+
 # Heat pump schedule entities - bitfield for 30-minute time slots
 # Generated programmatically to reduce repetition
 _HEATPUMP_SCHEDULE_DAYS = [
@@ -826,6 +958,15 @@ HEATPUMP_SCHEDULE_DIAGNOSTIC_SENSORS: tuple[EconextSensorEntityDescription, ...]
 )
 
 
+# Heat pump weekly schedule - one entity holding all 14 AM/PM words
+HEATPUMP_SCHEDULE: EconextScheduleEntityDescription = EconextScheduleEntityDescription(
+    key="heatpump_schedule",
+    param_ids=tuple((str(am_id), str(pm_id)) for _, am_id, pm_id in _HEATPUMP_SCHEDULE_DAYS),
+    device_type=DeviceType.HEATPUMP,
+    icon="mdi:calendar-clock",
+)
+
+
 # ============================================================================
 # DHW (Domestic Hot Water) Device
 # ============================================================================
@@ -992,6 +1133,15 @@ DHW_SCHEDULE_DIAGNOSTIC_SENSORS: tuple[EconextSensorEntityDescription, ...] = tu
 )
 
 
+# DHW weekly schedule - one entity holding all 14 AM/PM words
+DHW_SCHEDULE: EconextScheduleEntityDescription = EconextScheduleEntityDescription(
+    key="hdw_schedule",
+    param_ids=tuple((str(am_id), str(pm_id)) for _, am_id, pm_id in _DHW_SCHEDULE_DAYS),
+    device_type=DeviceType.DHW,
+    icon="mdi:calendar-clock",
+)
+
+
 # DHW switch entities
 DHW_SWITCHES: tuple[EconextSwitchEntityDescription, ...] = (
     # Boost - start/stop immediate DHW heating
@@ -1351,3 +1501,64 @@ CIRCUIT_SCHEDULE_DIAGNOSTIC_SENSORS: tuple[EconextSensorEntityDescription, ...]
     )
     for day, _, _ in _CIRCUIT_SCHEDULE_DAYS
 )
+
+
+# Circuit weekly schedule - template description, param_ids are set dynamically per circuit
+CIRCUIT_SCHEDULE: EconextScheduleEntityDescription = EconextScheduleEntityDescription(
+    key="schedule",
+    param_ids=(),  # Set dynamically per circuit
+    device_type=DeviceType.CIRCUIT,
+    icon="mdi:calendar-clock",
+)
+
+
+# Poll metric sensors - diagnostic, disabled by default
+# The state is the latest poll; the rolling summary is in the attributes
+POLL_METRIC_SENSORS: tuple[EconextMetricSensorEntityDescription, ...] = (
+    EconextMetricSensorEntityDescription(
+        key="poll_latency",
+        metric="latency_ms",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        icon="mdi:timer-outline",
+        precision=1,
+    ),
+    EconextMetricSensorEntityDescription(
+        key="poll_payload_size",
+        metric="bytes_received",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        icon="mdi:download-network-outline",
+        precision=0,
+    ),
+    EconextMetricSensorEntityDescription(
+        key="poll_decode_time",
+        metric="decode_ms",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        icon="mdi:code-json",
+        precision=2,
+    ),
+    EconextMetricSensorEntityDescription(
+        key="poll_mapping_time",
+        metric="mapping_ms",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        icon="mdi:table-arrow-right",
+        precision=2,
+    ),
+    EconextMetricSensorEntityDescription(
+        key="poll_changed_parameters",
+        metric="changed_params",
+        icon="mdi:swap-horizontal",
+        precision=0,
+    ),
+    EconextMetricSensorEntityDescription(
+        key="poll_entities_notified",
+        metric="entities_notified",
+        icon="mdi:bell-ring-outline",
+        precision=0,
+    ),
+    EconextMetricSensorEntityDescription(
+        key="poll_state_writes",
+        metric="state_writes",
+        icon="mdi:database-edit-outline",
+        precision=0,
+    ),
+)
@@ -1,14 +1,38 @@
 """Data coordinator for ecoNEXT."""
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable
+import contextlib
+from datetime import datetime, timedelta
 import logging
+from pathlib import Path
+import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import EconextApiError, EconextApi
-from .const import DOMAIN, UPDATE_INTERVAL
+from .api import EconextApiError, EconextApi, EconextConnectionError, EconextUnsupportedError
+from .connection import ConnectionBreaker, ConnectionState
+from .const import (
+    BACKOFF_MAX_SECONDS,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_PUSH_UPDATES,
+    DEFAULT_STALE_FAILURES,
+    DOMAIN,
+    SHED_MAX_DEFER_SECONDS,
+    STREAM_RESYNC_INTERVAL,
+    STREAM_RETRY_SECONDS,
+    UPDATE_INTERVAL,
+)
+from .loop_lag import LoopLagMonitor
+from .metrics import PollMetrics, StreamStats
+from .profiler import CoordinatorProfiler
+from .recorder import SessionRecorder
+from .schedule import WORD_MASK, ScheduleTracker, encode_week
+from .scheduler import ScheduledEntry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,8 +40,34 @@ _LOGGER = logging.getLogger(__name__)
 class EconextCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
     """Coordinator to manage data updates from econext device."""
 
-    def __init__(self, hass: HomeAssistant, api: EconextApi) -> None:
-        """Initialize the coordinator."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: EconextApi,
+        *,
+        stale_failures: int = DEFAULT_STALE_FAILURES,
+        max_staleness: float = DEFAULT_MAX_STALENESS,
+        push_updates: bool = DEFAULT_PUSH_UPDATES,
+        scheduler_entry: ScheduledEntry | None = None,
+        loop_lag: LoopLagMonitor | None = None,
+    ) -> None:
+        """Initialize the coordinator.
+
+        Args:
+            hass: Home Assistant instance.
+            api: Gateway API client.
+            stale_failures: Failed polls in a row after which entities become
+                unavailable; 1 disables the grace period.
+            max_staleness: Seconds after the last successful poll after which
+                entities become unavailable, however few polls failed.
+            push_updates: Follow the gateway's change stream once started with
+                ``async_start_stream``, polling only to resync.
+            scheduler_entry: This entry's place in the shared poll scheduler, which
+                staggers and caps fetches across gateways.
+            loop_lag: Event loop lag monitor; while it reports pressure, alarm
+                fetches and low-priority entity updates are deferred.
+
+        """
         super().__init__(
             hass,
             _LOGGER,
@@ -26,22 +76,401 @@ class EconextCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
         )
         self.api = api
         self._alarms: list[dict[str, Any]] = []
+        self.metrics = PollMetrics()
+        # Backs polls off while the gateway is unreachable
+        self.connection = ConnectionBreaker()
+        # State writes issued by entities during the current listener fan-out
+        self.state_writes = 0
+        # Set by the profile service for the next few cycles
+        self.profiler: CoordinatorProfiler | None = None
+        # Stops the session recording in progress
+        self._unsub_recording: CALLBACK_TYPE | None = None
+
+        self.stale_failures = stale_failures
+        self.max_staleness = max_staleness
+        # Time of the last successful poll
+        self.last_data_update: datetime | None = None
+        # Availability the entities last rendered, and the timer ending the grace period
+        self._shown_available = True
+        self._unsub_stale: CALLBACK_TYPE | None = None
+
+        self.push_updates = push_updates
+        # True while changes arrive through the gateway's stream
+        self.streaming = False
+        self.stream = StreamStats()
+        self._stream_task: asyncio.Task[None] | None = None
+        # Set while listeners are notified of pushed changes
+        self._pushing = False
+        self.scheduler_entry = scheduler_entry
+
+        self.loop_lag = loop_lag
+        # When alarm fetches started being skipped, and set while every listener must update
+        self._alarms_deferred_since: float | None = None
+        self._deliver_all = False
+        # Listener updates skipped while shedding, and the timer delivering them
+        self._deferred_updates: set[CALLBACK_TYPE] = set()
+        self._unsub_deferred: CALLBACK_TYPE | None = None
+
+        # One tracker per followed schedule, shared by the entities showing it
+        self._schedule_trackers: dict[tuple[tuple[str, str], ...], ScheduleTracker] = {}
 
     async def _async_update_data(self) -> dict[str, dict[str, Any]]:
         """Fetch data from the API."""
+        if not self.connection.allow_request():
+            self.update_interval = timedelta(seconds=max(self.connection.retry_in, 1))
+            raise UpdateFailed(f"Gateway unreachable, next attempt in {self.connection.retry_in:.0f}s")
+
+        if self.connection.needs_probe:
+            self.connection.probes += 1
+            try:
+                await self.api.async_probe()
+            except EconextApiError as err:
+                self.metrics.record_error("probe")
+                self._backoff()
+                raise UpdateFailed(f"Gateway still unreachable: {err}") from err
+
+        # A retry may wait for the full timeout; keep it out of the slots shared with healthy gateways
+        slot = (
+            self.scheduler_entry.async_slot(shared=self.connection.state is ConnectionState.CONNECTED)
+            if self.scheduler_entry is not None
+            else contextlib.nullcontext()
+        )
         try:
-            params = await self.api.async_fetch_all_params()
+            async with slot:
+                # Profile from when this entry's turn comes, not while it waits
+                if self.profiler is not None:
+                    self.profiler.start_cycle()
+                params = await self.api.async_fetch_all_params()
         except EconextApiError as err:
+            self.metrics.record_error("fetch_connection" if isinstance(err, EconextConnectionError) else "fetch_api")
+            self._backoff()
             raise UpdateFailed(f"Error fetching data: {err}") from err
 
+        if self.connection.state is not ConnectionState.CONNECTED:
+            self.update_interval = self._poll_interval
+            _LOGGER.info(
+                "ecoNEXT gateway reachable again, resuming polls every %ds", self.update_interval.total_seconds()
+            )
+        self.connection.record_success()
+        self.last_data_update = dt_util.utcnow()
+
+        if self.api.last_fetch is not None:
+            self.metrics.record_fetch(self.api.last_fetch)
+        self.metrics.changed_params.add(self._count_changed(params))
+
+        if self.shedding:
+            self.metrics.polls_under_pressure += 1
+            if self._alarms_deferred_since is None:
+                self._alarms_deferred_since = time.monotonic()
+            if time.monotonic() - self._alarms_deferred_since < SHED_MAX_DEFER_SECONDS:
+                self.metrics.deferred["alarms"] += 1
+                _LOGGER.debug("Event loop lagging, deferring the alarm fetch")
+                return params
+        self._alarms_deferred_since = None
+
         # Fetch alarms (non-fatal - alarms are secondary to parameters)
         try:
             self._alarms = await self.api.async_fetch_alarms()
         except EconextApiError:
+            self.metrics.record_error("alarms")
             _LOGGER.debug("Failed to fetch alarms, keeping previous data")
 
         return params
 
+    def _backoff(self) -> None:
+        """Count a failed attempt and push the next poll out accordingly."""
+        was_open = self.connection.state is ConnectionState.OPEN
+        delay = self.connection.record_failure()
+        self.update_interval = timedelta(seconds=delay)
+        if self.connection.state is ConnectionState.OPEN and not was_open:
+            _LOGGER.warning(
+                "ecoNEXT gateway unreachable after %d attempts, pausing polls for %.0fs",
+                self.connection.failures,
+                delay,
+            )
+
+    @property
+    def shedding(self) -> bool:
+        """Return True while low-priority work should be deferred.
+
+        That is while the event loop lags, except for updates that change
+        availability or carry the result of a user's write.
+        """
+        return self.loop_lag is not None and self.loop_lag.under_pressure and not self._deliver_all
+
+    @property
+    def _poll_interval(self) -> timedelta:
+        """Return the interval of full polls while the gateway is reachable."""
+        return timedelta(seconds=STREAM_RESYNC_INTERVAL if self.streaming else UPDATE_INTERVAL)
+
+    @callback
+    def async_start_stream(self) -> None:
+        """Start following the gateway's change stream, if push updates are on."""
+        if not self.push_updates or self._stream_task is not None:
+            return
+        self._stream_task = self.hass.async_create_background_task(
+            self._async_run_stream(), f"{DOMAIN} stream {self.get_device_uid()}"
+        )
+
+    async def _async_run_stream(self) -> None:
+        """Apply pushed changes, falling back to polling while the stream is down.
+
+        A poll runs whenever the stream comes up or drops, so changes missed
+        in between are picked up; the stream is reconnected with backoff
+        until the gateway turns out not to have one.
+        """
+        delay = STREAM_RETRY_SECONDS
+        while True:
+            try:
+                async for changes in self.api.async_stream_changes():
+                    if not self.streaming:
+                        await self._async_set_streaming(True)
+                        delay = STREAM_RETRY_SECONDS
+                    if changes:
+                        self.async_apply_changes(changes)
+            except EconextUnsupportedError:
+                self.stream.supported = False
+                _LOGGER.info("ecoNEXT gateway does not push updates, polling every %ds", UPDATE_INTERVAL)
+                return
+            except EconextApiError as err:
+                self.stream.last_error = str(err)
+                self.metrics.record_error("stream")
+
+            if self.streaming:
+                self.stream.drops += 1
+                _LOGGER.info("ecoNEXT update stream dropped, polling every %ds until it is back", UPDATE_INTERVAL)
+                await self._async_set_streaming(False)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BACKOFF_MAX_SECONDS)
+
+    async def _async_set_streaming(self, streaming: bool) -> None:
+        """Switch between push updates and polling, and resync with a poll."""
+        self.streaming = streaming
+        if streaming:
+            self.stream.supported = True
+            self.stream.connects += 1
+        if self.connection.state is ConnectionState.CONNECTED:
+            self.update_interval = self._poll_interval
+        await self.async_request_refresh()
+
+    @callback
+    def async_apply_changes(self, changes: dict[str, Any]) -> None:
+        """Apply a batch of pushed values to the data and notify listeners if any changed."""
+        self.stream.events += 1
+        if self.data is None:
+            return
+        changed = 0
+        for param_id, value in changes.items():
+            if (param := self.data.get(param_id)) is not None and param.get("value") != value:
+                param["value"] = value
+                changed += 1
+        self.last_data_update = dt_util.utcnow()
+        if changed:
+            self.stream.changes += changed
+            self._pushing = True
+            try:
+                self.async_update_listeners()
+            finally:
+                self._pushing = False
+
+    def _count_changed(self, params: dict[str, dict[str, Any]]) -> int:
+        """Count parameters whose value differs from the previous poll."""
+        if self.data is None:
+            return len(params)
+        previous = self.data
+        return sum(
+            1
+            for key, param in params.items()
+            if key not in previous or previous[key].get("value") != param.get("value")
+        )
+
+    @property
+    def data_age(self) -> float | None:
+        """Return the seconds since the last successful poll."""
+        if self.last_data_update is None:
+            return None
+        return (dt_util.utcnow() - self.last_data_update).total_seconds()
+
+    @property
+    def data_available(self) -> bool:
+        """Return True while entities should show the coordinator data.
+
+        After a failed poll the last data stays available until
+        ``stale_failures`` polls failed in a row or it is older than
+        ``max_staleness``.
+        """
+        if self.last_update_success:
+            return True
+        if self.data is None or (age := self.data_age) is None:
+            return False
+        return self.connection.failures < self.stale_failures and age < self.max_staleness
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners and record the fan-out cost.
+
+        A failed poll leaves the data as it was, so listeners are only
+        notified of one if it changes whether the data is available. Pushed
+        changes are always passed on, even while the last poll failed.
+        """
+        available = self.data_available
+        if not self.last_update_success and not self._pushing and available == self._shown_available:
+            return
+        changed = available != self._shown_available
+        self._shown_available = available
+        # Re-arm schedule timers before the entities render
+        for param_ids, tracker in self._schedule_trackers.items():
+            tracker.async_update(self.get_schedule_words(param_ids))
+        self.state_writes = 0
+        if changed or not self.shedding:
+            # Every listener hears of this update, including the deferred ones
+            self._async_cancel_deferred_updates()
+        if changed:
+            self._async_update_all_listeners()
+        else:
+            super().async_update_listeners()
+        self.metrics.record_fanout(len(self._listeners), self.state_writes)
+        self._async_end_profile_cycle()
+
+    @callback
+    def _async_update_all_listeners(self) -> None:
+        """Notify listeners without deferring any low-priority entity."""
+        self._deliver_all = True
+        try:
+            super().async_update_listeners()
+        finally:
+            self._deliver_all = False
+
+    @callback
+    def async_defer_update(self, update: CALLBACK_TYPE) -> None:
+        """Skip a listener's update while shedding load.
+
+        The update is delivered with the next one that is not shed, or at the
+        latest ``SHED_MAX_DEFER_SECONDS`` after the first skipped update, as
+        pushed changes may not notify listeners again for minutes.
+        """
+        self._deferred_updates.add(update)
+        self.metrics.deferred["entity_updates"] += 1
+        if self._unsub_deferred is None:
+            self._unsub_deferred = async_call_later(
+                self.hass, SHED_MAX_DEFER_SECONDS, self._async_deliver_deferred_updates
+            )
+
+    @callback
+    def _async_deliver_deferred_updates(self, _now: datetime) -> None:
+        """Deliver the updates skipped while shedding to listeners still registered."""
+        self._unsub_deferred = None
+        deferred, self._deferred_updates = self._deferred_updates, set()
+        listening = {update for update, _ in self._listeners.values()}
+        self._deliver_all = True
+        try:
+            for update in deferred & listening:
+                update()
+        finally:
+            self._deliver_all = False
+
+    @callback
+    def _async_cancel_deferred_updates(self) -> None:
+        """Forget the updates skipped while shedding and stop their timer."""
+        self._deferred_updates.clear()
+        if self._unsub_deferred is not None:
+            self._unsub_deferred()
+            self._unsub_deferred = None
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Track the grace period and end a profiled cycle that failed."""
+        if self.last_update_success:
+            self._async_cancel_stale_timer()
+            return
+        self._async_end_profile_cycle()
+        # Repeated failures do not notify listeners; end the grace period here
+        self.async_update_listeners()
+        if self.data_available and self._unsub_stale is None:
+            self._unsub_stale = async_call_later(
+                self.hass, max(self.max_staleness - (self.data_age or 0), 0), self._async_stale_timeout
+            )
+
+    @callback
+    def _async_stale_timeout(self, _now: datetime) -> None:
+        """Make the data unavailable once it is too old, even if no poll ran meanwhile."""
+        self._unsub_stale = None
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Stop the change stream and timers along with the scheduled refresh."""
+        self._async_cancel_stale_timer()
+        self._async_cancel_deferred_updates()
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+            self._stream_task = None
+        await super().async_shutdown()
+
+    @callback
+    def _async_cancel_stale_timer(self) -> None:
+        """Cancel the grace period timer, if running."""
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+
+    @callback
+    def async_start_profiling(self, cycles: int) -> None:
+        """Profile the next ``cycles`` polls, replacing any profile in progress."""
+        if self.profiler is not None:
+            self.profiler.end_cycle()
+        self.profiler = CoordinatorProfiler(cycles)
+        _LOGGER.info("Profiling the next %d ecoNEXT poll(s)", cycles)
+
+    @callback
+    def _async_end_profile_cycle(self) -> None:
+        """Close the running profile cycle and write the report once all cycles ran."""
+        if self.profiler is None:
+            return
+        self.profiler.end_cycle()
+        if self.profiler.finished:
+            profiler, self.profiler = self.profiler, None
+            self.hass.async_create_background_task(
+                self._async_write_profile(profiler), f"{DOMAIN} write profile {self.get_device_uid()}"
+            )
+
+    async def _async_write_profile(self, profiler: CoordinatorProfiler) -> None:
+        """Write a finished profile to the config dir."""
+        try:
+            prof_path, text_path = await profiler.async_write_report(self.hass, self.get_device_uid())
+        except OSError as err:
+            _LOGGER.error("Failed to write ecoNEXT profile: %s", err)
+            return
+        _LOGGER.info("ecoNEXT profile written to %s (report: %s)", prof_path, text_path)
+
+    async def async_start_recording(self, duration: timedelta) -> Path:
+        """Record every gateway response for ``duration``, replacing any recording in progress.
+
+        Returns the path of the session file in the config dir.
+        """
+        await self.async_stop_recording()
+        stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+        recorder = SessionRecorder(self.hass.config.path(f"econext_session_{self.get_device_uid()}_{stamp}.jsonl.gz"))
+        self.api.recorder = recorder
+
+        async def _async_stop(_now: datetime) -> None:
+            self._unsub_recording = None
+            await self.async_stop_recording()
+
+        self._unsub_recording = async_call_later(self.hass, duration, _async_stop)
+        _LOGGER.info("Recording ecoNEXT gateway session to %s for %s", recorder.path, duration)
+        return recorder.path
+
+    async def async_stop_recording(self) -> None:
+        """Stop the session recording in progress and flush it to disk."""
+        if self._unsub_recording is not None:
+            self._unsub_recording()
+            self._unsub_recording = None
+        recorder, self.api.recorder = self.api.recorder, None
+        if recorder is None:
+            return
+        await recorder.async_close()
+        _LOGGER.info("Recorded %d gateway responses to %s", recorder.records, recorder.path)
+
     def get_param(self, param_id: str | int) -> dict[str, Any] | None:
         """Get a parameter by ID."""
         if self.data is None:
@@ -55,6 +484,55 @@ class EconextCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
             return None
         return param.get("value")
 
+    def get_schedule_words(self, param_ids: tuple[tuple[str, str], ...]) -> tuple[int, ...] | None:
+        """Get a schedule's AM/PM words in day order, or None if any is missing."""
+        words: list[int] = []
+        for am_id, pm_id in param_ids:
+            am_value = self.get_param_value(am_id)
+            pm_value = self.get_param_value(pm_id)
+            if am_value is None or pm_value is None:
+                return None
+            words.append(int(am_value))
+            words.append(int(pm_value))
+        return tuple(words)
+
+    @callback
+    def async_track_schedule(
+        self, param_ids: tuple[tuple[str, str], ...], action: Callable[[], None]
+    ) -> tuple[ScheduleTracker, CALLBACK_TYPE]:
+        """Follow a schedule, calling ``action`` whenever it switches on or off.
+
+        Entities showing the same schedule share one tracker, which is fed the
+        schedule words on every update. Returns the tracker and a callback that
+        unsubscribes; the tracker stops once its last subscriber is gone.
+        """
+        tracker = self._schedule_trackers.get(param_ids)
+        if tracker is None:
+            tracker = self._schedule_trackers[param_ids] = ScheduleTracker(self.hass)
+            tracker.async_update(self.get_schedule_words(param_ids))
+        remove = tracker.async_add_listener(action)
+
+        @callback
+        def _unsubscribe() -> None:
+            remove()
+            if not tracker.has_listeners:
+                tracker.async_cancel()
+                self._schedule_trackers.pop(param_ids, None)
+
+        return tracker, _unsubscribe
+
+    def build_schedule_values(self, param_ids: tuple[tuple[str, str], ...], day_masks: list[int]) -> dict[str, int]:
+        """Build the AM/PM word values that write a week of day masks.
+
+        Bits above the 24 slot bits of each word are kept as they are.
+        """
+        flat_ids = [param_id for pair in param_ids for param_id in pair]
+        values: dict[str, int] = {}
+        for param_id, half in zip(flat_ids, encode_week(day_masks), strict=True):
+            current = int(self.get_param_value(param_id) or 0)
+            values[param_id] = (current & ~WORD_MASK) | half
+        return values
+
     def get_device_uid(self) -> str:
         """Get the device UID."""
         return self.get_param_value(10) or "unknown"
@@ -96,11 +574,83 @@ class EconextCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
         if not name:
             raise EconextApiError(f"Parameter {param_id} has no name")
 
-        result = await self.api.async_set_param(name, value)
+        self.metrics.writes.batches += 1
+        self.metrics.writes.requested += 1
+        result = await self._async_write(name, value)
 
         # On success, update local cache for instant UI feedback
         if result and self.data is not None and param_key in self.data:
             self.data[param_key]["value"] = value
+            self._async_set_written_data()
+
+        return result
+
+    async def async_set_params(self, values: dict[str | int, Any]) -> bool:
+        """Set several parameter values with a single optimistic update.
+
+        Only values that differ from the cached data are written. The gateway
+        accepts one parameter per request, so the changed values are written
+        back-to-back and listeners are notified once at the end instead of
+        once per parameter.
+
+        """
+        changes: dict[str, tuple[str, Any]] = {}
+        for param_id, value in values.items():
+            param_key = str(param_id)
+            param = self.get_param(param_key)
+            if param is None:
+                raise EconextApiError(f"Unknown parameter: {param_id}")
+
+            name = param.get("name")
+            if not name:
+                raise EconextApiError(f"Parameter {param_id} has no name")
+
+            if param.get("value") != value:
+                changes[param_key] = (name, value)
+
+        self.metrics.writes.batches += 1
+        self.metrics.writes.requested += len(values)
+        self.metrics.writes.skipped_unchanged += len(values) - len(changes)
+        if not changes:
+            return True
+
+        written: dict[str, Any] = {}
+        try:
+            for param_key, (name, value) in changes.items():
+                if await self._async_write(name, value):
+                    written[param_key] = value
+        finally:
+            # Apply whatever made it through, even if a later write failed
+            if written and self.data is not None:
+                for param_key, value in written.items():
+                    if param_key in self.data:
+                        self.data[param_key]["value"] = value
+                self._async_set_written_data()
+
+        _LOGGER.debug("Wrote %d of %d changed parameters in one batch", len(written), len(changes))
+        return len(written) == len(changes)
+
+    @callback
+    def _async_set_written_data(self) -> None:
+        """Publish written values to every listener, even while shedding load."""
+        self._deliver_all = True
+        try:
             self.async_set_updated_data(self.data)
+        finally:
+            self._deliver_all = False
 
+    async def _async_write(self, name: str, value: Any) -> bool:
+        """Write one parameter through the API, counting the outcome."""
+        writes = self.metrics.writes
+        try:
+            result = await self.api.async_set_param(name, value)
+        except EconextApiError as err:
+            writes.failed += 1
+            writes.last_error = str(err)
+            self.metrics.record_error("write")
+            raise
+        if result:
+            writes.written += 1
+        else:
+            writes.failed += 1
         return result
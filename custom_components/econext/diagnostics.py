@@ -0,0 +1,97 @@
+"""Diagnostics support for ecoNEXT."""
+
+import asyncio
+from dataclasses import asdict
+from itertools import islice
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    DIAGNOSTICS_CHUNK_SIZE,
+    DIAGNOSTICS_MAX_ALARMS,
+    DIAGNOSTICS_MAX_PARAMS,
+    DIAGNOSTICS_REDACT_PARAMS,
+    DOMAIN,
+)
+from .coordinator import EconextCoordinator
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: EconextCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+        },
+        "connection": coordinator.connection.as_dict(),
+        "stream": {"streaming": coordinator.streaming, **asdict(coordinator.stream)},
+        "connection_pool": stats.as_dict() if (stats := coordinator.api.pool_stats) is not None else None,
+        "coalesced_requests": dict(coordinator.api.coalesced),
+        "scheduler": scheduled.scheduler.as_dict() if (scheduled := coordinator.scheduler_entry) is not None else None,
+        "loop_lag": coordinator.loop_lag.as_dict() if coordinator.loop_lag is not None else None,
+        "poll_metrics": coordinator.metrics.as_dict(),
+        **coordinator.metrics.counters(),
+        "alarms": _alarm_cache(coordinator),
+        "entities": _entity_plan(hass, entry),
+        "snapshot": await _async_snapshot(coordinator),
+    }
+
+
+async def _async_snapshot(coordinator: EconextCoordinator) -> dict[str, Any]:
+    """Copy the last parameter snapshot with network details redacted.
+
+    The copy is built in chunks, yielding to the event loop in between, and is
+    capped at DIAGNOSTICS_MAX_PARAMS parameters.
+    """
+    data = coordinator.data or {}
+    params: dict[str, dict[str, Any]] = {}
+    for count, (param_id, param) in enumerate(islice(data.items(), DIAGNOSTICS_MAX_PARAMS), start=1):
+        copied = dict(param)
+        if param_id in DIAGNOSTICS_REDACT_PARAMS:
+            copied["value"] = REDACTED
+        params[param_id] = copied
+        if count % DIAGNOSTICS_CHUNK_SIZE == 0:
+            await asyncio.sleep(0)
+
+    return {
+        "parameter_count": len(data),
+        "truncated": len(data) > DIAGNOSTICS_MAX_PARAMS,
+        "parameters": params,
+    }
+
+
+def _alarm_cache(coordinator: EconextCoordinator) -> dict[str, Any]:
+    """Return the cached alarm history, newest first and capped."""
+    return {
+        "count": len(coordinator.alarms),
+        "active_count": len(coordinator.active_alarms),
+        "history": coordinator.alarms[:DIAGNOSTICS_MAX_ALARMS],
+    }
+
+
+def _entity_plan(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the entities the integration resolved for this entry, by platform."""
+    registry = er.async_get(hass)
+    plan: dict[str, list[dict[str, Any]]] = {}
+    for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+        plan.setdefault(entity.domain, []).append(
+            {
+                "entity_id": entity.entity_id,
+                "unique_id": entity.unique_id,
+                "disabled_by": entity.disabled_by,
+            }
+        )
+    return {
+        "counts": {domain: len(entities) for domain, entities in sorted(plan.items())},
+        "platforms": plan,
+    }
@@ -0,0 +1,101 @@
+"""Discovery of ecoNEXT gateways on the local network.
+
+``async_discover_gateways`` sweeps every address of a subnet for the gateway
+port. Connection attempts run concurrently, at most
+``DISCOVERY_CONCURRENCY`` at a time and each given up after
+``DISCOVERY_CONNECT_TIMEOUT``, so a /24 is scanned in a couple of seconds.
+Every address that accepts the connection is asked for its UID and name
+(see ``EconextApi.async_fetch_identity``) within ``DISCOVERY_VERIFY_TIMEOUT``;
+only those that answer like a gateway are returned.
+"""
+
+import asyncio
+import contextlib
+from dataclasses import dataclass
+from ipaddress import IPv4Address, IPv4Network
+import logging
+
+import aiohttp
+
+from .api import EconextApiError, EconextApi
+from .const import (
+    DEFAULT_PORT,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_CONNECT_TIMEOUT,
+    DISCOVERY_MAX_HOSTS,
+    DISCOVERY_VERIFY_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DiscoveredGateway:
+    """A gateway that answered the identity probe."""
+
+    host: str
+    port: int
+    uid: str
+    name: str
+
+
+def scan_network(network: str) -> IPv4Network:
+    """Parse the subnet to scan, e.g. ``192.168.1.0/24``; a bare address means its /24.
+
+    Raises:
+        ValueError: If it is not an IPv4 network or has more than
+            ``DISCOVERY_MAX_HOSTS`` addresses.
+
+    """
+    # IPv4Network itself rejects IPv6 and malformed networks with a ValueError
+    parsed = IPv4Network(network if "/" in network else f"{network}/24", strict=False)
+    if parsed.num_addresses > DISCOVERY_MAX_HOSTS:
+        raise ValueError(f"{network} has more than {DISCOVERY_MAX_HOSTS} addresses")
+    return parsed
+
+
+async def _async_port_open(host: str, port: int, timeout: float) -> bool:
+    """Return True if ``host`` accepts a TCP connection on ``port`` within ``timeout``."""
+    try:
+        async with asyncio.timeout(timeout):
+            _reader, writer = await asyncio.open_connection(host, port)
+    except (OSError, TimeoutError):
+        return False
+    writer.close()
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+    return True
+
+
+async def async_discover_gateways(
+    session: aiohttp.ClientSession,
+    network: IPv4Network,
+    *,
+    port: int = DEFAULT_PORT,
+    concurrency: int = DISCOVERY_CONCURRENCY,
+    connect_timeout: float = DISCOVERY_CONNECT_TIMEOUT,
+) -> list[DiscoveredGateway]:
+    """Return the gateways answering on ``port`` in ``network``, by address."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _async_check(address: IPv4Address) -> DiscoveredGateway | None:
+        host = str(address)
+        async with semaphore:
+            if not await _async_port_open(host, port, connect_timeout):
+                return None
+            try:
+                async with asyncio.timeout(DISCOVERY_VERIFY_TIMEOUT):
+                    info = await EconextApi(host, port, session).async_fetch_identity()
+            except (EconextApiError, TimeoutError) as err:
+                _LOGGER.debug("%s:%d is open but not a gateway: %s", host, port, err)
+                return None
+        if info["uid"] == "unknown":
+            _LOGGER.debug("%s:%d answered without a controller UID", host, port)
+            return None
+        return DiscoveredGateway(host, port, str(info["uid"]), str(info["name"]))
+
+    addresses = list(network.hosts()) if network.num_addresses > 2 else list(network)
+    results = await asyncio.gather(*(_async_check(address) for address in addresses))
+    found = [gateway for gateway in results if gateway is not None]
+    _LOGGER.debug("Scanned %d addresses in %s, found %d gateway(s)", len(addresses), network, len(found))
+    return found
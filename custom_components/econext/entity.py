@@ -1,16 +1,23 @@
 """Base entity for ecoNEXT integration."""
 
+from collections.abc import Callable
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, MANUFACTURER
 from .coordinator import EconextCoordinator
+from .schedule import ScheduleTracker
 
 
 class EconextEntity(CoordinatorEntity[EconextCoordinator]):
     """Base entity for ecoNEXT."""
 
     _attr_has_entity_name = True
+    # Configuration, schedule and diagnostic entities skip updates while the
+    # coordinator sheds load; telemetry and climate entities never do
+    _low_priority = False
 
     def __init__(
         self,
@@ -108,10 +115,49 @@ class EconextEntity(CoordinatorEntity[EconextCoordinator]):
 
         return self._device_id
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the state, unless the update is deferred."""
+        if self._async_defer_update():
+            return
+        self.async_write_ha_state()
+
+    @callback
+    def _async_defer_update(self) -> bool:
+        """Return True if this coordinator update should be skipped to shed load.
+
+        The coordinator delivers skipped updates of low-priority entities
+        within ``SHED_MAX_DEFER_SECONDS``, so their state lags behind by a
+        minute at most.
+        """
+        if not self._low_priority or not self.coordinator.shedding:
+            return False
+        self.coordinator.async_defer_update(self._handle_coordinator_update)
+        return True
+
+    @callback
+    def _async_follow_schedule(
+        self, param_ids: tuple[tuple[str, str], ...], action: Callable[[], None]
+    ) -> ScheduleTracker:
+        """Subscribe to the coordinator's tracker of a schedule until the entity is removed."""
+        tracker, unsubscribe = self.coordinator.async_track_schedule(param_ids, action)
+        self.async_on_remove(unsubscribe)
+        return tracker
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, counting it towards the coordinator's poll metrics."""
+        self.coordinator.state_writes += 1
+        super().async_write_ha_state()
+
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success and self._is_value_valid()
+        """Return if entity is available.
+
+        Entities stay available with their last values through the
+        coordinator's grace period for failed polls.
+        """
+        return self.coordinator.data_available and self._is_value_valid()
 
     def _is_value_valid(self) -> bool:
         """Check if the parameter value is valid.
@@ -0,0 +1,72 @@
+"""Event loop lag measurement for load shedding.
+
+``LoopLagMonitor`` schedules a callback every ``interval`` seconds and
+records how much later than scheduled it actually ran. On an idle loop that
+is well under a millisecond; when other work keeps the loop busy, callbacks
+queue up behind it and the lag grows. The loop counts as under pressure while
+the median of the recent samples exceeds ``threshold_ms``, so a single slow
+callback (such as decoding one poll) does not trigger it.
+"""
+
+import asyncio
+from typing import Any
+
+from .const import LOOP_LAG_INTERVAL, LOOP_LAG_THRESHOLD_MS, LOOP_LAG_WINDOW
+from .metrics import RollingHistogram
+
+
+class LoopLagMonitor:
+    """Sample how late the event loop runs scheduled callbacks."""
+
+    def __init__(
+        self,
+        interval: float = LOOP_LAG_INTERVAL,
+        threshold_ms: float = LOOP_LAG_THRESHOLD_MS,
+        window: int = LOOP_LAG_WINDOW,
+    ) -> None:
+        """Initialize the monitor; sampling starts with ``start``."""
+        self.interval = interval
+        self.threshold_ms = threshold_ms
+        self.lag_ms = RollingHistogram(window)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._expected = 0.0
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start sampling on ``loop``, if not sampling already."""
+        if self._handle is None:
+            self._loop = loop
+            self._schedule()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self) -> None:
+        """Schedule the next sample."""
+        assert self._loop is not None
+        self._expected = self._loop.time() + self.interval
+        self._handle = self._loop.call_at(self._expected, self._sample)
+
+    def _sample(self) -> None:
+        """Record how late this callback ran and schedule the next one."""
+        assert self._loop is not None
+        self.lag_ms.add(max(self._loop.time() - self._expected, 0.0) * 1000)
+        self._schedule()
+
+    @property
+    def under_pressure(self) -> bool:
+        """Return True while the recent lag is above the threshold."""
+        median = self.lag_ms.percentile(50)
+        return median is not None and median > self.threshold_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current state and lag samples for diagnostics."""
+        return {
+            "running": self._handle is not None,
+            "under_pressure": self.under_pressure,
+            "threshold_ms": self.threshold_ms,
+            "lag_ms": self.lag_ms.summary(),
+        }
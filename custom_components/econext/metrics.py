@@ -0,0 +1,206 @@
+"""Poll instrumentation for ecoNEXT.
+
+Keeps a rolling window of per-poll measurements so the cost of a poll
+(network, decoding, entity fan-out) can be read from diagnostic sensors and
+the diagnostics download.
+"""
+
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+import math
+from typing import Any
+
+from .const import METRICS_WINDOW
+
+
+@dataclass(slots=True)
+class FetchStats:
+    """Timings and size of a single parameter fetch."""
+
+    latency_ms: float
+    # Bytes on the wire, compressed if the gateway compressed the response
+    bytes_received: int
+    decode_ms: float
+    mapping_ms: float
+    # Size and decompression time of the body, if it was compressed
+    bytes_decoded: int | None = None
+    decompress_ms: float = 0.0
+    encoding: str = "identity"
+    # json, or msgpack for the positional binary format
+    wire_format: str = "json"
+
+
+@dataclass(slots=True)
+class WriteStats:
+    """Counters for parameter writes to the gateway."""
+
+    batches: int = 0
+    requested: int = 0
+    skipped_unchanged: int = 0
+    written: int = 0
+    failed: int = 0
+    last_error: str | None = None
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """Connection reuse counters of a dedicated gateway session."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    @property
+    def reuse_ratio(self) -> float | None:
+        """Return the share of requests sent over a kept-alive connection."""
+        connections = self.connections_created + self.connections_reused
+        return self.connections_reused / connections if connections else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters and reuse ratio."""
+        ratio = self.reuse_ratio
+        return {**asdict(self), "reuse_ratio": None if ratio is None else round(ratio, 3)}
+
+
+@dataclass(slots=True)
+class StreamStats:
+    """Counters for the gateway's push update stream."""
+
+    # None until the first connection attempt, False if the gateway has no stream
+    supported: bool | None = None
+    connects: int = 0
+    drops: int = 0
+    # Change batches received, and parameter values they changed
+    events: int = 0
+    changes: int = 0
+    last_error: str | None = None
+
+
+def _nearest_rank(ordered: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of sorted samples."""
+    return ordered[max(math.ceil(pct / 100 * len(ordered)), 1) - 1]
+
+
+class RollingHistogram:
+    """Rolling window of samples with percentile summaries."""
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize the histogram."""
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, value: float) -> None:
+        """Add a sample, dropping the oldest once the window is full."""
+        self._samples.append(value)
+
+    @property
+    def count(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    @property
+    def last(self) -> float | None:
+        """Return the most recent sample."""
+        return self._samples[-1] if self._samples else None
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the nearest-rank percentile of the window."""
+        if not self._samples:
+            return None
+        return _nearest_rank(sorted(self._samples), pct)
+
+    def summary(self) -> dict[str, Any]:
+        """Return count, last, min, mean, p50, p95 and max of the window."""
+        if not self._samples:
+            return {"count": 0}
+        ordered = sorted(self._samples)
+        count = len(ordered)
+        return {
+            "count": count,
+            "last": round(self._samples[-1], 3),
+            "min": round(ordered[0], 3),
+            "mean": round(sum(ordered) / count, 3),
+            "p50": round(_nearest_rank(ordered, 50), 3),
+            "p95": round(_nearest_rank(ordered, 95), 3),
+            "max": round(ordered[-1], 3),
+        }
+
+
+class PollMetrics:
+    """Rolling per-poll measurements for one controller."""
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize the metrics."""
+        self.latency_ms = RollingHistogram(size)
+        self.bytes_received = RollingHistogram(size)
+        self.bytes_decoded = RollingHistogram(size)
+        self.decompress_ms = RollingHistogram(size)
+        self.decode_ms = RollingHistogram(size)
+        self.mapping_ms = RollingHistogram(size)
+        self.changed_params = RollingHistogram(size)
+        self.entities_notified = RollingHistogram(size)
+        self.state_writes = RollingHistogram(size)
+        self.polls = 0
+        self.writes = WriteStats()
+        # Gateway errors by kind (fetch_connection, fetch_api, alarms, write)
+        self.errors: Counter[str] = Counter()
+        # Polls by content encoding and wire format of the response
+        self.encodings: Counter[str] = Counter()
+        self.wire_formats: Counter[str] = Counter()
+        # Polls run while the event loop lagged, and work deferred meanwhile by
+        # kind (alarms, entity_updates)
+        self.polls_under_pressure = 0
+        self.deferred: Counter[str] = Counter()
+
+    def record_fetch(self, stats: FetchStats) -> None:
+        """Record the network and parsing cost of a poll."""
+        self.polls += 1
+        self.latency_ms.add(stats.latency_ms)
+        self.bytes_received.add(stats.bytes_received)
+        self.bytes_decoded.add(stats.bytes_received if stats.bytes_decoded is None else stats.bytes_decoded)
+        self.decompress_ms.add(stats.decompress_ms)
+        self.encodings[stats.encoding] += 1
+        self.wire_formats[stats.wire_format] += 1
+        self.decode_ms.add(stats.decode_ms)
+        self.mapping_ms.add(stats.mapping_ms)
+
+    def record_error(self, kind: str) -> None:
+        """Count a gateway error."""
+        self.errors[kind] += 1
+
+    def record_fanout(self, entities_notified: int, state_writes: int) -> None:
+        """Record how many entities a data update reached and how many wrote state."""
+        self.entities_notified.add(entities_notified)
+        self.state_writes.add(state_writes)
+
+    def histograms(self) -> dict[str, RollingHistogram]:
+        """Return the histograms by name."""
+        return {
+            "latency_ms": self.latency_ms,
+            "bytes_received": self.bytes_received,
+            "bytes_decoded": self.bytes_decoded,
+            "decompress_ms": self.decompress_ms,
+            "decode_ms": self.decode_ms,
+            "mapping_ms": self.mapping_ms,
+            "changed_params": self.changed_params,
+            "entities_notified": self.entities_notified,
+            "state_writes": self.state_writes,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of every histogram."""
+        return {
+            "polls": self.polls,
+            **{name: histogram.summary() for name, histogram in self.histograms().items()},
+        }
+
+    def counters(self) -> dict[str, Any]:
+        """Return the write statistics, error counters, response encodings and load shedding."""
+        return {
+            "writes": asdict(self.writes),
+            "errors": dict(self.errors),
+            "encodings": dict(self.encodings),
+            "wire_formats": dict(self.wire_formats),
+            "load_shedding": {"polls_under_pressure": self.polls_under_pressure, "deferred": dict(self.deferred)},
+        }
@@ -157,6 +157,7 @@ async def async_setup_entry(
                         native_min_value=description.native_min_value,
                         native_max_value=description.native_max_value,
                         native_step=description.native_step,
+                        entity_registry_enabled_default=description.entity_registry_enabled_default,
                     )
                     entities.append(
                         EconextNumber(coordinator, circuit_schedule_desc, device_id=f"circuit_{circuit_num}")
@@ -237,6 +238,8 @@ def _get_circuit_schedule_param_id(circuit, schedule_key: str) -> str | None:
 class EconextNumber(EconextEntity, NumberEntity):
     """Representation of an ecoNEXT number entity."""
 
+    _low_priority = True
+
     def __init__(
         self,
         coordinator: EconextCoordinator,
@@ -260,6 +263,7 @@ class EconextNumber(EconextEntity, NumberEntity):
             self._attr_entity_category = description.entity_category
         if description.icon:
             self._attr_icon = description.icon
+        self._attr_entity_registry_enabled_default = description.entity_registry_enabled_default
 
         self._attr_native_step = description.native_step
 
@@ -0,0 +1,94 @@
+"""On-demand profiling of the coordinator hot path.
+
+A ``CoordinatorProfiler`` is attached to a coordinator by the
+``econext.profile`` service. cProfile is enabled when a poll starts and
+disabled once every listener has been notified, so each profiled cycle
+covers fetch, decode, mapping, dispatch and entity state rendering. cProfile
+traces the whole event loop thread, so other work that interleaves with a
+poll shows up too. After the requested number of cycles the profiler
+detaches itself and writes a ``.prof`` file and a text report to the config
+directory.
+
+Only one profiler can be enabled at a time. A cycle that starts while
+another one is active, such as another gateway's poll being profiled or Home
+Assistant's own profiler running, is skipped rather than counted; the next
+poll tries again.
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Functions listed in the text report
+REPORT_LIMIT = 60
+
+
+class CoordinatorProfiler:
+    """Profile a fixed number of coordinator cycles."""
+
+    def __init__(self, cycles: int) -> None:
+        """Initialize the profiler."""
+        self._profile = cProfile.Profile()
+        self._active = False
+        self.cycles = cycles
+        self.remaining = cycles
+        # Cycles skipped because another profiler was active
+        self.skipped = 0
+
+    @property
+    def finished(self) -> bool:
+        """Return True once all requested cycles have been profiled."""
+        return self.remaining <= 0
+
+    def start_cycle(self) -> None:
+        """Start profiling a cycle."""
+        if self._active or self.finished:
+            return
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            # Raised while another profiler is active
+            self.skipped += 1
+            if self.skipped == 1:
+                _LOGGER.warning("Skipping ecoNEXT profile cycle until no other profiler is active: %s", err)
+            return
+        self._active = True
+
+    def end_cycle(self) -> None:
+        """Stop profiling the current cycle, if one is running."""
+        if not self._active:
+            return
+        self._profile.disable()
+        self._active = False
+        self.remaining -= 1
+
+    async def async_write_report(self, hass: HomeAssistant, name: str) -> tuple[str, str]:
+        """Write the .prof file and text report to the config dir, returning both paths."""
+        stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+        base = hass.config.path(f"econext_profile_{name}_{stamp}")
+        return await hass.async_add_executor_job(self._write_report, base)
+
+    def _write_report(self, base: str) -> tuple[str, str]:
+        """Dump the stats and a cumulative-time report (runs in the executor)."""
+        prof_path = f"{base}.prof"
+        text_path = f"{base}.txt"
+        self._profile.dump_stats(prof_path)
+
+        stream = io.StringIO()
+        stream.write(
+            f"ecoNEXT coordinator profile, {self.cycles - max(self.remaining, 0)} cycle(s), "
+            f"{self.skipped} skipped while another profiler was active\n\n"
+        )
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LIMIT)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(REPORT_LIMIT)
+        with open(text_path, "w", encoding="utf-8") as file:
+            file.write(stream.getvalue())
+
+        return prof_path, text_path
@@ -0,0 +1,131 @@
+"""Recording of gateway sessions.
+
+While a ``SessionRecorder`` is attached to the API client, every gateway
+response is appended to a gzip-compressed JSONL file, one record per line:
+
+    {"t": 1767225600.123, "kind": "parameters", "status": 200, "body": {...}}
+
+``kind`` is ``parameters``, ``alarms``, ``changes`` (pushed by the
+gateway's stream) or ``write``; ``body`` is the decoded payload (the requested
+name and value for writes, None for failed requests). Records are
+serialized and written from the executor in batches, so recording never
+blocks the event loop. Each batch is its own gzip member, which gzip readers
+concatenate transparently. Recorded sessions are played back with
+``replay.ReplayApi``.
+
+Session files are meant to be attached to bug reports, so network details
+are redacted as in the diagnostics download: the values of
+``DIAGNOSTICS_REDACT_PARAMS`` in polls and pushed changes, and writes to
+those parameters by name once a recorded poll has named them.
+"""
+
+import asyncio
+from collections.abc import Iterator
+import contextlib
+import gzip
+import json
+import logging
+from pathlib import Path
+import time
+from typing import Any
+
+from homeassistant.helpers.redact import REDACTED
+
+from .const import DIAGNOSTICS_REDACT_PARAMS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SessionRecorder:
+    """Append gateway responses to a compressed JSONL file."""
+
+    def __init__(self, path: Path | str) -> None:
+        """Initialize the recorder."""
+        self.path = Path(path)
+        self.records = 0
+        self._pending: list[dict[str, Any]] = []
+        self._writing: asyncio.Future[None] | None = None
+        # Gateway names of the redacted parameters, learned from recorded polls
+        self._redacted_names: set[str] = set()
+
+    def record(self, kind: str, status: int, body: Any) -> None:
+        """Queue a response for writing (must be called from the event loop).
+
+        ``body`` is serialized later in the executor, so it must not be changed
+        after it was recorded; the API client records freshly decoded payloads.
+        """
+        body = self._redact(kind, body)
+        self._pending.append({"t": round(time.time(), 3), "kind": kind, "status": status, "body": body})
+        self.records += 1
+        if self._writing is None:
+            self._write_pending()
+
+    def _redact(self, kind: str, body: Any) -> Any:
+        """Return ``body`` with network details replaced; the original is left untouched."""
+        if not isinstance(body, dict):
+            return body
+        if kind == "parameters" and isinstance(params := body.get("parameters"), dict):
+            redacted = DIAGNOSTICS_REDACT_PARAMS.intersection(params)
+            if not redacted:
+                return body
+            params = dict(params)
+            for index in redacted:
+                self._redacted_names.add(params[index].get("name"))
+                params[index] = {**params[index], "value": REDACTED}
+            return {**body, "parameters": params}
+        if kind == "changes" and isinstance(values := body.get("values"), dict):
+            if not DIAGNOSTICS_REDACT_PARAMS.intersection(values):
+                return body
+            return {
+                **body,
+                "values": {
+                    index: REDACTED if index in DIAGNOSTICS_REDACT_PARAMS else value for index, value in values.items()
+                },
+            }
+        if kind == "write" and body.get("name") in self._redacted_names:
+            return {**body, "value": REDACTED}
+        return body
+
+    async def async_close(self) -> None:
+        """Wait until every queued response is on disk."""
+        while (writing := self._writing) is not None:
+            # Failures are logged by the done callback
+            with contextlib.suppress(OSError):
+                await asyncio.shield(writing)
+            # An already finished batch returns without yielding; let its done callback run
+            await asyncio.sleep(0)
+
+    def _write_pending(self) -> None:
+        """Hand the queued records to the executor."""
+        records, self._pending = self._pending, []
+        self._writing = asyncio.get_running_loop().run_in_executor(None, self._write, records)
+        self._writing.add_done_callback(self._write_done)
+
+    def _write_done(self, future: asyncio.Future[None]) -> None:
+        """Log a failed batch and start the next one, if records queued up meanwhile."""
+        self._writing = None
+        if (err := future.exception()) is not None:
+            _LOGGER.error("Failed to write gateway session to %s: %s", self.path, err)
+        if self._pending:
+            self._write_pending()
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        """Append records as one gzip member of JSON lines (runs in the executor)."""
+        lines = [json.dumps(record, separators=(",", ":")) for record in records]
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+def read_session(path: Path | str) -> Iterator[dict[str, Any]]:
+    """Yield the records of a session file in order.
+
+    A file cut short (e.g. by a restart while recording) yields every record
+    up to the damaged batch.
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    except (EOFError, gzip.BadGzipFile, ValueError) as err:
+        _LOGGER.warning("Session file %s is truncated: %s", path, err)
@@ -0,0 +1,166 @@
+"""Playback of recorded gateway sessions.
+
+``ReplayApi`` stands in for ``EconextApi`` and serves the responses of a
+session recorded by ``recorder.SessionRecorder``, so production poll sequences
+(defrost cycles, DHW loading, alarms) can be fed to a coordinator offline.
+Payloads are re-encoded up front and decoded on every fetch, so decode and
+mapping costs match a live poll. Changes the gateway pushed while the session
+was recorded are applied between the polls they arrived between.
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable
+import json
+import time
+from typing import Any
+
+from .api import EconextConnectionError, map_gateway_params
+from .coordinator import EconextCoordinator
+from .metrics import FetchStats
+
+
+class ReplayApi:
+    """Serve a recorded session's parameter polls in order.
+
+    With a ``speed`` each poll is held back until its recorded offset from the
+    first poll, divided by ``speed``, has passed (1.0 is real time). With None
+    polls are served as fast as they are requested. Alarms are the latest
+    recorded before the current poll; writes succeed and are collected in
+    ``writes``. Pushed changes are served by ``async_changes``, paced the same
+    way.
+    """
+
+    def __init__(self, records: Iterable[dict[str, Any]], speed: float | None = 1.0) -> None:
+        """Initialize the replay from session records."""
+        self._polls: list[tuple[float, bytes]] = []
+        self._alarms: list[tuple[float, list[dict[str, Any]]]] = []
+        self._changes: list[tuple[float, dict[str, Any]]] = []
+        for record in records:
+            if record["status"] != 200:
+                continue
+            if record["kind"] == "parameters":
+                self._polls.append((record["t"], json.dumps(record["body"]).encode()))
+            elif record["kind"] == "alarms":
+                self._alarms.append((record["t"], record["body"].get("alarms", [])))
+            elif record["kind"] == "changes":
+                values = record["body"].get("values", {})
+                self._changes.append((record["t"], {str(index): value for index, value in values.items()}))
+
+        self.speed = speed
+        self.position = 0
+        self._change_position = 0
+        self.writes: list[tuple[str, Any]] = []
+        self.pool_stats = None
+        self.coalesced: Counter[str] = Counter()
+        self._started: float | None = None
+        self._last_fetch: FetchStats | None = None
+
+    @property
+    def host(self) -> str:
+        """Return the host."""
+        return "replay"
+
+    @property
+    def port(self) -> int:
+        """Return the port."""
+        return 0
+
+    @property
+    def last_fetch(self) -> FetchStats | None:
+        """Return timings and payload size of the last replayed poll."""
+        return self._last_fetch
+
+    @property
+    def polls(self) -> int:
+        """Return the number of recorded polls."""
+        return len(self._polls)
+
+    @property
+    def finished(self) -> bool:
+        """Return True once every recorded poll has been served."""
+        return self.position >= len(self._polls)
+
+    async def async_fetch_all_params(self) -> dict[str, dict[str, Any]]:
+        """Return the next recorded poll, waiting for its time if pacing."""
+        if self.finished:
+            raise EconextConnectionError("Replay finished")
+        recorded_at, body = self._polls[self.position]
+
+        start = time.perf_counter()
+        await self._async_wait_for(recorded_at)
+        self.position += 1
+        received = time.perf_counter()
+
+        data = json.loads(body)
+        decoded = time.perf_counter()
+        params = map_gateway_params(data)
+
+        self._last_fetch = FetchStats(
+            latency_ms=(received - start) * 1000,
+            bytes_received=len(body),
+            decode_ms=(decoded - received) * 1000,
+            mapping_ms=(time.perf_counter() - decoded) * 1000,
+        )
+        return params
+
+    async def async_changes(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield the changes pushed after the current poll and before the next, by index."""
+        if not self.position:
+            return
+        since = self._polls[self.position - 1][0]
+        until = self._polls[self.position][0] if not self.finished else float("inf")
+        while self._change_position < len(self._changes):
+            recorded_at, changes = self._changes[self._change_position]
+            if recorded_at >= until:
+                return
+            self._change_position += 1
+            if recorded_at < since:
+                # Pushed before the first poll, when there was no data to change
+                continue
+            await self._async_wait_for(recorded_at)
+            yield changes
+
+    async def _async_wait_for(self, recorded_at: float) -> None:
+        """Wait until a record's offset from the first poll has passed at the replay speed."""
+        if not self.speed:
+            return
+        if self._started is None:
+            self._started = time.monotonic()
+        due = self._started + (recorded_at - self._polls[0][0]) / self.speed
+        if (delay := due - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+    async def async_probe(self) -> None:
+        """Succeed while polls are left to serve."""
+        if self.finished:
+            raise EconextConnectionError("Replay finished")
+
+    async def async_fetch_alarms(self) -> list[dict[str, Any]]:
+        """Return the alarms recorded last before the current poll."""
+        if not self.position:
+            return []
+        current = self._polls[self.position - 1][0]
+        alarms: list[dict[str, Any]] = []
+        for recorded_at, recorded in self._alarms:
+            if recorded_at > current:
+                break
+            alarms = recorded
+        return alarms
+
+    async def async_set_param(self, name: str, value: Any) -> bool:
+        """Accept a write without sending it anywhere."""
+        self.writes.append((name, value))
+        return True
+
+
+async def async_replay(coordinator: EconextCoordinator, api: ReplayApi) -> int:
+    """Drive a coordinator through every poll and pushed change of a replay; return the polls refreshed."""
+    coordinator.api = api
+    refreshed = 0
+    while not api.finished:
+        await coordinator.async_refresh()
+        refreshed += 1
+        async for changes in api.async_changes():
+            coordinator.async_apply_changes(changes)
+    return refreshed
@@ -0,0 +1,290 @@
+"""Schedule codec for ecoNEXT weekly bitfields.
+
+A controller schedule is 14 words: an AM and a PM word per day, Sunday first.
+Each word holds 24 half-hour slots in its low bits (bit 0 = first slot of the
+half-day). Here a day is handled as one 48-bit mask (AM | PM << 24), so a
+week decodes into seven day masks, i.e. a 7x48 slot grid.
+
+Runs of active slots are found with edge detection instead of walking bits:
+``mask ^ (mask << 1)`` has a bit set at every run start and one past every run
+end, and the lowest set bit is peeled off with ``x & -x``. Decoded results are
+cached by word value, since schedules rarely change between polls.
+
+``ScheduleTracker`` follows a schedule in real time: instead of re-checking
+the current slot on every poll it arms one point-in-time callback for the
+next slot boundary where the schedule actually changes state. The
+coordinator keeps one tracker per schedule, shared by every entity that
+shows it.
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import SCHEDULE_DAYS, SCHEDULE_SLOTS_PER_DAY, SCHEDULE_SLOTS_PER_WORD
+
+WORD_MASK = (1 << SCHEDULE_SLOTS_PER_WORD) - 1
+DAY_MASK = (1 << SCHEDULE_SLOTS_PER_DAY) - 1
+
+WEEK_SLOTS = SCHEDULE_SLOTS_PER_DAY * len(SCHEDULE_DAYS)
+WEEK_MASK = (1 << WEEK_SLOTS) - 1
+
+NO_ACTIVE_PERIODS = "No active periods"
+
+
+def day_mask(am: int, pm: int) -> int:
+    """Combine an AM and a PM word into a 48-bit day mask."""
+    return (am & WORD_MASK) | ((pm & WORD_MASK) << SCHEDULE_SLOTS_PER_WORD)
+
+
+def split_day_mask(mask: int) -> tuple[int, int]:
+    """Split a 48-bit day mask into its AM and PM words."""
+    return mask & WORD_MASK, (mask >> SCHEDULE_SLOTS_PER_WORD) & WORD_MASK
+
+
+@lru_cache(maxsize=256)
+def decode_week(words: tuple[int, ...]) -> tuple[int, ...]:
+    """Decode 14 AM/PM words (Sunday first) into seven 48-bit day masks."""
+    if len(words) != 2 * len(SCHEDULE_DAYS):
+        raise ValueError(f"Expected {2 * len(SCHEDULE_DAYS)} schedule words, got {len(words)}")
+    return tuple(day_mask(am, pm) for am, pm in zip(words[::2], words[1::2], strict=True))
+
+
+def encode_week(day_masks: Sequence[int]) -> tuple[int, ...]:
+    """Encode seven day masks back into 14 AM/PM words."""
+    if len(day_masks) != len(SCHEDULE_DAYS):
+        raise ValueError(f"Expected {len(SCHEDULE_DAYS)} day masks, got {len(day_masks)}")
+    words: list[int] = []
+    for mask in day_masks:
+        words.extend(split_day_mask(mask))
+    return tuple(words)
+
+
+def slot_matrix(day_masks: Sequence[int]) -> tuple[tuple[bool, ...], ...]:
+    """Expand day masks into a 7x48 grid of booleans."""
+    return tuple(tuple(bool((mask >> slot) & 1) for slot in range(SCHEDULE_SLOTS_PER_DAY)) for mask in day_masks)
+
+
+@lru_cache(maxsize=1024)
+def mask_runs(mask: int) -> tuple[tuple[int, int], ...]:
+    """Return the (start, end) slot runs of set bits, end exclusive."""
+    edges = mask ^ (mask << 1)
+    runs: list[tuple[int, int]] = []
+    while edges:
+        low = edges & -edges
+        edges ^= low
+        high = edges & -edges
+        edges ^= high
+        runs.append((low.bit_length() - 1, high.bit_length() - 1))
+    return tuple(runs)
+
+
+def _format_slot(slot: int) -> str:
+    """Format a slot index (0-48) as HH:MM."""
+    return f"{slot // 2:02d}:{(slot % 2) * 30:02d}"
+
+
+def _format_runs(runs: Iterable[tuple[int, int]], offset: int) -> list[str]:
+    """Format slot runs as HH:MM-HH:MM strings."""
+    return [f"{_format_slot(start + offset)}-{_format_slot(end + offset)}" for start, end in runs]
+
+
+@lru_cache(maxsize=512)
+def decode_word(value: int, is_am: bool = True) -> str:
+    """Decode one AM or PM word into human-readable time ranges.
+
+    Returns a string like "06:00-09:30, 17:00-21:00" or "No active periods".
+    """
+    runs = mask_runs(value & WORD_MASK)
+    if not runs:
+        return NO_ACTIVE_PERIODS
+    return ", ".join(_format_runs(runs, 0 if is_am else SCHEDULE_SLOTS_PER_WORD))
+
+
+@lru_cache(maxsize=512)
+def decode_day(am: int, pm: int) -> str:
+    """Decode a day's AM and PM words into human-readable time ranges.
+
+    AM and PM periods are listed separately, so a period spanning noon shows
+    as "...-12:00, 12:00-...".
+    """
+    ranges = _format_runs(mask_runs(am & WORD_MASK), 0) + _format_runs(
+        mask_runs(pm & WORD_MASK), SCHEDULE_SLOTS_PER_WORD
+    )
+    if not ranges:
+        return NO_ACTIVE_PERIODS
+    return ", ".join(ranges)
+
+
+def day_ranges(mask: int) -> list[str]:
+    """Return the active periods of a 48-bit day mask as HH:MM-HH:MM strings."""
+    return _format_runs(mask_runs(mask & DAY_MASK), 0)
+
+
+def _parse_time(value: str) -> int:
+    """Parse HH:MM on a half-hour boundary into a slot index (0-48)."""
+    try:
+        hour_str, minute_str = value.strip().split(":")
+        hour, minute = int(hour_str), int(minute_str)
+    except ValueError as err:
+        raise ValueError(f"Invalid time '{value}', expected HH:MM") from err
+    if minute not in (0, 30) or not 0 <= hour <= 24 or (hour == 24 and minute):
+        raise ValueError(f"Invalid time '{value}', must be a half hour between 00:00 and 24:00")
+    return hour * 2 + minute // 30
+
+
+def encode_ranges(ranges: Iterable[str]) -> int:
+    """Encode HH:MM-HH:MM periods into a 48-bit day mask.
+
+    Overlapping or adjacent periods are merged.
+    """
+    mask = 0
+    for period in ranges:
+        start_str, sep, end_str = period.partition("-")
+        if not sep:
+            raise ValueError(f"Invalid period '{period}', expected HH:MM-HH:MM")
+        start, end = _parse_time(start_str), _parse_time(end_str)
+        if start >= end:
+            raise ValueError(f"Invalid period '{period}', start must be before end")
+        mask |= ((1 << (end - start)) - 1) << start
+    return mask
+
+
+def week_mask(day_masks: Sequence[int]) -> int:
+    """Concatenate seven day masks into one 336-bit week, Sunday 00:00 at bit 0."""
+    week = 0
+    for day, mask in enumerate(day_masks):
+        week |= (mask & DAY_MASK) << (day * SCHEDULE_SLOTS_PER_DAY)
+    return week
+
+
+def week_slot(when: datetime) -> int:
+    """Return the week slot index (0-335) of a local time."""
+    day = (when.weekday() + 1) % 7  # Controller weeks start on Sunday
+    return day * SCHEDULE_SLOTS_PER_DAY + when.hour * 2 + when.minute // 30
+
+
+def is_slot_active(day_masks: Sequence[int], when: datetime) -> bool:
+    """Return True if the slot containing ``when`` is active."""
+    return bool((week_mask(day_masks) >> week_slot(when)) & 1)
+
+
+@lru_cache(maxsize=64)
+def week_edges(day_masks: tuple[int, ...]) -> int:
+    """Return a 336-bit mask with a bit set at every slot that differs from the slot before it.
+
+    The week wraps around, so Sunday 00:00 is compared with Saturday 23:30.
+    Computed once per schedule; finding the next change is then a single
+    bit scan instead of a slot-by-slot walk.
+    """
+    week = week_mask(day_masks)
+    previous = ((week << 1) | (week >> (WEEK_SLOTS - 1))) & WEEK_MASK
+    return week ^ previous
+
+
+def next_transition(day_masks: Sequence[int], when: datetime) -> datetime | None:
+    """Return the start of the next slot whose state differs from the current one.
+
+    Returns None for a schedule that never changes state.
+    """
+    edges = week_edges(tuple(day_masks))
+    if not edges:
+        return None
+
+    # First edge after the current slot, wrapping to the first edge of the week
+    slot = week_slot(when)
+    later = edges >> (slot + 1)
+    if later:
+        offset = (later & -later).bit_length()
+    else:
+        offset = (edges & -edges).bit_length() - 1 + WEEK_SLOTS - slot
+
+    slot_start = when.replace(minute=when.minute - when.minute % 30, second=0, microsecond=0)
+    return slot_start + timedelta(minutes=30 * offset)
+
+
+class ScheduleTracker:
+    """Call back exactly when a weekly schedule switches between active and inactive.
+
+    Feed it the schedule words after every poll with ``async_update``; the
+    timer is only re-armed when the words actually change. Every listener is
+    called at each transition.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the tracker without listeners."""
+        self._hass = hass
+        self._listeners: list[Callable[[], None]] = []
+        self._words: tuple[int, ...] | None = None
+        self._day_masks: tuple[int, ...] | None = None
+        self._active: bool | None = None
+        self._next: datetime | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @property
+    def active(self) -> bool | None:
+        """Return whether the current slot is active, or None without a schedule."""
+        return self._active
+
+    @property
+    def next_transition(self) -> datetime | None:
+        """Return when the schedule next changes state."""
+        return self._next
+
+    @property
+    def has_listeners(self) -> bool:
+        """Return True while anyone follows the schedule."""
+        return bool(self._listeners)
+
+    @callback
+    def async_add_listener(self, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call ``action`` at every transition; return a callback that removes it."""
+        self._listeners.append(action)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(action)
+
+        return _remove
+
+    @callback
+    def async_update(self, words: tuple[int, ...] | None) -> None:
+        """Track new schedule words, re-arming only if they changed."""
+        if words == self._words:
+            return
+        self._words = words
+        self._day_masks = decode_week(words) if words is not None else None
+        self._arm(dt_util.now())
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop tracking."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _arm(self, now: datetime) -> None:
+        """Evaluate the current slot and schedule the next transition."""
+        self.async_cancel()
+        if self._day_masks is None:
+            self._active = None
+            self._next = None
+            return
+        self._active = is_slot_active(self._day_masks, now)
+        self._next = next_transition(self._day_masks, now)
+        if self._next is not None:
+            self._unsub = async_track_point_in_time(self._hass, self._async_transition, self._next)
+
+    @callback
+    def _async_transition(self, now: datetime) -> None:
+        """Handle a slot boundary."""
+        self._unsub = None
+        # Never evaluate before the boundary, even if the timer fired a hair early
+        self._arm(max(dt_util.now(), self._next or now))
+        for action in list(self._listeners):
+            action()
@@ -0,0 +1,141 @@
+"""Shared poll scheduling across ecoNEXT gateways.
+
+With several gateways set up, each coordinator polls on its own timer, and
+Home Assistant starts those timers on whole seconds, so polls of all entries
+tend to land together and their payloads are decoded at the same moment.
+``PollScheduler`` is shared by every entry and sits in front of each
+parameter fetch:
+
+- starts of fetches from different entries are spread out: each waits until
+  ``spacing`` (the poll interval divided by the number of entries, at most
+  ``POLL_SPACING_MAX`` seconds) has passed since the previous start
+- at most ``max_concurrent`` fetches, including decoding, run at once, which
+  also bounds how many payloads are held in memory together
+- an entry retrying an unreachable gateway fetches outside the slots, so a
+  request waiting for its timeout does not hold up healthy gateways
+
+Home Assistant schedules each coordinator's next refresh on a whole second
+plus a fixed per-coordinator offset, counted from when the poll finished. A
+start pushed back by whole seconds mostly carries over to the next poll, but
+sub-second spacing (more than 10 entries at the default interval) is lost,
+so those polls line up again and wait on every cycle. Waits and concurrency
+are kept per entry and for the whole scheduler.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+import contextlib
+from typing import Any
+
+from .const import POLL_MAX_CONCURRENT, POLL_SPACING_MAX, UPDATE_INTERVAL
+from .metrics import RollingHistogram
+
+
+class ScheduledEntry:
+    """One entry's fetches through the shared scheduler."""
+
+    def __init__(self, scheduler: "PollScheduler", entry_id: str) -> None:
+        """Initialize the entry's counters."""
+        self.scheduler = scheduler
+        self.entry_id = entry_id
+        self.polls = 0
+        # Fetches run outside the shared slots while the gateway was unreachable
+        self.unshared = 0
+        # Milliseconds waited for the spacing, and for a free fetch slot
+        self.stagger_ms = RollingHistogram()
+        self.queue_ms = RollingHistogram()
+
+    def async_slot(self, *, shared: bool = True) -> contextlib.AbstractAsyncContextManager[None]:
+        """Return a context that waits for this entry's turn and holds a fetch slot.
+
+        With ``shared`` False the fetch neither waits nor takes a slot.
+        """
+        if not shared:
+            self.unshared += 1
+            return contextlib.nullcontext()
+        return self.scheduler.async_slot(self)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the entry's poll count and waits."""
+        return {
+            "polls": self.polls,
+            "unshared": self.unshared,
+            "stagger_ms": self.stagger_ms.summary(),
+            "queue_ms": self.queue_ms.summary(),
+        }
+
+
+class PollScheduler:
+    """Stagger and cap parameter fetches of every entry."""
+
+    def __init__(
+        self,
+        interval: float = UPDATE_INTERVAL,
+        max_concurrent: int = POLL_MAX_CONCURRENT,
+        spacing_max: float = POLL_SPACING_MAX,
+    ) -> None:
+        """Initialize the scheduler without entries."""
+        self.interval = interval
+        self.max_concurrent = max_concurrent
+        self.spacing_max = spacing_max
+        self.entries: dict[str, ScheduledEntry] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        # Loop time the next fetch may start at
+        self._next_start = 0.0
+        self.running = 0
+        self.peak_running = 0
+        self.polls = 0
+        self.delayed = 0
+
+    @property
+    def spacing(self) -> float:
+        """Return the seconds kept between the starts of two fetches."""
+        if len(self.entries) < 2:
+            return 0.0
+        return min(self.interval / len(self.entries), self.spacing_max)
+
+    def add_entry(self, entry_id: str) -> ScheduledEntry:
+        """Register an entry and return its handle."""
+        entry = self.entries[entry_id] = ScheduledEntry(self, entry_id)
+        return entry
+
+    def remove_entry(self, entry_id: str) -> None:
+        """Forget an unloaded entry."""
+        self.entries.pop(entry_id, None)
+
+    @contextlib.asynccontextmanager
+    async def async_slot(self, entry: ScheduledEntry) -> AsyncIterator[None]:
+        """Wait for the entry's turn and a free slot, and hold the slot until the fetch is done."""
+        loop = asyncio.get_running_loop()
+        requested = loop.time()
+        start = max(requested, self._next_start)
+        self._next_start = start + self.spacing
+        if start > requested:
+            self.delayed += 1
+            await asyncio.sleep(start - requested)
+        entry.stagger_ms.add((loop.time() - requested) * 1000)
+
+        queued = loop.time()
+        async with self._semaphore:
+            entry.queue_ms.add((loop.time() - queued) * 1000)
+            entry.polls += 1
+            self.polls += 1
+            self.running += 1
+            self.peak_running = max(self.peak_running, self.running)
+            try:
+                yield
+            finally:
+                self.running -= 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the aggregate counters and each entry's."""
+        return {
+            "entries": len(self.entries),
+            "spacing": round(self.spacing, 3),
+            "max_concurrent": self.max_concurrent,
+            "polls": self.polls,
+            "delayed": self.delayed,
+            "running": self.running,
+            "peak_running": self.peak_running,
+            "per_entry": {entry_id: entry.as_dict() for entry_id, entry in self.entries.items()},
+        }
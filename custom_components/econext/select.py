@@ -117,6 +117,8 @@ def _get_circuit_param_id(circuit, select_key: str) -> str | None:
 class EconextSelect(EconextEntity, SelectEntity):
     """Representation of an ecoNEXT select entity."""
 
+    _low_priority = True
+
     def __init__(
         self,
         coordinator: EconextCoordinator,
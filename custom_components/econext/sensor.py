@@ -1,13 +1,18 @@
 """Sensor platform for ecoNEXT integration."""
 
+from datetime import datetime
 import logging
+from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
-from .climate import CIRCUITS
+from .binary_sensor import get_schedules
+from .climate import CIRCUITS, CircuitWorkState
 from .const import (
     CIRCUIT_SCHEDULE_DIAGNOSTIC_SENSORS,
     CIRCUIT_SENSORS,
@@ -15,14 +20,19 @@ from .const import (
     DHW_SCHEDULE_DIAGNOSTIC_SENSORS,
     DHW_SENSORS,
     DOMAIN,
+    EconextScheduleEntityDescription,
     EconextSensorEntityDescription,
     HEATPUMP_SCHEDULE_DIAGNOSTIC_SENSORS,
     HEATPUMP_SENSORS,
+    POLL_METRIC_SENSORS,
     SILENT_MODE_SCHEDULE_DIAGNOSTIC_SENSORS,
+    EconextMetricSensorEntityDescription,
     get_alarm_name,
 )
 from .coordinator import EconextCoordinator
 from .entity import EconextEntity
+from .metrics import RollingHistogram
+from .schedule import ScheduleTracker, decode_day, decode_week, decode_word, next_transition
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,36 +48,7 @@ def decode_schedule_bitfield(value: int, is_am: bool = True) -> str:
     Returns:
         String like "06:00-09:30, 17:00-21:00" or "No active periods"
     """
-    if value == 0:
-        return "No active periods"
-
-    ranges = []
-    start_bit = None
-    start_offset = 0 if is_am else 24  # PM schedules start at 12:00 (24 half-hours)
-
-    for bit in range(24):  # 24 half-hour slots
-        is_set = (value >> bit) & 1
-
-        if is_set and start_bit is None:
-            start_bit = bit
-        elif not is_set and start_bit is not None:
-            # End of range
-            start_hour = (start_offset + start_bit) // 2
-            start_min = ((start_offset + start_bit) % 2) * 30
-            end_hour = (start_offset + bit) // 2
-            end_min = ((start_offset + bit) % 2) * 30
-            ranges.append(f"{start_hour:02d}:{start_min:02d}-{end_hour:02d}:{end_min:02d}")
-            start_bit = None
-
-    # Handle range extending to end
-    if start_bit is not None:
-        start_hour = (start_offset + start_bit) // 2
-        start_min = ((start_offset + start_bit) % 2) * 30
-        end_hour = (start_offset + 24) // 2
-        end_min = 0
-        ranges.append(f"{start_hour:02d}:{start_min:02d}-{end_hour:02d}:{end_min:02d}")
-
-    return ", ".join(ranges)
+    return decode_word(value, is_am)
 
 
 async def async_setup_entry(
@@ -211,6 +192,8 @@ async def async_setup_entry(
                                     circuit.comfort_param,
                                     circuit.room_temp_setpoint_param,
                                     device_id=f"circuit_{circuit_num}",
+                                    work_state_param_id=circuit.work_state_param,
+                                    schedule_param_ids=circuit.schedule_param_ids,
                                 )
                             )
                     else:
@@ -242,6 +225,7 @@ async def async_setup_entry(
                         device_type=description.device_type,
                         icon=description.icon,
                         entity_category=description.entity_category,
+                        entity_registry_enabled_default=description.entity_registry_enabled_default,
                     )
                     entities.append(
                         EconextScheduleDiagnosticSensor(
@@ -257,9 +241,19 @@ async def async_setup_entry(
                         param_id_pm,
                     )
 
+    # Add next-change sensors for every schedule
+    for description, device_id in get_schedules(coordinator):
+        entities.append(EconextScheduleNextChangeSensor(coordinator, description, device_id=device_id))
+
     # Add alarm history sensor
     entities.append(EconextAlarmSensor(coordinator))
 
+    # Add data freshness sensor
+    entities.append(EconextDataUpdateSensor(coordinator))
+
+    # Add poll metric sensors
+    entities.extend(EconextPollMetricSensor(coordinator, description) for description in POLL_METRIC_SENSORS)
+
     async_add_entities(entities)
 
 
@@ -320,6 +314,7 @@ class EconextSensor(EconextEntity, SensorEntity):
             self._attr_icon = description.icon
         if description.options:
             self._attr_options = description.options
+        self._attr_entity_registry_enabled_default = description.entity_registry_enabled_default
 
     @property
     def native_value(self):
@@ -358,6 +353,8 @@ class EconextScheduleDiagnosticSensor(EconextSensor):
     This sensor combines both AM and PM schedule periods into a single daily view.
     """
 
+    _low_priority = True
+
     def __init__(
         self,
         coordinator: EconextCoordinator,
@@ -384,19 +381,7 @@ class EconextScheduleDiagnosticSensor(EconextSensor):
             return None
 
         try:
-            # Decode both AM and PM periods
-            am_decoded = decode_schedule_bitfield(int(am_value), is_am=True)
-            pm_decoded = decode_schedule_bitfield(int(pm_value), is_am=False)
-
-            # Combine results
-            if am_decoded == "No active periods" and pm_decoded == "No active periods":
-                return "No active periods"
-            elif am_decoded == "No active periods":
-                return pm_decoded
-            elif pm_decoded == "No active periods":
-                return am_decoded
-            else:
-                return f"{am_decoded}, {pm_decoded}"
+            return decode_day(int(am_value), int(pm_value))
         except (ValueError, TypeError):
             return None
 
@@ -404,8 +389,10 @@ class EconextScheduleDiagnosticSensor(EconextSensor):
 class EconextActiveScheduleModeSensor(EconextSensor):
     """Sensor that shows the active schedule mode (eco/comfort) for a circuit.
 
-    Computes the active mode by comparing the room temperature setpoint
-    to the eco and comfort temperature settings.
+    While the circuit follows its schedule, the mode comes from the decoded
+    schedule and flips exactly at the slot boundary. Otherwise it is computed
+    by comparing the room temperature setpoint to the eco and comfort
+    temperature settings.
     """
 
     def __init__(
@@ -416,20 +403,46 @@ class EconextActiveScheduleModeSensor(EconextSensor):
         comfort_param_id: str,
         setpoint_param_id: str,
         device_id: str | None = None,
+        work_state_param_id: str | None = None,
+        schedule_param_ids: tuple[tuple[str, str], ...] = (),
     ) -> None:
         """Initialize the active schedule mode sensor."""
         super().__init__(coordinator, description, device_id)
         self._eco_param_id = eco_param_id
         self._comfort_param_id = comfort_param_id
         self._setpoint_param_id = setpoint_param_id
+        self._work_state_param_id = work_state_param_id
+        self._schedule_param_ids = schedule_param_ids
+        self._schedule_tracker: ScheduleTracker | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start following the circuit schedule."""
+        await super().async_added_to_hass()
+        if self._schedule_param_ids:
+            self._schedule_tracker = self._async_follow_schedule(self._schedule_param_ids, self.async_write_ha_state)
+
+    def _schedule_mode(self) -> str | None:
+        """Return the mode from the tracked schedule while the circuit is in auto mode."""
+        if self._schedule_tracker is None or self._schedule_tracker.active is None:
+            return None
+        if (
+            self._work_state_param_id is None
+            or self.coordinator.get_param_value(self._work_state_param_id) != CircuitWorkState.AUTO
+        ):
+            return None
+        return "comfort" if self._schedule_tracker.active else "eco"
 
     @property
     def native_value(self) -> str | None:
         """Return the active schedule mode (eco or comfort).
 
         Compares the current room_temp_setpoint to eco_temp and comfort_temp
-        to determine which mode the circuit is currently following.
+        to determine which mode the circuit is currently following, unless the
+        schedule is being tracked.
         """
+        if (schedule_mode := self._schedule_mode()) is not None:
+            return schedule_mode
+
         # Get current room temperature setpoint (the target temp the system is using)
         setpoint_param = self.coordinator.get_param(self._setpoint_param_id)
         if not setpoint_param:
@@ -474,6 +487,62 @@ class EconextActiveScheduleModeSensor(EconextSensor):
             return None
 
 
+class EconextScheduleNextChangeSensor(EconextEntity, SensorEntity):
+    """Timestamp of the next time a weekly schedule switches on or off.
+
+    Computed from the schedule words when they change and again when a
+    transition fires, so it needs no extra polling.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:calendar-clock"
+
+    _low_priority = True
+
+    def __init__(
+        self,
+        coordinator: EconextCoordinator,
+        description: EconextScheduleEntityDescription,
+        device_id: str | None = None,
+    ) -> None:
+        """Initialize the next-change sensor."""
+        # Use provided device_id or determine from device_type
+        if device_id is None and description.device_type != "controller":
+            device_id = description.device_type
+
+        super().__init__(coordinator, f"{description.key}_next_change", device_id)
+
+        self._description = description
+        self._attr_translation_key = f"{description.key}_next_change"
+        self._schedule_tracker: ScheduleTracker | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start following the schedule."""
+        await super().async_added_to_hass()
+        self._schedule_tracker = self._async_follow_schedule(self._description.param_ids, self.async_write_ha_state)
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return when the schedule next changes state."""
+        if self._schedule_tracker is not None:
+            return self._schedule_tracker.next_transition
+        words = self.coordinator.get_schedule_words(self._description.param_ids)
+        if words is None:
+            return None
+        return next_transition(decode_week(words), dt_util.now())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return whether the schedule is currently active."""
+        if self._schedule_tracker is not None:
+            return {"active": self._schedule_tracker.active}
+        return {}
+
+    def _is_value_valid(self) -> bool:
+        """Check that all AM/PM words are present."""
+        return self.coordinator.get_schedule_words(self._description.param_ids) is not None
+
+
 class EconextAlarmSensor(EconextEntity, SensorEntity):
     """Sensor showing the most recent alarm with history in attributes."""
 
@@ -526,3 +595,88 @@ class EconextAlarmSensor(EconextEntity, SensorEntity):
     def _is_value_valid(self) -> bool:
         """Alarm data is always valid if coordinator is updating."""
         return True
+
+
+class EconextDataUpdateSensor(EconextEntity, SensorEntity):
+    """Diagnostic sensor showing when the data was last polled successfully.
+
+    It stays available while polls fail, so the age of the values other
+    entities keep showing through the grace period can be read from it.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:clock-check-outline"
+    _attr_translation_key = "last_data_update"
+
+    def __init__(self, coordinator: EconextCoordinator) -> None:
+        """Initialize the data update sensor."""
+        super().__init__(coordinator, "_last_data_update", None)
+        uid = coordinator.get_device_uid()
+        self._attr_unique_id = f"{uid}_last_data_update"
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the time of the last successful poll."""
+        return self.coordinator.last_data_update
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of polls failed since."""
+        return {"failed_polls": self.coordinator.connection.failures}
+
+    @property
+    def available(self) -> bool:
+        """Return True once any data was received."""
+        return self.coordinator.last_data_update is not None
+
+
+class EconextPollMetricSensor(EconextEntity, SensorEntity):
+    """Diagnostic sensor exposing one rolling poll metric.
+
+    The state is the latest sample; the attributes summarize the rolling
+    window. Fan-out metrics (entities notified, state writes) are recorded
+    after listeners run, so they show the previous update.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    _low_priority = True
+
+    def __init__(
+        self,
+        coordinator: EconextCoordinator,
+        description: EconextMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the poll metric sensor."""
+        super().__init__(coordinator, description.key, None)
+
+        self._description = description
+        self._attr_translation_key = description.key
+        self._attr_native_unit_of_measurement = description.native_unit_of_measurement
+        if description.icon:
+            self._attr_icon = description.icon
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the latest sample."""
+        value = self._histogram.last
+        if value is not None and self._description.precision is not None:
+            return round(value, self._description.precision)
+        return value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the rolling window summary."""
+        return self._histogram.summary()
+
+    @property
+    def _histogram(self) -> RollingHistogram:
+        """Return the histogram this sensor reports."""
+        return getattr(self.coordinator.metrics, self._description.metric)
+
+    def _is_value_valid(self) -> bool:
+        """Metrics are always valid."""
+        return True
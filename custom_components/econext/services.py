@@ -0,0 +1,63 @@
+"""Integration-wide services for ecoNEXT."""
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+import voluptuous as vol
+
+from .const import DOMAIN, SERVICE_PROFILE, SERVICE_RECORD_SESSION
+from .coordinator import EconextCoordinator
+
+ATTR_CYCLES = "cycles"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DURATION = "duration"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=3): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): str,
+    }
+)
+
+RECORD_SESSION_SCHEMA = vol.Schema(
+    {
+        # Minutes; 0 stops a recording in progress
+        vol.Optional(ATTR_DURATION, default=60): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): str,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the ecoNEXT services."""
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next polls of one or all controllers."""
+        for coordinator in _get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            coordinator.async_start_profiling(call.data[ATTR_CYCLES])
+
+    async def async_record_session(call: ServiceCall) -> None:
+        """Record the gateway responses of one or all controllers to the config dir."""
+        duration = call.data[ATTR_DURATION]
+        for coordinator in _get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            if duration:
+                await coordinator.async_start_recording(timedelta(minutes=duration))
+            else:
+                await coordinator.async_stop_recording()
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RECORD_SESSION, async_record_session, schema=RECORD_SESSION_SCHEMA)
+
+
+def _get_coordinators(hass: HomeAssistant, entry_id: str | None) -> list[EconextCoordinator]:
+    """Return the coordinator of one entry, or of every loaded entry."""
+    entries = hass.data.get(DOMAIN, {})
+    if entry_id is not None:
+        if entry_id not in entries:
+            raise ServiceValidationError(f"ecoNEXT config entry {entry_id} is not loaded")
+        return [entries[entry_id]["coordinator"]]
+    if not entries:
+        raise ServiceValidationError("No ecoNEXT controllers are loaded")
+    return [entry_data["coordinator"] for entry_data in entries.values()]
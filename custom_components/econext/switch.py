@@ -104,6 +104,8 @@ async def async_setup_entry(
 class EconextSwitch(EconextEntity, SwitchEntity):
     """Representation of an ecoNEXT switch entity."""
 
+    _low_priority = True
+
     def __init__(
         self,
         coordinator: EconextCoordinator,
@@ -0,0 +1,127 @@
+"""Websocket API for the ecoNEXT schedule card.
+
+Lets the frontend read every schedule of a controller in one message and
+write a full-week edit as a single batched parameter write, instead of
+subscribing to and setting the individual AM/PM number entities.
+"""
+
+import logging
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+import voluptuous as vol
+
+from .api import EconextApiError
+from .binary_sensor import get_schedules
+from .const import DOMAIN, SCHEDULE_DAYS, SCHEDULE_SLOTS_PER_DAY, EconextScheduleEntityDescription
+from .coordinator import EconextCoordinator
+from .schedule import decode_week
+
+_LOGGER = logging.getLogger(__name__)
+
+WS_TYPE_SCHEDULES_GET = f"{DOMAIN}/schedules/get"
+WS_TYPE_SCHEDULES_SET = f"{DOMAIN}/schedules/set"
+
+WEEK_SCHEMA = vol.All(
+    [vol.All(int, vol.Range(min=0, max=(1 << SCHEDULE_SLOTS_PER_DAY) - 1))],
+    vol.Length(min=len(SCHEDULE_DAYS), max=len(SCHEDULE_DAYS)),
+)
+
+
+@callback
+def async_register_websocket_api(hass: HomeAssistant) -> None:
+    """Register the ecoNEXT websocket commands."""
+    websocket_api.async_register_command(hass, ws_get_schedules)
+    websocket_api.async_register_command(hass, ws_set_schedules)
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str | None) -> EconextCoordinator | None:
+    """Return the coordinator of an entry, or of the only entry if none is given."""
+    entries: dict[str, dict[str, Any]] = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        if len(entries) != 1:
+            return None
+        entry_id = next(iter(entries))
+    entry_data = entries.get(entry_id)
+    return entry_data["coordinator"] if entry_data else None
+
+
+def _schedule_id(description: EconextScheduleEntityDescription, device_id: str | None) -> str:
+    """Return the stable id of a schedule, matching its entity unique_id suffix."""
+    device = device_id or description.device_type
+    return f"{device}_{description.key}"
+
+
+def _get_schedules(coordinator: EconextCoordinator) -> dict[str, tuple[EconextScheduleEntityDescription, str | None]]:
+    """Return the controller's schedules by id."""
+    return {
+        _schedule_id(description, device_id): (description, device_id)
+        for description, device_id in get_schedules(coordinator)
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SCHEDULES_GET,
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def ws_get_schedules(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    """Return every schedule of a controller as seven 48-bit day masks, Sunday first."""
+    coordinator = _get_coordinator(hass, msg.get("entry_id"))
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "ecoNEXT entry not found")
+        return
+
+    schedules: dict[str, dict[str, Any]] = {}
+    for schedule_id, (description, device_id) in _get_schedules(coordinator).items():
+        words = coordinator.get_schedule_words(description.param_ids)
+        if words is None:
+            continue
+        schedules[schedule_id] = {
+            "key": description.key,
+            "device": device_id or description.device_type,
+            "slots": list(decode_week(words)),
+        }
+
+    connection.send_result(msg["id"], {"schedules": schedules})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SCHEDULES_SET,
+        vol.Optional("entry_id"): str,
+        vol.Required("schedules"): {str: WEEK_SCHEMA},
+    }
+)
+@websocket_api.async_response
+async def ws_set_schedules(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Write full weeks for one or more schedules in a single batch."""
+    coordinator = _get_coordinator(hass, msg.get("entry_id"))
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "ecoNEXT entry not found")
+        return
+
+    available = _get_schedules(coordinator)
+    unknown = sorted(set(msg["schedules"]) - set(available))
+    if unknown:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, f"Unknown schedules: {', '.join(unknown)}")
+        return
+
+    values: dict[str, int] = {}
+    for schedule_id, slots in msg["schedules"].items():
+        description, _ = available[schedule_id]
+        values.update(coordinator.build_schedule_values(description.param_ids, slots))
+
+    try:
+        success = await coordinator.async_set_params(values)
+    except EconextApiError as err:
+        _LOGGER.error("Failed to write schedules %s: %s", list(msg["schedules"]), err)
+        connection.send_error(msg["id"], websocket_api.ERR_HOME_ASSISTANT_ERROR, str(err))
+        return
+
+    connection.send_result(msg["id"], {"success": success})
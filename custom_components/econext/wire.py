@@ -0,0 +1,96 @@
+"""Compact binary wire format for parameter polls.
+
+Gateways that support it answer a parameters request accepting
+``application/msgpack`` with the values only, as a positional array:
+
+    {"timestamp": "...", "schema": "<id>", "values": [42, "PS", 45.9, ...]}
+
+The metadata the values line up with is fetched once from ``/api/schema``
+and cached until the gateway reports a different schema id:
+
+    {"schema": "<id>", "parameters": [{"index": 0, "name": "PS", "type": 2, "unit": 0,
+                                       "writable": false, "min": null, "max": null}, ...]}
+
+Each poll then decodes a flat list instead of a map of ~1870 objects.
+MessagePack support is optional; without the ``msgpack`` module only JSON is
+requested.
+"""
+
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+
+def binary_supported() -> bool:
+    """Return True if the msgpack module is installed."""
+    return msgpack is not None
+
+
+def unpack(body: bytes) -> Any:
+    """Decode a MessagePack body.
+
+    Raises:
+        ValueError: If the body is not valid MessagePack.
+
+    """
+    try:
+        return msgpack.unpackb(body)
+    except (msgpack.UnpackException, msgpack.ExtraData) as err:
+        raise ValueError(str(err)) from err
+
+
+class ParameterSchema:
+    """Parameter metadata that positional value arrays are aligned with."""
+
+    def __init__(self, schema_id: str, parameters: list[dict[str, Any]]) -> None:
+        """Initialize the schema from the gateway's metadata table."""
+        self.id = schema_id
+        self._parameters = parameters
+        # Per position: index and the integration's fields except the value
+        self._templates = [
+            (
+                str(param["index"]),
+                {
+                    "name": param.get("name"),
+                    "minv": param.get("min"),
+                    "maxv": param.get("max"),
+                    "writable": param.get("writable", False),
+                    "type": param.get("type"),
+                    "unit": param.get("unit"),
+                },
+            )
+            for param in parameters
+        ]
+
+    def __len__(self) -> int:
+        """Return the number of parameters."""
+        return len(self._templates)
+
+    def map_values(self, values: list[Any]) -> dict[str, dict[str, Any]]:
+        """Map a positional value array to the integration's format, keyed by index.
+
+        Raises:
+            ValueError: If the array does not match the schema's length.
+
+        """
+        if len(values) != len(self._templates):
+            raise ValueError(f"Expected {len(self._templates)} values, got {len(values)}")
+        return {
+            index: {"value": value, **template}
+            for (index, template), value in zip(self._templates, values, strict=True)
+        }
+
+    def gateway_format(self, timestamp: str | None, values: list[Any]) -> dict[str, Any]:
+        """Rebuild the JSON parameters payload, for recording sessions."""
+        return {
+            "timestamp": timestamp,
+            "parameters": {
+                str(param["index"]): {**param, "value": value}
+                for param, value in zip(self._parameters, values, strict=True)
+            },
+        }
@@ -2,6 +2,7 @@
 
 import json
 import sys
+from collections.abc import AsyncIterator
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -11,6 +12,10 @@ from aiohttp import ClientSession
 # Add project root to path so econext package can be imported
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from custom_components.econext.api import EconextApi
+
+from .fake_gateway import FakeGateway
+
 
 @pytest.fixture
 def fixture_path() -> Path:
@@ -69,3 +74,40 @@ def mock_response() -> MagicMock:
     response = MagicMock()
     response.status = 200
     return response
+
+
+@pytest.fixture
+async def fake_gateway() -> AsyncIterator[FakeGateway]:
+    """Serve the fixture from a local stand-in gateway on a free port."""
+    gateway = FakeGateway(drift_interval=None, seed=0)
+    await gateway.async_start()
+    yield gateway
+    await gateway.async_stop()
+
+
+@pytest.fixture
+async def gateway_api(fake_gateway: FakeGateway) -> AsyncIterator[EconextApi]:
+    """Create an API client talking HTTP to the stand-in gateway."""
+    async with ClientSession() as session:
+        yield EconextApi("127.0.0.1", fake_gateway.port, session)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the soak test options."""
+    parser.addoption("--soak", action="store_true", help="Run the long-running soak tests")
+    parser.addoption("--soak-days", type=float, default=1.0, help="Simulated days of polling per soak test")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the soak marker."""
+    config.addinivalue_line("markers", "soak: long-running soak test, only run with --soak")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip soak tests unless --soak is given."""
+    if config.getoption("--soak"):
+        return
+    skip = pytest.mark.skip(reason="soak test, run with --soak")
+    for item in items:
+        if "soak" in item.keywords:
+            item.add_marker(skip)
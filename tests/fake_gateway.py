@@ -0,0 +1,407 @@
+"""Local stand-in for econext-gateway.
+
+Serves the gateway HTTP API over a real socket so the API client, coordinator
+and platforms can be exercised end to end:
+
+- ``GET /api/parameters``: all parameters in the gateway format
+- ``GET /api/parameters/{name}``: one parameter in the gateway format
+- ``POST /api/parameters/{name}``: write ``{"value": ...}`` to a parameter
+- ``GET /api/alarms``: the alarm history
+- ``GET /api/schema``: the parameter metadata for MessagePack polls
+- ``GET /api/ws``: a WebSocket streaming parameter changes
+
+Parameters start from ``tests/fixtures/parameters.json``. Telemetry (read-only
+float values) drifts in a bounded random walk as time passes, and writes are
+applied so the next poll returns them. ``GatewayFaults`` injects latency,
+hanging requests, 5xx responses and bodies cut off mid-transfer. With
+``compress`` set, responses are gzip or deflate encoded when the client
+accepts it; with ``binary`` set, parameter polls accepting MessagePack get the
+positional values format of ``custom_components.econext.wire``. With
+``stream`` set, drift and writes are pushed to WebSocket subscribers as they
+happen; otherwise the stream endpoint answers 404 like older gateways.
+
+Run it standalone for manual soak testing:
+
+    python -m tests.fake_gateway [--port 8000] [--latency 0.2] [--error-rate 0.05] [--compress] [--binary] [--stream]
+"""
+
+import argparse
+import asyncio
+from collections import Counter, deque
+from dataclasses import dataclass, fields
+import hashlib
+import json
+from pathlib import Path
+import random
+import time
+from typing import Any
+import zlib
+
+from aiohttp import web
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FIXTURE = Path(__file__).parent / "fixtures" / "parameters.json"
+
+PARAMETERS_PATH = "/api/parameters"
+ALARMS_PATH = "/api/alarms"
+SCHEMA_PATH = "/api/schema"
+STREAM_PATH = "/api/ws"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+# Parameter metadata fields sent in the schema
+SCHEMA_FIELDS = ("index", "name", "type", "unit", "writable", "min", "max")
+
+# Writes kept in ``FakeGateway.writes``; bounded so soak runs do not grow it
+WRITES_KEPT = 100
+
+# Encodings served when compression is on, in order of preference
+ENCODINGS = ("gzip", "deflate")
+
+# Sentinel the controller reports for a disconnected sensor; never drifted
+SENSOR_NOT_CONNECTED = 999.0
+
+
+@dataclass
+class GatewayFaults:
+    """Faults injected into responses; rates are probabilities per request."""
+
+    # Seconds added to every response, plus up to ``jitter`` more
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Requests that hang for ``hang_seconds`` before answering
+    timeout_rate: float = 0.0
+    hang_seconds: float = 30.0
+    # Requests answered with ``error_status``
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Successful responses whose connection drops halfway through the body
+    truncate_rate: float = 0.0
+
+
+def load_gateway_params(path: Path = FIXTURE) -> dict[str, dict[str, Any]]:
+    """Load a parameters fixture in the gateway format."""
+    params: dict[str, dict[str, Any]] = json.loads(path.read_text())
+    return {
+        index: {
+            "index": int(index),
+            "name": param.get("name", f"param_{index}"),
+            "value": param.get("value"),
+            "type": param.get("type", 2),
+            "unit": param.get("unit", 0),
+            "writable": param.get("writable", False),
+            "min": param.get("minv"),
+            "max": param.get("maxv"),
+        }
+        for index, param in params.items()
+    }
+
+
+class FakeGateway:
+    """An in-process econext-gateway serving mutable parameter state."""
+
+    def __init__(
+        self,
+        params: dict[str, dict[str, Any]] | None = None,
+        *,
+        alarms: list[dict[str, Any]] | None = None,
+        faults: GatewayFaults | None = None,
+        drift_interval: float | None = 10.0,
+        compress: bool = False,
+        binary: bool = False,
+        stream: bool = False,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the gateway.
+
+        Args:
+            params: Parameters in the gateway format, keyed by index.
+                Defaults to the test fixture.
+            alarms: Initial alarm history, newest first.
+            faults: Faults to inject; can be changed while running.
+            drift_interval: Seconds between telemetry drift steps, or None to
+                only drift on ``tick``.
+            compress: Encode responses with an encoding the client accepts.
+            binary: Serve MessagePack polls and the schema (needs msgpack).
+            stream: Push changes to WebSocket subscribers.
+            seed: Seed for drift and fault injection.
+
+        """
+        self.params = params if params is not None else load_gateway_params()
+        self.alarms = alarms if alarms is not None else []
+        self.faults = faults or GatewayFaults()
+        self.drift_interval = drift_interval
+        self.compress = compress
+        self.binary = binary
+        self.stream = stream
+        self.random = random.Random(seed)
+
+        self._by_name = {param["name"]: param for param in self.params.values() if param.get("name")}
+        self._telemetry = [
+            param
+            for param in self.params.values()
+            if isinstance(param["value"], float) and not param["writable"] and param["value"] != SENSOR_NOT_CONNECTED
+        ]
+        self._last_drift = time.monotonic()
+        self.schema_id = hashlib.sha1(
+            json.dumps([(index, param.get("name")) for index, param in self.params.items()]).encode()
+        ).hexdigest()[:12]
+
+        # Requests served by path, and the latest writes applied as (name, value)
+        self.requests: Counter[str] = Counter()
+        self.writes: deque[tuple[str, Any]] = deque(maxlen=WRITES_KEPT)
+        # Open streams and the changes queued for each
+        self._streams: dict[web.WebSocketResponse, asyncio.Queue[dict[str, Any]]] = {}
+
+        self._runner: web.AppRunner | None = None
+        self.port: int | None = None
+
+    # State
+
+    def tick(self, steps: int = 1) -> None:
+        """Drift every telemetry value ``steps`` times, by up to 0.1 per step."""
+        changes: dict[str, Any] = {}
+        for _ in range(steps):
+            for param in self._telemetry:
+                value = param["value"] + self.random.choice((-0.1, 0.0, 0.1))
+                low, high = param.get("min"), param.get("max")
+                if low is not None and high is not None and low < high:
+                    value = min(max(value, low), high)
+                if round(value, 1) != param["value"]:
+                    param["value"] = round(value, 1)
+                    changes[str(param["index"])] = param["value"]
+        self._publish(changes)
+
+    def _publish(self, changes: dict[str, Any]) -> None:
+        """Queue changed values, keyed by index, for every open stream."""
+        if changes:
+            for queue in self._streams.values():
+                queue.put_nowait(changes)
+
+    async def async_drop_streams(self) -> None:
+        """Close every open stream from the gateway side."""
+        for ws in list(self._streams):
+            await ws.close()
+
+    def _drift(self) -> None:
+        """Apply the drift steps due since the last request."""
+        if self.drift_interval is None:
+            return
+        steps = int((time.monotonic() - self._last_drift) / self.drift_interval)
+        if steps:
+            self._last_drift += steps * self.drift_interval
+            self.tick(steps)
+
+    def add_alarm(self, code: int, active: bool = True) -> dict[str, Any]:
+        """Add an alarm to the front of the history."""
+        alarm = {
+            "index": len(self.alarms),
+            "code": code,
+            "from_date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "to_date": None if active else time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self.alarms.insert(0, alarm)
+        return alarm
+
+    # HTTP
+
+    @property
+    def app(self) -> web.Application:
+        """Return a new aiohttp application serving the gateway API."""
+        app = web.Application()
+        app.router.add_get(PARAMETERS_PATH, self._handle_parameters)
+        app.router.add_get(f"{PARAMETERS_PATH}/{{name}}", self._handle_read)
+        app.router.add_post(f"{PARAMETERS_PATH}/{{name}}", self._handle_write)
+        app.router.add_get(ALARMS_PATH, self._handle_alarms)
+        app.router.add_get(SCHEMA_PATH, self._handle_schema)
+        app.router.add_get(STREAM_PATH, self._handle_stream)
+        return app
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start serving and return the bound port (a free one if ``port`` is 0)."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.port
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        await self.async_drop_streams()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _async_inject(self, request: web.Request) -> web.Response | None:
+        """Apply latency and faults; return an error response to send instead, if any."""
+        self.requests[request.path] += 1
+        faults = self.faults
+        delay = faults.latency + (self.random.uniform(0, faults.jitter) if faults.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if faults.timeout_rate and self.random.random() < faults.timeout_rate:
+            await asyncio.sleep(faults.hang_seconds)
+        if faults.error_rate and self.random.random() < faults.error_rate:
+            return web.json_response({"error": "injected fault"}, status=faults.error_status)
+        return None
+
+    def _encode(self, request: web.Request, body: bytes) -> tuple[bytes, dict[str, str]]:
+        """Compress a body with the first encoding the client accepts, if compression is on."""
+        if not self.compress:
+            return body, {}
+        accepted = {token.split(";")[0].strip() for token in request.headers.get("Accept-Encoding", "").split(",")}
+        for encoding in ENCODINGS:
+            if encoding in accepted:
+                wbits = zlib.MAX_WBITS | 16 if encoding == "gzip" else zlib.MAX_WBITS
+                compressor = zlib.compressobj(6, zlib.DEFLATED, wbits)
+                return compressor.compress(body) + compressor.flush(), {"Content-Encoding": encoding}
+        return body, {}
+
+    def _wants_binary(self, request: web.Request) -> bool:
+        """Return True if MessagePack is on and the client accepts it."""
+        return self.binary and msgpack is not None and MSGPACK_CONTENT_TYPE in request.headers.get("Accept", "")
+
+    async def _async_send(self, request: web.Request, payload: Any, *, binary: bool = False) -> web.StreamResponse:
+        """Send a JSON or MessagePack payload, possibly cutting the connection halfway through."""
+        content_type = MSGPACK_CONTENT_TYPE if binary else "application/json"
+        body, headers = self._encode(request, msgpack.packb(payload) if binary else json.dumps(payload).encode())
+        if not (self.faults.truncate_rate and self.random.random() < self.faults.truncate_rate):
+            return web.Response(body=body, content_type=content_type, headers=headers)
+
+        response = web.StreamResponse(headers={"Content-Type": content_type, **headers})
+        response.content_length = len(body)
+        await response.prepare(request)
+        await response.write(body[: len(body) // 2])
+        if request.transport is not None:
+            request.transport.close()
+        return response
+
+    async def _handle_parameters(self, request: web.Request) -> web.StreamResponse:
+        if (error := await self._async_inject(request)) is not None:
+            return error
+        self._drift()
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        if self._wants_binary(request):
+            values = [param["value"] for param in self.params.values()]
+            return await self._async_send(
+                request, {"timestamp": timestamp, "schema": self.schema_id, "values": values}, binary=True
+            )
+        return await self._async_send(request, {"timestamp": timestamp, "parameters": self.params})
+
+    async def _handle_read(self, request: web.Request) -> web.StreamResponse:
+        if (error := await self._async_inject(request)) is not None:
+            return error
+        name = request.match_info["name"]
+        if (param := self._by_name.get(name)) is None:
+            return web.json_response({"error": f"Unknown parameter {name}"}, status=404)
+        self._drift()
+        return await self._async_send(request, param)
+
+    async def _handle_write(self, request: web.Request) -> web.StreamResponse:
+        if (error := await self._async_inject(request)) is not None:
+            return error
+        name = request.match_info["name"]
+        param = self._by_name.get(name)
+        if param is None:
+            return web.json_response({"error": f"Unknown parameter {name}"}, status=404)
+        try:
+            value = (await request.json())["value"]
+        except (ValueError, KeyError, TypeError):
+            return web.json_response({"error": 'Expected {"value": ...}'}, status=400)
+        low, high = param.get("min"), param.get("max")
+        if (
+            isinstance(value, int | float)
+            and low is not None
+            and high is not None
+            and low < high
+            and not low <= value <= high
+        ):
+            return web.json_response({"error": f"{value} outside {low}..{high}"}, status=400)
+
+        param["value"] = value
+        self.writes.append((name, value))
+        self._publish({str(param["index"]): value})
+        return await self._async_send(request, {"name": name, "value": value, "success": True})
+
+    async def _handle_alarms(self, request: web.Request) -> web.StreamResponse:
+        if (error := await self._async_inject(request)) is not None:
+            return error
+        return await self._async_send(request, {"alarms": self.alarms})
+
+    async def _handle_schema(self, request: web.Request) -> web.StreamResponse:
+        if (error := await self._async_inject(request)) is not None:
+            return error
+        if not self._wants_binary(request):
+            return web.json_response({"error": "Not found"}, status=404)
+        parameters = [{field: param.get(field) for field in SCHEMA_FIELDS} for param in self.params.values()]
+        return await self._async_send(request, {"schema": self.schema_id, "parameters": parameters}, binary=True)
+
+    async def _handle_stream(self, request: web.Request) -> web.StreamResponse:
+        if (error := await self._async_inject(request)) is not None:
+            return error
+        if not self.stream:
+            return web.json_response({"error": "Not found"}, status=404)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._streams[ws] = queue
+        sender = asyncio.create_task(self._async_push(ws, queue))
+        try:
+            # Subscribers send nothing; this returns once either side closes
+            async for _message in ws:
+                pass
+        finally:
+            del self._streams[ws]
+            sender.cancel()
+        return ws
+
+    async def _async_push(self, ws: web.WebSocketResponse, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        """Send queued changes to a subscriber, drifting telemetry while none are queued."""
+        while True:
+            try:
+                async with asyncio.timeout(self.drift_interval):
+                    changes = await queue.get()
+            except TimeoutError:
+                self._drift()
+                continue
+            try:
+                await ws.send_json(
+                    {"type": "changes", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "values": changes}
+                )
+            except ConnectionResetError:
+                return
+
+
+def main() -> None:
+    """Serve the stand-in gateway until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--fixture", type=Path, default=FIXTURE, help="Parameters fixture to serve")
+    parser.add_argument("--drift-interval", type=float, default=10.0, help="Seconds between telemetry drift steps")
+    parser.add_argument("--compress", action="store_true", help="Serve gzip/deflate encoded responses")
+    parser.add_argument("--binary", action="store_true", help="Serve MessagePack polls (needs msgpack)")
+    parser.add_argument("--stream", action="store_true", help="Push changes over the WebSocket stream")
+    parser.add_argument("--seed", type=int)
+    for field in fields(GatewayFaults):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=type(field.default), default=field.default)
+    args = parser.parse_args()
+
+    gateway = FakeGateway(
+        load_gateway_params(args.fixture),
+        faults=GatewayFaults(**{field.name: getattr(args, field.name) for field in fields(GatewayFaults)}),
+        drift_interval=args.drift_interval,
+        compress=args.compress,
+        binary=args.binary,
+        stream=args.stream,
+        seed=args.seed,
+    )
+    web.run_app(gateway.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 """Tests for the econext API client."""
 
+import gzip
+import json
 from unittest.mock import AsyncMock, MagicMock
+import zlib
 
 import aiohttp
 import pytest
@@ -9,7 +12,9 @@ from custom_components.econext.api import (
     EconextApiError,
     EconextConnectionError,
     EconextApi,
+    decompress_body,
 )
+from custom_components.econext.wire import MSGPACK_CONTENT_TYPE, binary_supported
 
 
 class TestEconextApi:
@@ -50,7 +55,8 @@ class TestFetchAllParams:
         """Test successful fetch of all parameters."""
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=gateway_api_response)
+        mock_response.headers = {}
+        mock_response.read = AsyncMock(return_value=json.dumps(gateway_api_response).encode())
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -97,7 +103,8 @@ class TestFetchAllParams:
 
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=gateway_response)
+        mock_response.headers = {}
+        mock_response.read = AsyncMock(return_value=json.dumps(gateway_response).encode())
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -114,6 +121,11 @@ class TestFetchAllParams:
         assert param["maxv"] == 200.0
         assert param["writable"] is True
 
+        # Fetch timings and size are kept for the poll metrics
+        assert api.last_fetch is not None
+        assert api.last_fetch.bytes_received == len(json.dumps(gateway_response).encode())
+        assert api.last_fetch.latency_ms >= 0
+
     @pytest.mark.asyncio
     async def test_fetch_all_params_api_error(self, mock_session: MagicMock) -> None:
         """Test API error handling for non-200 status."""
@@ -139,6 +151,81 @@ class TestFetchAllParams:
         with pytest.raises(EconextConnectionError, match="Connection error"):
             await api.async_fetch_all_params()
 
+    @pytest.mark.asyncio
+    async def test_fetch_all_params_invalid_json(self, mock_session: MagicMock) -> None:
+        """Test a truncated or malformed body raises an API error."""
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+        mock_response.read = AsyncMock(return_value=b'{"parameters": {"0": ')
+        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_response.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session.get = MagicMock(return_value=mock_response)
+
+        api = EconextApi(host="192.168.1.100", port=8000, session=mock_session)
+
+        with pytest.raises(EconextApiError, match="Invalid JSON"):
+            await api.async_fetch_all_params()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("content_type", "body"),
+        [
+            ("application/json", b"[1, 2]"),
+            ("application/json", b'"parameters"'),
+            pytest.param(
+                MSGPACK_CONTENT_TYPE,
+                b"\x92\x01\x02",
+                marks=pytest.mark.skipif(not binary_supported(), reason="msgpack not installed"),
+            ),
+            pytest.param(
+                MSGPACK_CONTENT_TYPE,
+                b"\x2a",
+                marks=pytest.mark.skipif(not binary_supported(), reason="msgpack not installed"),
+            ),
+        ],
+    )
+    async def test_fetch_all_params_not_a_map(self, mock_session: MagicMock, content_type: str, body: bytes) -> None:
+        """Test a well-formed body that is not a map raises an API error."""
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {"Content-Type": content_type}
+        mock_response.read = AsyncMock(return_value=body)
+        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_response.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session.get = MagicMock(return_value=mock_response)
+
+        api = EconextApi(host="192.168.1.100", port=8000, session=mock_session)
+
+        with pytest.raises(EconextApiError, match="Expected an? (map|object) from gateway"):
+            await api.async_fetch_all_params()
+
+
+class TestDecompressBody:
+    """Test decompressing response bodies."""
+
+    def test_encodings(self) -> None:
+        """Test gzip, zlib-wrapped and raw deflate and identity bodies decode to the same bytes."""
+        body = b'{"parameters": {}}' * 10
+        raw = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+        assert decompress_body(gzip.compress(body), "gzip") == body
+        assert decompress_body(zlib.compress(body), "deflate") == body
+        assert decompress_body(raw.compress(body) + raw.flush(), "deflate") == body
+        assert decompress_body(body, "identity") == body
+
+    def test_corrupt_body(self) -> None:
+        """Test a corrupt body raises an API error."""
+        with pytest.raises(EconextApiError, match="Invalid gzip body"):
+            decompress_body(b"not gzip", "gzip")
+
+    def test_unsupported_encoding(self) -> None:
+        """Test an encoding that was not offered raises an API error."""
+        with pytest.raises(EconextApiError, match="Unsupported content encoding"):
+            decompress_body(b"", "compress")
+
 
 class TestSetParam:
     """Test the async_set_param method."""
@@ -192,7 +279,8 @@ class TestTestConnection:
         """Test that test_connection returns device info."""
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=gateway_api_response)
+        mock_response.headers = {}
+        mock_response.read = AsyncMock(return_value=json.dumps(gateway_api_response).encode())
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -208,3 +296,27 @@ class TestTestConnection:
         assert result["uid"] == "2L7SDPN6KQ38CIH2401K01U"
         assert result["name"] == "ecoMAX360i"
         assert result["param_count"] > 0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_full_fetch(self, mock_session: MagicMock, gateway_api_response: dict) -> None:
+        """Test a gateway that cannot read single parameters is validated with a full fetch."""
+
+        def _response(url: str, **_kwargs: object) -> AsyncMock:
+            response = AsyncMock()
+            response.status = 200 if url.endswith("/api/parameters") else 404
+            response.headers = {}
+            response.read = AsyncMock(return_value=json.dumps(gateway_api_response).encode())
+            response.__aenter__ = AsyncMock(return_value=response)
+            response.__aexit__ = AsyncMock(return_value=None)
+            return response
+
+        mock_session.get = MagicMock(side_effect=_response)
+        api = EconextApi(host="192.168.1.100", port=8000, session=mock_session)
+
+        result = await api.async_test_connection()
+
+        assert result["uid"] == "2L7SDPN6KQ38CIH2401K01U"
+        assert result["param_count"] > 0
+        # Both single reads were refused, then one full fetch
+        assert mock_session.get.call_count == 3
+        assert not api._single_reads
@@ -0,0 +1,143 @@
+"""Tests for the benchmark runner."""
+
+import json
+from typing import ClassVar
+
+import pytest
+
+from benchmarks.compare import check, compare, regressions
+from benchmarks.common import gateway_payload, load_params, seven_circuit_params
+from benchmarks.run import report, run
+from benchmarks.synthetic import FIXED_PARAMS, generate_controller, schedule_param_ids, snapshot_sequence
+from custom_components.econext.climate import CIRCUITS
+
+
+class TestFixtures:
+    """Test the benchmark data."""
+
+    def test_seven_circuits_active(self) -> None:
+        """Test every circuit is active and named in the seven-circuit data."""
+        params = seven_circuit_params()
+
+        for number, circuit in CIRCUITS.items():
+            assert params[circuit.active_param]["value"] > 0
+            assert params[circuit.schedule_sunday_am]["value"] == params[CIRCUITS[2].schedule_sunday_am]["value"]
+            if number != 2:
+                assert params[circuit.name_param]["value"] == f"Circuit {number}"
+
+    def test_fixture_untouched(self) -> None:
+        """Test building the seven-circuit data leaves the fixture as is."""
+        seven_circuit_params()
+
+        assert load_params()[CIRCUITS[1].active_param]["value"] == 0
+
+    def test_gateway_payload(self) -> None:
+        """Test the payload uses the gateway field names."""
+        payload = json.loads(gateway_payload(load_params()))
+
+        param = payload["parameters"]["10"]
+        assert param["index"] == 10
+        assert param["value"] == "2L7SDPN6KQ38CIH2401K01U"
+        assert {"min", "max", "writable"} <= set(param)
+
+
+class TestSynthetic:
+    """Test the synthetic controller generator."""
+
+    def test_generate_controller(self) -> None:
+        """Test the controller has the requested size, every circuit and varied schedules."""
+        params = generate_controller(5000)
+
+        assert len(params) == 5000
+        assert all(params[circuit.active_param]["value"] > 0 for circuit in CIRCUITS.values())
+        assert {"61", "1133"} <= set(params)
+        words = [params[param_id]["value"] for param_id in schedule_param_ids() if param_id in params]
+        assert len(set(words)) > len(words) // 2
+
+    def test_generate_too_small(self) -> None:
+        """Test a count below a full controller is rejected."""
+        with pytest.raises(ValueError, match="cannot generate 100"):
+            generate_controller(100)
+
+    def test_deterministic(self) -> None:
+        """Test the same seed generates the same controller and snapshots."""
+        first = generate_controller(3000, seed=7)
+        second = generate_controller(3000, seed=7)
+
+        assert first == second
+        assert list(snapshot_sequence(first, 3, 0.1, seed=7)) == list(snapshot_sequence(second, 3, 0.1, seed=7))
+
+    def test_change_rate(self) -> None:
+        """Test each snapshot changes the requested share of parameters and never the fixed ones."""
+        params = generate_controller(4000)
+
+        previous = params
+        for snapshot in snapshot_sequence(params, 3, 0.05):
+            changed = {key for key, param in snapshot.items() if param["value"] != previous[key]["value"]}
+            assert len(changed) == 200
+            assert not changed & FIXED_PARAMS
+            previous = snapshot
+        assert params == generate_controller(4000)
+
+
+class TestRunner:
+    """Test running the benchmarks."""
+
+    def test_run_selected(self) -> None:
+        """Test a filtered run reports timings and memory for the matching benchmarks only."""
+        results = run(rounds=1, selected="setup_climate")
+
+        assert list(results) == ["setup_climate"]
+        result = report(results)["benchmarks"]["setup_climate"]
+        assert result["min_us"] > 0
+        assert result["min_us"] <= result["median_us"]
+        assert result["peak_kib"] >= 0
+        assert result["rounds"] == 1
+
+
+class TestCompare:
+    """Test comparing results against a baseline."""
+
+    BASELINE: ClassVar[dict[str, dict[str, float]]] = {
+        "api_parse": {"min_us": 1000.0, "peak_kib": 1000.0},
+        "decode_schedule_bitfield": {"min_us": 40.0, "peak_kib": 0.3},
+        "removed": {"min_us": 10.0, "peak_kib": 1.0},
+    }
+
+    def test_regression_beyond_tolerance(self) -> None:
+        """Test only growth beyond the tolerance counts as a regression."""
+        current = {
+            "api_parse": {"min_us": 1300.0, "peak_kib": 1100.0},
+            "decode_schedule_bitfield": {"min_us": 10.0, "peak_kib": 0.3},
+        }
+
+        failed = regressions(compare(self.BASELINE, current, tolerance=0.25))
+
+        assert [(delta.benchmark, delta.metric) for delta in failed] == [("api_parse", "min_us")]
+        assert failed[0].ratio == 1.3
+
+    def test_new_and_missing_benchmarks(self) -> None:
+        """Test benchmarks on one side only are reported but never fail."""
+        current = {"added": {"min_us": 5.0, "peak_kib": 1.0}}
+
+        statuses = {(delta.benchmark, delta.status) for delta in compare(self.BASELINE, current)}
+
+        assert ("added", "new") in statuses
+        assert ("removed", "missing") in statuses
+        assert not regressions(compare(self.BASELINE, current))
+
+    def test_small_peak_memory_ignored(self) -> None:
+        """Test peak memory growth below the noise floor is not judged."""
+        current = {"decode_schedule_bitfield": {"min_us": 40.0, "peak_kib": 3.0}}
+
+        assert not regressions(compare(self.BASELINE, current))
+
+    def test_check_prints_table(self, capsys) -> None:
+        """Test check prints the delta table and reports the verdict."""
+        current = {"api_parse": {"min_us": 2000.0, "peak_kib": 1000.0}}
+
+        assert check(self.BASELINE, current, tolerance=0.5) is False
+        output = capsys.readouterr().out
+        assert "+100.0%" in output
+        assert "1 metric(s) regressed by more than 50%" in output
+        assert check(self.BASELINE, current, tolerance=1.5) is True
@@ -1,10 +1,21 @@
 """Tests for the binary_sensor platform."""
 
-from unittest.mock import MagicMock, patch
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 import pytest
-
-from custom_components.econext.binary_sensor import EconextAlarmActiveBinarySensor
+import voluptuous as vol
+
+from custom_components.econext.binary_sensor import (
+    SET_SCHEDULE_SCHEMA,
+    _async_set_schedule,
+    EconextAlarmActiveBinarySensor,
+    EconextScheduleBinarySensor,
+    async_setup_entry,
+)
+from custom_components.econext.climate import CIRCUITS
+from custom_components.econext.const import DHW_SCHEDULE, SCHEDULE_DAYS, EconextScheduleEntityDescription
 from custom_components.econext.coordinator import EconextCoordinator
 
 
@@ -120,3 +131,162 @@ class TestAlarmActiveBinarySensor:
         sensor = EconextAlarmActiveBinarySensor(coordinator)
 
         assert sensor._is_value_valid() is True
+
+
+class TestScheduleBinarySensor:
+    """Test the unified weekly schedule entity."""
+
+    @pytest.fixture
+    def dhw_schedule(self, coordinator: EconextCoordinator) -> EconextScheduleBinarySensor:
+        """Create the DHW schedule entity."""
+        return EconextScheduleBinarySensor(coordinator, DHW_SCHEDULE)
+
+    def test_unique_id_and_device(self, coordinator: EconextCoordinator, dhw_schedule) -> None:
+        """Test schedule entity belongs to the DHW device."""
+        uid = coordinator.get_device_uid()
+        assert dhw_schedule.unique_id == f"{uid}_dhw_hdw_schedule"
+        assert dhw_schedule.device_info["name"] == "DHW"
+
+    def test_slots_combine_am_and_pm(self, coordinator: EconextCoordinator, dhw_schedule) -> None:
+        """Test each day mask holds AM in the low 24 bits and PM in the high 24 bits."""
+        coordinator.data["120"]["value"] = 1792  # Sunday AM 04:00-05:30
+        coordinator.data["121"]["value"] = 64512  # Sunday PM 17:00-20:00
+
+        slots = dhw_schedule.slots
+
+        assert len(slots) == 7
+        assert slots[0] == 1792 | (64512 << 24)
+
+    def test_slots_missing_param(self, coordinator: EconextCoordinator, dhw_schedule) -> None:
+        """Test schedule is unavailable when a word is missing."""
+        del coordinator.data["133"]
+
+        assert dhw_schedule.slots is None
+        assert dhw_schedule._is_value_valid() is False
+
+    def test_is_on_follows_current_slot(self, coordinator: EconextCoordinator, dhw_schedule) -> None:
+        """Test state reflects the half-hour slot of the current time."""
+        coordinator.data["124"]["value"] = 1 << 9  # Tuesday 04:30-05:00
+        tuesday = datetime(2026, 2, 3, 4, 45)
+
+        with patch("custom_components.econext.binary_sensor.dt_util.now", return_value=tuesday):
+            assert dhw_schedule.is_on is True
+
+        with patch(
+            "custom_components.econext.binary_sensor.dt_util.now",
+            return_value=tuesday.replace(hour=5),
+        ):
+            assert dhw_schedule.is_on is False
+
+    def test_slots_attribute_not_recorded(self, dhw_schedule) -> None:
+        """Test the slot grid is excluded from the recorder."""
+        assert "slots" in dhw_schedule.extra_state_attributes
+        assert "slots" in dhw_schedule._unrecorded_attributes
+
+    def test_state_written_only_on_change(self, dhw_schedule) -> None:
+        """Test unchanged polls do not write state."""
+        dhw_schedule.async_write_ha_state = MagicMock()
+
+        dhw_schedule._handle_coordinator_update()
+        dhw_schedule._handle_coordinator_update()
+
+        dhw_schedule.async_write_ha_state.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_set_schedule_writes_changed_words(self, coordinator: EconextCoordinator, dhw_schedule) -> None:
+        """Test writing a week sends only the words that changed in one batch."""
+        coordinator.async_set_params = AsyncMock(return_value=True)
+        slots = dhw_schedule.slots
+        slots[1] = 0xFFFFFF | (0x3 << 24)  # Monday: whole morning + 12:00-13:00
+
+        await dhw_schedule.async_set_schedule(slots)
+
+        coordinator.async_set_params.assert_called_once()
+        values = coordinator.async_set_params.call_args[0][0]
+        assert values["122"] == 0xFFFFFF
+        assert values["123"] == 0x3
+        assert len(values) == 14
+
+    @pytest.mark.asyncio
+    async def test_set_schedule_days_keeps_other_days(self, coordinator: EconextCoordinator, dhw_schedule) -> None:
+        """Test replacing one day by periods leaves the rest of the week as is."""
+        coordinator.async_set_params = AsyncMock(return_value=True)
+        slots = dhw_schedule.slots
+
+        data = SET_SCHEDULE_SCHEMA({"entity_id": "binary_sensor.x", "days": {"monday": ["06:00-08:30", "12:00-13:00"]}})
+        await dhw_schedule.async_set_schedule(days=data["days"])
+
+        values = coordinator.async_set_params.call_args[0][0]
+        assert values["122"] == 0b11111 << 12
+        assert values["123"] == 0x3
+        assert values["120"] == slots[0] & 0xFFFFFF
+        assert values["121"] == slots[0] >> 24
+
+    @pytest.mark.asyncio
+    async def test_set_schedule_days_needs_current_week(self, coordinator: EconextCoordinator, dhw_schedule) -> None:
+        """Test replacing some days of a week that is not known yet fails instead of clearing the rest."""
+        coordinator.async_set_params = AsyncMock(return_value=True)
+        del coordinator.data["122"]
+        assert dhw_schedule.slots is None
+
+        with pytest.raises(HomeAssistantError):
+            await dhw_schedule.async_set_schedule(days={"monday": 0xFFFFFF})
+        coordinator.async_set_params.assert_not_called()
+
+        await dhw_schedule.async_set_schedule(days=dict.fromkeys(SCHEDULE_DAYS, 0xFFFFFF))
+
+        values = coordinator.async_set_params.call_args[0][0]
+        assert values["120"] == values["122"] == 0xFFFFFF
+        assert values["121"] == values["123"] == 0
+
+    @pytest.mark.asyncio
+    async def test_set_schedule_service_only_for_schedules(self, coordinator: EconextCoordinator, dhw_schedule) -> None:
+        """Test the service writes schedules and turns away other binary sensors."""
+        dhw_schedule.async_set_schedule = AsyncMock()
+        alarm = EconextAlarmActiveBinarySensor(coordinator)
+        alarm.entity_id = "binary_sensor.alarm_active"
+        call = MagicMock(data={"entity_id": ["binary_sensor.x"], "slots": [0] * 7})
+
+        await _async_set_schedule(dhw_schedule, call)
+        with pytest.raises(ServiceValidationError):
+            await _async_set_schedule(alarm, call)
+
+        dhw_schedule.async_set_schedule.assert_called_once_with(slots=[0] * 7, days=None)
+
+    def test_set_schedule_schema_rejects_bad_input(self) -> None:
+        """Test the service schema needs slots or days and validates periods."""
+        with pytest.raises(vol.Invalid):
+            SET_SCHEDULE_SCHEMA({"entity_id": "binary_sensor.x"})
+        with pytest.raises(vol.Invalid):
+            SET_SCHEDULE_SCHEMA({"entity_id": "binary_sensor.x", "days": {"monday": ["06:15-08:00"]}})
+        with pytest.raises(vol.Invalid):
+            SET_SCHEDULE_SCHEMA({"entity_id": "binary_sensor.x", "days": {"funday": []}})
+
+    @pytest.mark.asyncio
+    async def test_setup_entry_creates_schedules(self, coordinator: EconextCoordinator) -> None:
+        """Test setup creates DHW, heat pump, silent mode and active circuit schedules."""
+        hass = MagicMock()
+        entry = MagicMock()
+        entry.entry_id = "test_entry"
+        hass.data = {"econext": {"test_entry": {"coordinator": coordinator}}}
+        entities = []
+
+        with patch("custom_components.econext.binary_sensor.entity_platform.async_get_current_platform"):
+            await async_setup_entry(hass, entry, entities.extend)
+
+        schedules = [e for e in entities if isinstance(e, EconextScheduleBinarySensor)]
+        keys = {(e._description.key, e._device_id) for e in schedules}
+        assert keys == {
+            ("hdw_schedule", "dhw"),
+            ("heatpump_schedule", "heatpump"),
+            ("silent_mode_schedule", "heatpump"),
+            ("schedule", "circuit_2"),
+        }
+
+    def test_circuit_schedule_params(self, coordinator: EconextCoordinator) -> None:
+        """Test circuit schedule uses the circuit's AM/PM params."""
+        description = EconextScheduleEntityDescription(key="schedule", param_ids=CIRCUITS[2].schedule_param_ids)
+        entity = EconextScheduleBinarySensor(coordinator, description, device_id="circuit_2")
+
+        assert description.param_ids[0] == ("297", "298")
+        assert entity.slots[0] == 16776704 | (int(coordinator.data["298"]["value"]) << 24)
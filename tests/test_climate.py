@@ -12,7 +12,13 @@ from homeassistant.components.climate.const import PRESET_COMFORT, PRESET_ECO
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 
-from custom_components.econext.climate import CIRCUITS, CircuitClimate, CircuitWorkState, async_setup_entry
+from custom_components.econext.climate import (
+    CIRCUITS,
+    PRESET_SCHEDULE,
+    CircuitClimate,
+    CircuitWorkState,
+    async_setup_entry,
+)
 from custom_components.econext.coordinator import EconextCoordinator
 
 
@@ -715,6 +721,58 @@ class TestCircuitClimate:
         # Should set COMFORT temp (param 288)
         coordinator.async_set_param.assert_called_once_with("288", 23.0)
 
+    def test_preset_follows_tracked_schedule(self, coordinator: EconextCoordinator) -> None:
+        """Test the tracked schedule decides the active preset over the setpoint."""
+        coordinator.data["286"]["value"] = CircuitWorkState.AUTO
+        coordinator.data["92"]["value"] = coordinator.data["288"]["value"]  # Setpoint matches comfort
+
+        circuit = CIRCUITS[2]
+        entity = CircuitClimate(
+            coordinator,
+            circuit_num=2,
+            name_param=circuit.name_param,
+            work_state_param=circuit.work_state_param,
+            settings_param=circuit.settings_param,
+            thermostat_param=circuit.thermostat_param,
+            comfort_param=circuit.comfort_param,
+            eco_param=circuit.eco_param,
+            room_temp_setpoint_param=circuit.room_temp_setpoint_param,
+            schedule_param_ids=circuit.schedule_param_ids,
+        )
+        entity._schedule_tracker = MagicMock(active=False)
+
+        assert entity.preset_mode == PRESET_SCHEDULE
+        assert entity._last_preset == PRESET_ECO
+        assert entity.target_temperature == coordinator.data["289"]["value"]
+
+    @pytest.mark.asyncio
+    async def test_follows_shared_schedule_tracker(self, coordinator: EconextCoordinator) -> None:
+        """Test the entity subscribes to the coordinator's tracker of the circuit schedule."""
+        circuit = CIRCUITS[2]
+        entity = CircuitClimate(
+            coordinator,
+            circuit_num=2,
+            name_param=circuit.name_param,
+            work_state_param=circuit.work_state_param,
+            settings_param=circuit.settings_param,
+            thermostat_param=circuit.thermostat_param,
+            comfort_param=circuit.comfort_param,
+            eco_param=circuit.eco_param,
+            room_temp_setpoint_param=circuit.room_temp_setpoint_param,
+            schedule_param_ids=circuit.schedule_param_ids,
+        )
+
+        with (
+            patch("homeassistant.helpers.update_coordinator.CoordinatorEntity.async_added_to_hass"),
+            patch("custom_components.econext.schedule.async_track_point_in_time"),
+        ):
+            await entity.async_added_to_hass()
+            tracker, unsubscribe = coordinator.async_track_schedule(circuit.schedule_param_ids, MagicMock())
+
+        assert entity._schedule_tracker is tracker
+        assert tracker.active is not None
+        unsubscribe()
+
     def test_unique_id(self, circuit_2_entity: CircuitClimate) -> None:
         """Test climate entity unique_id generation."""
         # UID from fixture is "2L7SDPN6KQ38CIH2401K01U", device_id is "circuit_2", work_state_param is "286"
@@ -0,0 +1,93 @@
+"""Tests for the gateway connection breaker."""
+
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.econext.connection import ConnectionBreaker, ConnectionState
+from custom_components.econext.const import UPDATE_INTERVAL
+
+
+class Clock:
+    """A settable stand-in for time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    """Patch the breaker's clock."""
+    clock = Clock()
+    with patch("custom_components.econext.connection.time.monotonic", clock):
+        yield clock
+
+
+def test_backoff_grows_with_jitter(clock: Clock) -> None:
+    """Test retry delays double per failure, stay within jitter bounds and cap at the maximum."""
+    breaker = ConnectionBreaker(base_delay=10, max_delay=60, failure_threshold=10, seed=1)
+
+    delays = [breaker.record_failure() for _ in range(5)]
+
+    assert breaker.state is ConnectionState.BACKOFF
+    for delay, full in zip(delays, (20, 40, 60, 60, 60), strict=True):
+        assert full * 3 / 4 <= delay <= full
+    assert breaker.allow_request()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_first_retry_after_poll_interval(clock: Clock, seed: int) -> None:
+    """Test the first retry waits longer than a regular poll would."""
+    breaker = ConnectionBreaker(seed=seed)
+
+    assert breaker.record_failure() > UPDATE_INTERVAL
+
+
+def test_opens_after_threshold(clock: Clock) -> None:
+    """Test the breaker opens, rejects requests until the open period passed and then wants a probe."""
+    breaker = ConnectionBreaker(failure_threshold=3, open_seconds=300, seed=1)
+    for _ in range(2):
+        breaker.record_failure()
+    assert not breaker.needs_probe
+
+    delay = breaker.record_failure()
+
+    assert breaker.state is ConnectionState.OPEN
+    assert 225 <= delay <= 300
+    assert not breaker.allow_request()
+    assert breaker.rejected == 1
+
+    clock.now += delay
+    assert breaker.allow_request()
+    assert breaker.needs_probe
+
+
+def test_success_closes(clock: Clock) -> None:
+    """Test a success resets the failure count and closes the breaker."""
+    breaker = ConnectionBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    breaker.record_success()
+
+    assert breaker.state is ConnectionState.CONNECTED
+    assert breaker.failures == 0
+    assert breaker.transitions == 3
+
+
+def test_time_in_state(clock: Clock) -> None:
+    """Test the time spent in each state is accumulated across transitions."""
+    breaker = ConnectionBreaker(failure_threshold=2)
+    clock.now += 60
+    breaker.record_failure()
+    clock.now += 20
+    breaker.record_failure()
+    clock.now += 300
+    breaker.record_success()
+    clock.now += 5
+
+    assert breaker.time_in_state() == {"connected": 65.0, "backoff": 20.0, "open": 300.0}
+    assert breaker.as_dict()["state"] == "connected"
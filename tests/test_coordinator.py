@@ -1,12 +1,29 @@
 """Tests for the econext data coordinator."""
 
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import UpdateFailed
-
-from custom_components.econext.api import EconextApiError, EconextApi
+from homeassistant.util import dt as dt_util
+
+from custom_components.econext.api import (
+    EconextApiError,
+    EconextApi,
+    EconextConnectionError,
+    EconextUnsupportedError,
+)
+from custom_components.econext.climate import CIRCUITS
+from custom_components.econext.connection import ConnectionState
+from custom_components.econext.const import SHED_MAX_DEFER_SECONDS
 from custom_components.econext.coordinator import EconextCoordinator
+from custom_components.econext.loop_lag import LoopLagMonitor
+from custom_components.econext.metrics import FetchStats
+
+from .fake_gateway import FakeGateway
 
 
 @pytest.fixture
@@ -72,6 +89,463 @@ class TestAsyncUpdateData:
             await coordinator._async_update_data()
 
 
+class TestConnectionBackoff:
+    """Test polls back off and stop while the gateway is unreachable."""
+
+    @pytest.mark.asyncio
+    async def test_failures_back_off_then_open(self, mock_hass: MagicMock, mock_api: MagicMock) -> None:
+        """Test failed polls stretch the interval and open the breaker, which then skips the network."""
+        mock_api.async_fetch_all_params = AsyncMock(side_effect=EconextConnectionError("timeout"))
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+        threshold = coordinator.connection.failure_threshold
+
+        for _ in range(threshold):
+            with pytest.raises(UpdateFailed, match="Error fetching data"):
+                await coordinator._async_update_data()
+
+        assert coordinator.connection.state is ConnectionState.OPEN
+        assert coordinator.update_interval.total_seconds() > 10
+
+        with pytest.raises(UpdateFailed, match="Gateway unreachable"):
+            await coordinator._async_update_data()
+        assert mock_api.async_fetch_all_params.await_count == threshold
+        assert coordinator.connection.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_probe_before_resuming(
+        self,
+        mock_hass: MagicMock,
+        mock_api: MagicMock,
+        all_params_parsed: dict,
+    ) -> None:
+        """Test an open breaker probes first and a failed probe skips the full poll."""
+        mock_api.async_fetch_all_params = AsyncMock(return_value=all_params_parsed)
+        mock_api.async_fetch_alarms = AsyncMock(return_value=[])
+        mock_api.async_probe = AsyncMock(side_effect=[EconextConnectionError("refused"), None])
+        mock_api.last_fetch = None
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+        coordinator.connection.failures = coordinator.connection.failure_threshold - 1
+        coordinator.connection.record_failure()
+
+        with (
+            patch.object(coordinator.connection, "allow_request", return_value=True),
+            pytest.raises(UpdateFailed, match="still unreachable"),
+        ):
+            await coordinator._async_update_data()
+        mock_api.async_fetch_all_params.assert_not_awaited()
+
+        with patch.object(coordinator.connection, "allow_request", return_value=True):
+            assert await coordinator._async_update_data() == all_params_parsed
+
+        assert coordinator.connection.state is ConnectionState.CONNECTED
+        assert coordinator.connection.probes == 2
+        assert coordinator.update_interval.total_seconds() == 10
+        assert coordinator.metrics.errors == {"probe": 1}
+
+
+class TestStaleGrace:
+    """Test entities keep the last data through a few failed polls."""
+
+    @pytest.fixture
+    def coordinator(self, mock_hass: MagicMock, mock_api: MagicMock, all_params_parsed: dict) -> EconextCoordinator:
+        """Create a coordinator with fresh data and a listener."""
+        mock_hass.loop = MagicMock()  # Adding the first listener schedules a refresh
+        coordinator = EconextCoordinator(mock_hass, mock_api, stale_failures=3, max_staleness=120)
+        coordinator.data = all_params_parsed
+        coordinator.last_data_update = dt_util.utcnow()
+        coordinator.listener = MagicMock()
+        coordinator.async_add_listener(coordinator.listener)
+        return coordinator
+
+    @staticmethod
+    def _fail(coordinator: EconextCoordinator) -> None:
+        """Finish a refresh the way DataUpdateCoordinator does after a failed poll."""
+        previous = coordinator.last_update_success
+        coordinator.connection.record_failure()
+        coordinator.last_update_success = False
+        coordinator._async_refresh_finished()
+        if previous:
+            coordinator.async_update_listeners()
+
+    def test_failures_within_grace(self, coordinator: EconextCoordinator) -> None:
+        """Test failed polls leave entities untouched until the failure limit is reached."""
+        with patch("custom_components.econext.coordinator.async_call_later") as call_later:
+            self._fail(coordinator)
+            self._fail(coordinator)
+
+            assert coordinator.data_available
+            coordinator.listener.assert_not_called()
+            call_later.assert_called_once()
+            assert 119 <= call_later.call_args[0][1] <= 120
+
+            self._fail(coordinator)
+
+        assert not coordinator.data_available
+        coordinator.listener.assert_called_once()
+
+    def test_pushed_change_after_failed_poll(self, coordinator: EconextCoordinator) -> None:
+        """Test a pushed change reaches listeners while the last resync poll failed."""
+        coordinator.streaming = True
+        with patch("custom_components.econext.coordinator.async_call_later"):
+            self._fail(coordinator)
+        coordinator.listener.assert_not_called()
+
+        coordinator.async_apply_changes({"61": 50.0})
+
+        coordinator.listener.assert_called_once()
+        assert coordinator.data_available
+        assert coordinator.data["61"]["value"] == 50.0
+
+    def test_max_staleness(self, coordinator: EconextCoordinator) -> None:
+        """Test the grace period ends once the data is too old, even without another poll."""
+        with patch("custom_components.econext.coordinator.async_call_later") as call_later:
+            self._fail(coordinator)
+        stale_timeout = call_later.call_args[0][2]
+
+        coordinator.last_data_update -= timedelta(seconds=121)
+        stale_timeout(dt_util.utcnow())
+
+        assert not coordinator.data_available
+        coordinator.listener.assert_called_once()
+
+    def test_success_cancels_grace(self, coordinator: EconextCoordinator) -> None:
+        """Test a successful poll cancels the staleness timer."""
+        with patch("custom_components.econext.coordinator.async_call_later") as call_later:
+            self._fail(coordinator)
+
+        coordinator.last_update_success = True
+        coordinator._async_refresh_finished()
+
+        call_later.return_value.assert_called_once()
+        assert coordinator.data_available
+
+    def test_grace_disabled(self, mock_hass: MagicMock, mock_api: MagicMock, all_params_parsed: dict) -> None:
+        """Test a failure limit of 1 makes entities unavailable on the first failure."""
+        coordinator = EconextCoordinator(mock_hass, mock_api, stale_failures=1)
+        coordinator.data = all_params_parsed
+        coordinator.last_data_update = dt_util.utcnow()
+
+        coordinator.connection.record_failure()
+        coordinator.last_update_success = False
+
+        assert not coordinator.data_available
+
+
+class TestPushUpdates:
+    """Test the coordinator follows the gateway's change stream."""
+
+    @pytest.fixture
+    def coordinator(self, mock_hass: MagicMock, mock_api: MagicMock, all_params_parsed: dict) -> EconextCoordinator:
+        """Create a push-enabled coordinator with data and a stubbed resync poll."""
+        coordinator = EconextCoordinator(mock_hass, mock_api, push_updates=True)
+        coordinator.data = all_params_parsed
+        coordinator.async_request_refresh = AsyncMock()
+        return coordinator
+
+    @staticmethod
+    async def _until(condition: Callable[[], bool]) -> None:
+        """Wait up to a second for a condition to hold."""
+        async with asyncio.timeout(1):
+            while not condition():
+                await asyncio.sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_changes_applied_then_fallback(self, coordinator: EconextCoordinator, mock_api: MagicMock) -> None:
+        """Test pushed values update the data, and a dropped stream returns to polling."""
+        intervals: list[float] = []
+
+        async def _stream() -> AsyncIterator[dict]:
+            yield {}
+            intervals.append(coordinator.update_interval.total_seconds())
+            yield {"61": 50.0, "103": coordinator.data["103"]["value"]}
+            raise EconextConnectionError("reset")
+
+        mock_api.async_stream_changes = _stream
+        with (
+            patch("custom_components.econext.coordinator.asyncio.sleep", AsyncMock(side_effect=asyncio.CancelledError)),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await coordinator._async_run_stream()
+
+        assert intervals == [300]
+        assert coordinator.data["61"]["value"] == 50.0
+        assert coordinator.last_data_update is not None
+        assert not coordinator.streaming
+        assert coordinator.update_interval.total_seconds() == 10
+        # One resync poll when the stream came up, one when it dropped
+        assert coordinator.async_request_refresh.await_count == 2
+        assert coordinator.stream.connects == 1
+        assert coordinator.stream.drops == 1
+        assert coordinator.stream.events == 1
+        assert coordinator.stream.changes == 1
+        assert coordinator.metrics.errors == {"stream": 1}
+
+    @pytest.mark.asyncio
+    async def test_unsupported_keeps_polling(self, coordinator: EconextCoordinator, mock_api: MagicMock) -> None:
+        """Test a gateway without a stream is not asked again."""
+        mock_api.async_stream_changes = MagicMock(side_effect=EconextUnsupportedError("404"))
+
+        await coordinator._async_run_stream()
+
+        assert coordinator.stream.supported is False
+        assert coordinator.update_interval.total_seconds() == 10
+        coordinator.async_request_refresh.assert_not_awaited()
+
+    def test_disabled(self, mock_hass: MagicMock, mock_api: MagicMock) -> None:
+        """Test the stream is not started unless push updates are on."""
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+
+        coordinator.async_start_stream()
+
+        mock_hass.async_create_background_task.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_against_gateway(
+        self,
+        mock_hass: MagicMock,
+        gateway_api: EconextApi,
+        fake_gateway: FakeGateway,
+    ) -> None:
+        """Test writes reach the coordinator through the stand-in gateway's stream and survive a drop."""
+        fake_gateway.stream = True
+        coordinator = EconextCoordinator(mock_hass, gateway_api, push_updates=True)
+        coordinator.data = await gateway_api.async_fetch_all_params()
+        coordinator.async_request_refresh = AsyncMock()
+        task = asyncio.create_task(coordinator._async_run_stream())
+        try:
+            await self._until(lambda: coordinator.streaming)
+            await gateway_api.async_set_param("HDWTSetPoint", 50)
+            await self._until(lambda: coordinator.data["103"]["value"] == 50)
+
+            await fake_gateway.async_drop_streams()
+            await self._until(lambda: not coordinator.streaming)
+            assert coordinator.update_interval.total_seconds() == 10
+        finally:
+            task.cancel()
+
+        assert coordinator.stream.drops == 1
+
+
+class TestPollMetrics:
+    """Test poll instrumentation in the coordinator."""
+
+    @pytest.mark.asyncio
+    async def test_update_records_fetch_and_changed_params(
+        self,
+        mock_hass: MagicMock,
+        mock_api: MagicMock,
+        all_params_parsed: dict,
+    ) -> None:
+        """Test a poll records the fetch stats and the number of changed values."""
+        new_params = {key: dict(param) for key, param in all_params_parsed.items()}
+        new_params["61"]["value"] = 50.0
+        new_params["92"]["value"] = 18.5
+        mock_api.async_fetch_all_params = AsyncMock(return_value=new_params)
+        mock_api.async_fetch_alarms = AsyncMock(return_value=[])
+        mock_api.last_fetch = FetchStats(latency_ms=95.0, bytes_received=300_000, decode_ms=5.0, mapping_ms=2.0)
+
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+        coordinator.data = all_params_parsed
+        await coordinator._async_update_data()
+
+        assert coordinator.metrics.polls == 1
+        assert coordinator.metrics.latency_ms.last == 95.0
+        assert coordinator.metrics.changed_params.last == 2
+
+    def test_update_listeners_records_fanout(self, mock_hass: MagicMock, mock_api: MagicMock) -> None:
+        """Test notifying listeners records how many were reached and wrote state."""
+        mock_hass.loop = MagicMock()  # Adding the first listener schedules a refresh
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+
+        def writing_listener() -> None:
+            coordinator.state_writes += 1
+
+        coordinator.async_add_listener(writing_listener)
+        coordinator.async_add_listener(lambda: None)
+        coordinator.async_update_listeners()
+
+        assert coordinator.metrics.entities_notified.last == 2
+        assert coordinator.metrics.state_writes.last == 1
+
+
+class TestWriteAndErrorCounters:
+    """Test the write statistics and gateway error counters."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_errors_counted_by_kind(self, mock_hass: MagicMock, mock_api: MagicMock) -> None:
+        """Test connection and API errors are counted separately."""
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+
+        for error in (EconextConnectionError("timeout"), EconextApiError("status 500")):
+            mock_api.async_fetch_all_params = AsyncMock(side_effect=error)
+            with pytest.raises(UpdateFailed):
+                await coordinator._async_update_data()
+
+        assert coordinator.metrics.errors == {"fetch_connection": 1, "fetch_api": 1}
+
+    @pytest.mark.asyncio
+    async def test_write_stats(self, mock_hass: MagicMock, mock_api: MagicMock, all_params_parsed: dict) -> None:
+        """Test batched writes count requested, skipped, written and failed values."""
+        mock_api.async_set_param = AsyncMock(side_effect=[True, EconextApiError("status 500")])
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+        coordinator.data = all_params_parsed
+        coordinator.async_set_updated_data = MagicMock()
+
+        with pytest.raises(EconextApiError):
+            await coordinator.async_set_params({"120": 0, "121": 1, "122": all_params_parsed["122"]["value"]})
+
+        writes = coordinator.metrics.writes
+        assert (writes.batches, writes.requested, writes.skipped_unchanged) == (1, 3, 1)
+        assert (writes.written, writes.failed) == (1, 1)
+        assert writes.last_error == "status 500"
+        assert coordinator.metrics.errors == {"write": 1}
+
+
+class TestLoadShedding:
+    """Test low-priority work is deferred while the event loop lags."""
+
+    @pytest.fixture
+    def coordinator(self, mock_hass: MagicMock, mock_api: MagicMock, all_params_parsed: dict) -> EconextCoordinator:
+        """Create a coordinator whose loop lag monitor reports pressure."""
+        mock_api.async_fetch_all_params = AsyncMock(return_value=all_params_parsed)
+        mock_api.async_fetch_alarms = AsyncMock(return_value=[{"code": 1, "to_date": None}])
+        mock_api.last_fetch = None
+        loop_lag = LoopLagMonitor(threshold_ms=100)
+        loop_lag.lag_ms.add(250)
+        coordinator = EconextCoordinator(mock_hass, mock_api, loop_lag=loop_lag)
+        coordinator.data = all_params_parsed
+        return coordinator
+
+    @pytest.mark.asyncio
+    async def test_alarm_fetch_deferred_for_a_while(self, coordinator: EconextCoordinator, mock_api: MagicMock) -> None:
+        """Test alarms are skipped while lagging, but fetched once the deferral limit passed."""
+        with patch("custom_components.econext.coordinator.time.monotonic", return_value=1000.0) as monotonic:
+            for _ in range(6):
+                await coordinator._async_update_data()
+            mock_api.async_fetch_alarms.assert_not_called()
+
+            monotonic.return_value += SHED_MAX_DEFER_SECONDS
+            await coordinator._async_update_data()
+            mock_api.async_fetch_alarms.assert_called_once()
+
+            # The next lagging poll starts a new deferral
+            await coordinator._async_update_data()
+            mock_api.async_fetch_alarms.assert_called_once()
+
+        assert coordinator.active_alarms
+        assert coordinator.metrics.polls_under_pressure == 8
+        assert coordinator.metrics.counters()["load_shedding"]["deferred"] == {"alarms": 7}
+
+    @pytest.mark.asyncio
+    async def test_no_deferral_without_pressure(self, coordinator: EconextCoordinator, mock_api: MagicMock) -> None:
+        """Test alarms are fetched on every poll once the lag is gone."""
+        for _ in range(10):
+            coordinator.loop_lag.lag_ms.add(1)
+        await coordinator._async_update_data()
+
+        mock_api.async_fetch_alarms.assert_called_once()
+        assert coordinator.metrics.polls_under_pressure == 0
+
+    def test_pushed_update_delivered_after_deferral_limit(self, coordinator: EconextCoordinator) -> None:
+        """Test an update skipped for a pushed change is delivered even if no other change follows."""
+        coordinator.streaming = True
+        coordinator.last_update_success = True
+        coordinator.hass.loop = MagicMock()
+        shed: list[bool] = []
+        removed: list[bool] = []
+
+        @callback
+        def _low_priority() -> None:
+            shed.append(coordinator.shedding)
+            if coordinator.shedding:
+                coordinator.async_defer_update(_low_priority)
+
+        @callback
+        def _removed() -> None:
+            removed.append(coordinator.shedding)
+            if coordinator.shedding:
+                coordinator.async_defer_update(_removed)
+
+        coordinator.async_add_listener(_low_priority)
+        remove = coordinator.async_add_listener(_removed)
+        with patch("custom_components.econext.coordinator.async_call_later") as call_later:
+            coordinator.async_apply_changes({"103": coordinator.data["103"]["value"] + 1})
+        remove()
+
+        assert shed == [True]
+        assert coordinator.metrics.deferred == {"entity_updates": 2}
+        assert call_later.call_args[0][1] == SHED_MAX_DEFER_SECONDS
+
+        call_later.call_args[0][2](None)
+
+        assert shed == [True, False]
+        assert removed == [True]
+        assert coordinator.shedding
+
+    def test_deferred_updates_dropped_once_delivered(self, coordinator: EconextCoordinator) -> None:
+        """Test an update reaching every listener cancels the pending delivery."""
+        coordinator.last_update_success = True
+        coordinator.hass.loop = MagicMock()
+        coordinator.async_add_listener(lambda: None)
+        with patch("custom_components.econext.coordinator.async_call_later") as call_later:
+            coordinator.async_defer_update(lambda: None)
+        for _ in range(10):
+            coordinator.loop_lag.lag_ms.add(1)
+
+        coordinator.async_update_listeners()
+
+        call_later.return_value.assert_called_once()
+        assert not coordinator._deferred_updates
+
+    @pytest.mark.asyncio
+    async def test_writes_delivered_while_shedding(self, coordinator: EconextCoordinator, mock_api: MagicMock) -> None:
+        """Test the update after a user's write reaches every listener."""
+        mock_api.async_set_param = AsyncMock(return_value=True)
+        shedding: list[bool] = []
+        coordinator.async_update_listeners = lambda: shedding.append(coordinator.shedding)
+
+        await coordinator.async_set_param("103", 50)
+
+        assert shedding == [False]
+        assert coordinator.shedding
+
+
+class TestScheduleTrackers:
+    """Test the schedule trackers shared by entities."""
+
+    @pytest.fixture
+    def track(self):
+        """Patch the point-in-time helper."""
+        with patch("custom_components.econext.schedule.async_track_point_in_time") as track:
+            yield track
+
+    def test_shared_and_fed_on_update(
+        self, mock_hass: MagicMock, mock_api: MagicMock, all_params_parsed: dict, track: MagicMock
+    ) -> None:
+        """Test entities of one schedule share a tracker that is re-armed when its words change."""
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+        coordinator.data = {key: dict(param) for key, param in all_params_parsed.items()}
+        param_ids = CIRCUITS[2].schedule_param_ids
+        first, unsubscribe_first = coordinator.async_track_schedule(param_ids, MagicMock())
+        second, unsubscribe_second = coordinator.async_track_schedule(param_ids, MagicMock())
+
+        assert first is second
+        assert track.call_count == 1
+
+        coordinator.async_update_listeners()
+        assert track.call_count == 1  # Unchanged words keep the timer
+
+        coordinator.data[param_ids[0][0]]["value"] ^= 1
+        coordinator.async_update_listeners()
+        assert track.call_count == 2
+
+        unsubscribe_first()
+        track.return_value.assert_called_once()  # Only the re-arm cancelled a timer
+        unsubscribe_second()
+        assert track.return_value.call_count == 2
+        assert coordinator.async_track_schedule(param_ids, MagicMock())[0] is not first
+
+
 class TestGetParam:
     """Test the get_param method."""
 
@@ -204,3 +678,72 @@ class TestDeviceInfo:
 
         name = coordinator.get_device_name()
         assert name == "ecoMAX360i"
+
+
+class TestSetParams:
+    """Test the batched async_set_params method."""
+
+    @pytest.mark.asyncio
+    async def test_writes_only_changed_values(
+        self,
+        mock_hass: MagicMock,
+        mock_api: MagicMock,
+        all_params_parsed: dict,
+    ) -> None:
+        """Test unchanged values are skipped and listeners are notified once."""
+        mock_api.async_set_param = AsyncMock(return_value=True)
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+        coordinator.data = all_params_parsed
+        coordinator.async_set_updated_data = MagicMock()
+
+        result = await coordinator.async_set_params({"120": 1792, "121": 7})
+
+        assert result is True
+        mock_api.async_set_param.assert_called_once_with("HDWSundayPM", 7)
+        assert coordinator.data["121"]["value"] == 7
+        coordinator.async_set_updated_data.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_no_changes(
+        self,
+        mock_hass: MagicMock,
+        mock_api: MagicMock,
+        all_params_parsed: dict,
+    ) -> None:
+        """Test nothing is written when all values match."""
+        mock_api.async_set_param = AsyncMock(return_value=True)
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+        coordinator.data = all_params_parsed
+
+        assert await coordinator.async_set_params({"120": 1792}) is True
+        mock_api.async_set_param.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unknown_param(self, mock_hass: MagicMock, mock_api: MagicMock, all_params_parsed: dict) -> None:
+        """Test unknown parameters are rejected before any write."""
+        mock_api.async_set_param = AsyncMock(return_value=True)
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+        coordinator.data = all_params_parsed
+
+        with pytest.raises(EconextApiError, match="Unknown parameter"):
+            await coordinator.async_set_params({"120": 1, "99999": 1})
+        mock_api.async_set_param.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_keeps_written_values(
+        self,
+        mock_hass: MagicMock,
+        mock_api: MagicMock,
+        all_params_parsed: dict,
+    ) -> None:
+        """Test values written before a failure are still applied locally."""
+        mock_api.async_set_param = AsyncMock(side_effect=[True, EconextApiError("boom")])
+        coordinator = EconextCoordinator(mock_hass, mock_api)
+        coordinator.data = all_params_parsed
+        coordinator.async_set_updated_data = MagicMock()
+
+        with pytest.raises(EconextApiError):
+            await coordinator.async_set_params({"120": 1, "121": 2})
+
+        assert coordinator.data["120"]["value"] == 1
+        coordinator.async_set_updated_data.assert_called_once()
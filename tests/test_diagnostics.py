@@ -0,0 +1,115 @@
+"""Tests for the econext diagnostics."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.components.diagnostics import REDACTED
+
+from custom_components.econext.coordinator import EconextCoordinator
+from custom_components.econext.diagnostics import async_get_config_entry_diagnostics
+from custom_components.econext.metrics import FetchStats
+
+
+@pytest.fixture(autouse=True)
+def patch_frame_helper():
+    """Patch Home Assistant frame helper for all tests."""
+    with patch("homeassistant.helpers.frame.report_usage"):
+        yield
+
+
+@pytest.fixture
+def coordinator(all_params_parsed: dict) -> EconextCoordinator:
+    """Create a coordinator with data."""
+    coordinator = EconextCoordinator(MagicMock(), MagicMock())
+    coordinator.data = all_params_parsed
+    return coordinator
+
+
+@pytest.fixture
+def entry() -> MagicMock:
+    """Create a mock config entry."""
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {"host": "192.168.1.100", "port": 8000}
+    return entry
+
+
+async def _get_diagnostics(coordinator: EconextCoordinator, entry: MagicMock, entities: list | None = None) -> dict:
+    """Run the diagnostics handler against a mocked hass and entity registry."""
+    hass = MagicMock()
+    hass.data = {"econext": {"test_entry": {"coordinator": coordinator}}}
+    with (
+        patch("custom_components.econext.diagnostics.er.async_get"),
+        patch(
+            "custom_components.econext.diagnostics.er.async_entries_for_config_entry",
+            return_value=entities or [],
+        ),
+    ):
+        return await async_get_config_entry_diagnostics(hass, entry)
+
+
+@pytest.mark.asyncio
+async def test_config_entry_diagnostics(coordinator: EconextCoordinator, entry: MagicMock) -> None:
+    """Test diagnostics include poll metrics and redact the host."""
+    coordinator.metrics.record_fetch(FetchStats(latency_ms=80.0, bytes_received=1000, decode_ms=2.0, mapping_ms=1.0))
+
+    result = await _get_diagnostics(coordinator, entry)
+
+    assert result["entry"] == {"host": REDACTED, "port": 8000}
+    assert result["poll_metrics"]["polls"] == 1
+    assert result["poll_metrics"]["latency_ms"]["last"] == 80.0
+    assert result["writes"]["batches"] == 0
+    assert result["errors"] == {}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_redacts_network_params(
+    coordinator: EconextCoordinator, entry: MagicMock, all_params_parsed: dict
+) -> None:
+    """Test the snapshot covers every parameter with WiFi and LAN details redacted."""
+    result = await _get_diagnostics(coordinator, entry)
+    snapshot = result["snapshot"]
+
+    assert snapshot["parameter_count"] == len(all_params_parsed)
+    assert snapshot["truncated"] is False
+    assert len(snapshot["parameters"]) == len(all_params_parsed)
+    for param_id in ("377", "379", "381", "860", "863"):
+        assert snapshot["parameters"][param_id]["value"] == REDACTED
+    assert snapshot["parameters"]["374"]["value"] == "ecoMAX360i"
+    # The live data is untouched
+    assert all_params_parsed["377"]["value"] != REDACTED
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_bounded(coordinator: EconextCoordinator, entry: MagicMock) -> None:
+    """Test the snapshot is capped for very large controllers."""
+    with patch("custom_components.econext.diagnostics.DIAGNOSTICS_MAX_PARAMS", 100):
+        result = await _get_diagnostics(coordinator, entry)
+
+    assert result["snapshot"]["truncated"] is True
+    assert len(result["snapshot"]["parameters"]) == 100
+
+
+@pytest.mark.asyncio
+async def test_alarms_entities_and_counters(coordinator: EconextCoordinator, entry: MagicMock) -> None:
+    """Test the alarm cache, entity plan and gateway counters are included."""
+    coordinator._alarms = [
+        {"index": 0, "code": 2, "from_date": "2026-02-06T10:00:00", "to_date": None},
+        {"index": 1, "code": 3, "from_date": "2026-02-05T10:00:00", "to_date": "2026-02-05T11:00:00"},
+    ]
+    coordinator.metrics.record_error("fetch_connection")
+    coordinator.metrics.writes.failed = 1
+    entities = [
+        MagicMock(domain="sensor", entity_id="sensor.a", unique_id="uid_a", disabled_by=None),
+        MagicMock(domain="sensor", entity_id="sensor.b", unique_id="uid_b", disabled_by="integration"),
+        MagicMock(domain="climate", entity_id="climate.c", unique_id="uid_c", disabled_by=None),
+    ]
+
+    result = await _get_diagnostics(coordinator, entry, entities)
+
+    assert result["alarms"]["count"] == 2
+    assert result["alarms"]["active_count"] == 1
+    assert result["entities"]["counts"] == {"climate": 1, "sensor": 2}
+    assert result["entities"]["platforms"]["sensor"][1]["disabled_by"] == "integration"
+    assert result["errors"] == {"fetch_connection": 1}
+    assert result["writes"]["failed"] == 1
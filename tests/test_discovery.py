@@ -0,0 +1,85 @@
+"""Tests for gateway discovery against stand-in gateways on loopback addresses."""
+
+from collections.abc import AsyncIterator
+from ipaddress import ip_network
+import time
+
+from aiohttp import ClientSession, web
+import pytest
+
+from custom_components.econext.discovery import DiscoveredGateway, async_discover_gateways, scan_network
+
+from .fake_gateway import FakeGateway, load_gateway_params
+
+
+@pytest.fixture
+async def gateways() -> AsyncIterator[list[FakeGateway]]:
+    """Serve two gateways on the same port of 127.0.0.2 and 127.0.0.3, with different UIDs."""
+    first = FakeGateway(drift_interval=None)
+    port = await first.async_start("127.0.0.2")
+    params = load_gateway_params()
+    # The UID is held twice; reads by name return the second
+    params["10"]["value"] = params["373"]["value"] = "SECONDGATEWAY"
+    second = FakeGateway(params, drift_interval=None)
+    await second.async_start("127.0.0.3", port)
+    yield [first, second]
+    await first.async_stop()
+    await second.async_stop()
+
+
+class TestScanNetwork:
+    """Test parsing the subnet to scan."""
+
+    def test_bare_address_means_its_24(self) -> None:
+        """Test an address scans the /24 around it."""
+        assert scan_network("192.168.1.57") == ip_network("192.168.1.0/24")
+
+    @pytest.mark.parametrize("network", ["10.0.0.0/8", "fe80::/64", "not a network"])
+    def test_rejected(self, network: str) -> None:
+        """Test oversized, IPv6 and malformed networks are rejected."""
+        with pytest.raises(ValueError):
+            scan_network(network)
+
+
+class TestDiscover:
+    """Test the concurrent sweep."""
+
+    @pytest.mark.asyncio
+    async def test_finds_gateways(self, gateways: list[FakeGateway]) -> None:
+        """Test every gateway in the subnet is found and identified, and nothing else."""
+        async with ClientSession() as session:
+            found = await async_discover_gateways(session, ip_network("127.0.0.0/29"), port=gateways[0].port)
+
+        assert found == [
+            DiscoveredGateway("127.0.0.2", gateways[0].port, "2L7SDPN6KQ38CIH2401K01U", "ecoMAX360i"),
+            DiscoveredGateway("127.0.0.3", gateways[0].port, "SECONDGATEWAY", "ecoMAX360i"),
+        ]
+        # Verified with the identity parameters only
+        assert all("/api/parameters" not in gateway.requests for gateway in gateways)
+
+    @pytest.mark.asyncio
+    async def test_other_server_ignored(self, gateways: list[FakeGateway]) -> None:
+        """Test an HTTP server that is not a gateway is skipped."""
+        runner = web.AppRunner(web.Application())
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.4", gateways[0].port).start()
+        try:
+            async with ClientSession() as session:
+                found = await async_discover_gateways(session, ip_network("127.0.0.4/32"), port=gateways[0].port)
+        finally:
+            await runner.cleanup()
+
+        assert found == []
+
+    @pytest.mark.asyncio
+    async def test_sweep_is_concurrent(self, gateways: list[FakeGateway]) -> None:
+        """Test a /24 with slow gateways takes about as long as the slowest, not the sum."""
+        for gateway in gateways:
+            gateway.faults.latency = 0.2
+
+        start = time.monotonic()
+        async with ClientSession() as session:
+            found = await async_discover_gateways(session, ip_network("127.0.0.0/24"), port=gateways[0].port)
+
+        assert len(found) == 2
+        assert time.monotonic() - start < 2
@@ -0,0 +1,353 @@
+"""Tests for the API client against the stand-in gateway over real HTTP."""
+
+import asyncio
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from custom_components.econext.api import (
+    EconextApi,
+    EconextApiError,
+    EconextConnectionError,
+    EconextUnsupportedError,
+    create_gateway_session,
+)
+from custom_components.econext.metrics import PoolStats
+from custom_components.econext.wire import binary_supported
+
+from .fake_gateway import FakeGateway, GatewayFaults
+
+
+class TestServing:
+    """Test the gateway serves the API the client expects."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_params(self, gateway_api: EconextApi, all_params_parsed: dict) -> None:
+        """Test all fixture parameters come back mapped to the integration format."""
+        params = await gateway_api.async_fetch_all_params()
+
+        assert len(params) == len(all_params_parsed)
+        assert params["10"]["value"] == "2L7SDPN6KQ38CIH2401K01U"
+        assert params["61"]["name"] == "TempCWU"
+        assert gateway_api.last_fetch.bytes_received > 0
+
+    @pytest.mark.asyncio
+    async def test_write_applied(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test a write is recorded and returned by the next poll."""
+        assert await gateway_api.async_set_param("HDWTSetPoint", 50)
+
+        params = await gateway_api.async_fetch_all_params()
+
+        assert list(fake_gateway.writes) == [("HDWTSetPoint", 50)]
+        assert params["103"]["value"] == 50
+
+    @pytest.mark.asyncio
+    async def test_write_unknown_name(self, gateway_api: EconextApi) -> None:
+        """Test writing an unknown parameter is rejected."""
+        with pytest.raises(EconextApiError, match="404"):
+            await gateway_api.async_set_param("NoSuchParam", 1)
+
+    @pytest.mark.asyncio
+    async def test_alarms(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test alarms added to the gateway are served newest first."""
+        fake_gateway.add_alarm(2, active=False)
+        fake_gateway.add_alarm(5)
+
+        alarms = await gateway_api.async_fetch_alarms()
+
+        assert [alarm["code"] for alarm in alarms] == [5, 2]
+        assert alarms[0]["to_date"] is None
+
+    @pytest.mark.asyncio
+    async def test_telemetry_drifts(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test telemetry moves between polls while settings and sentinels stay put."""
+        before = await gateway_api.async_fetch_all_params()
+        fake_gateway.tick(20)
+        after = await gateway_api.async_fetch_all_params()
+
+        changed = {key for key in before if before[key]["value"] != after[key]["value"]}
+        assert changed
+        assert all(isinstance(before[key]["value"], float) for key in changed)
+        assert all(before[key]["value"] != 999.0 for key in changed)
+        assert "103" not in changed
+
+    @pytest.mark.asyncio
+    async def test_read_single_param(self, fake_gateway: FakeGateway, gateway_api: EconextApi) -> None:
+        """Test the identity is read from its two parameters alone."""
+        info = await gateway_api.async_test_connection()
+
+        assert info == {"uid": "2L7SDPN6KQ38CIH2401K01U", "name": "ecoMAX360i", "param_count": None}
+        assert fake_gateway.requests == {"/api/parameters/UID": 1, "/api/parameters/Nazwa": 1}
+
+    @pytest.mark.asyncio
+    async def test_identity_from_recent_poll(self, fake_gateway: FakeGateway, gateway_api: EconextApi) -> None:
+        """Test a recent full fetch answers identity lookups without another request."""
+        await gateway_api.async_fetch_all_params()
+
+        info = await gateway_api.async_fetch_identity()
+
+        assert info["uid"] == "2L7SDPN6KQ38CIH2401K01U"
+        assert info["param_count"] == len(fake_gateway.params)
+        assert fake_gateway.requests == {"/api/parameters": 1}
+
+
+class TestFaults:
+    """Test injected faults surface as the client's errors."""
+
+    @pytest.mark.asyncio
+    async def test_server_error(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test a 5xx response raises an API error."""
+        fake_gateway.faults = GatewayFaults(error_rate=1.0)
+
+        with pytest.raises(EconextApiError, match="503"):
+            await gateway_api.async_fetch_all_params()
+
+    @pytest.mark.asyncio
+    async def test_truncated_body(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test a connection dropped mid-body raises a connection error."""
+        fake_gateway.faults = GatewayFaults(truncate_rate=1.0)
+
+        with pytest.raises(EconextConnectionError):
+            await gateway_api.async_fetch_all_params()
+
+    @pytest.mark.asyncio
+    async def test_latency(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test added latency shows up in the fetch timings."""
+        fake_gateway.faults = GatewayFaults(latency=0.05)
+
+        await gateway_api.async_fetch_all_params()
+
+        assert gateway_api.last_fetch.latency_ms >= 50
+
+    @pytest.mark.asyncio
+    async def test_hanging_request(self, fake_gateway: FakeGateway) -> None:
+        """Test a hanging request outlasts a client timeout."""
+        fake_gateway.faults = GatewayFaults(timeout_rate=1.0, hang_seconds=0.5)
+        timeout = aiohttp.ClientTimeout(total=0.1)
+
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(asyncio.TimeoutError):
+                await session.get(f"http://127.0.0.1:{fake_gateway.port}/api/alarms", timeout=timeout)
+
+    @pytest.mark.asyncio
+    async def test_probe(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test the probe succeeds on a healthy gateway and gives up on a hanging one within its timeout."""
+        await gateway_api.async_probe()
+        assert fake_gateway.requests["/api/parameters"] == 0
+
+        fake_gateway.faults = GatewayFaults(timeout_rate=1.0, hang_seconds=0.5)
+        gateway_api._probe_timeout = aiohttp.ClientTimeout(total=0.1)
+        with pytest.raises(EconextConnectionError, match="Probe failed"):
+            await gateway_api.async_probe()
+
+
+class TestCompression:
+    """Test compressed parameter payloads."""
+
+    @pytest.mark.asyncio
+    async def test_gzip(self, gateway_api: EconextApi, fake_gateway: FakeGateway, all_params_parsed: dict) -> None:
+        """Test a gzip payload is decompressed and both sizes are reported."""
+        fake_gateway.compress = True
+
+        params = await gateway_api.async_fetch_all_params()
+
+        assert len(params) == len(all_params_parsed)
+        stats = gateway_api.last_fetch
+        assert stats.encoding == "gzip"
+        assert stats.bytes_received * 5 < stats.bytes_decoded
+        assert stats.decompress_ms > 0
+
+    @pytest.mark.asyncio
+    async def test_deflate(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test deflate is served to a client that only accepts deflate."""
+        fake_gateway.compress = True
+
+        with patch("custom_components.econext.api.ACCEPT_ENCODING", "deflate"):
+            params = await gateway_api.async_fetch_all_params()
+
+        assert gateway_api.last_fetch.encoding == "deflate"
+        assert params["10"]["value"] == "2L7SDPN6KQ38CIH2401K01U"
+
+    @pytest.mark.asyncio
+    async def test_uncompressed(self, gateway_api: EconextApi) -> None:
+        """Test a gateway that does not compress is read as is."""
+        await gateway_api.async_fetch_all_params()
+
+        stats = gateway_api.last_fetch
+        assert stats.encoding == "identity"
+        assert stats.bytes_received == stats.bytes_decoded
+
+    @pytest.mark.asyncio
+    async def test_truncated_compressed_body(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test a compressed body cut off mid-transfer raises a connection error."""
+        fake_gateway.compress = True
+        fake_gateway.faults = GatewayFaults(truncate_rate=1.0)
+
+        with pytest.raises(EconextConnectionError):
+            await gateway_api.async_fetch_all_params()
+
+
+@pytest.mark.skipif(not binary_supported(), reason="msgpack not installed")
+class TestBinary:
+    """Test MessagePack parameter polls."""
+
+    @pytest.mark.asyncio
+    async def test_msgpack_polls(
+        self, gateway_api: EconextApi, fake_gateway: FakeGateway, all_params_parsed: dict
+    ) -> None:
+        """Test binary polls map to the same parameters as JSON and fetch the schema once."""
+        json_params = await gateway_api.async_fetch_all_params()
+        assert gateway_api.last_fetch.wire_format == "json"
+
+        fake_gateway.binary = True
+        for _ in range(2):
+            params = await gateway_api.async_fetch_all_params()
+
+        assert params == json_params
+        assert gateway_api.last_fetch.wire_format == "msgpack"
+        assert fake_gateway.requests["/api/schema"] == 1
+
+    @pytest.mark.asyncio
+    async def test_schema_change_refetches(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test a new schema id from the gateway refreshes the cached schema."""
+        fake_gateway.binary = True
+        await gateway_api.async_fetch_all_params()
+
+        fake_gateway.schema_id = "changed"
+        await gateway_api.async_fetch_all_params()
+
+        assert fake_gateway.requests["/api/schema"] == 2
+
+    @pytest.mark.asyncio
+    async def test_compressed_msgpack(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test binary polls can be compressed too."""
+        fake_gateway.binary = True
+        fake_gateway.compress = True
+
+        params = await gateway_api.async_fetch_all_params()
+
+        assert gateway_api.last_fetch.encoding == "gzip"
+        assert params["61"]["value"] == 45.9
+
+
+class TestCoalescing:
+    """Test concurrent fetches share one request."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fetches_share_request(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test overlapping parameter fetches send one request and get the same result."""
+        fake_gateway.faults.latency = 0.05
+
+        results = await asyncio.gather(*(gateway_api.async_fetch_all_params() for _ in range(3)))
+
+        assert fake_gateway.requests["/api/parameters"] == 1
+        assert results[0] is results[1] is results[2]
+        assert gateway_api.coalesced == {"parameters": 2}
+
+        await gateway_api.async_fetch_all_params()
+        assert fake_gateway.requests["/api/parameters"] == 2
+
+    @pytest.mark.asyncio
+    async def test_resources_not_mixed(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test parameters and alarms in flight together are separate requests."""
+        fake_gateway.faults.latency = 0.05
+
+        params, alarms, again = await asyncio.gather(
+            gateway_api.async_fetch_all_params(),
+            gateway_api.async_fetch_alarms(),
+            gateway_api.async_fetch_alarms(),
+        )
+
+        assert "10" in params
+        assert alarms is again
+        assert gateway_api.coalesced == {"alarms": 1}
+
+    @pytest.mark.asyncio
+    async def test_error_shared(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test every joined caller gets the error of the shared request."""
+        fake_gateway.faults = GatewayFaults(latency=0.05, error_rate=1.0)
+
+        results = await asyncio.gather(
+            *(gateway_api.async_fetch_all_params() for _ in range(2)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, EconextApiError) for result in results)
+        assert fake_gateway.requests["/api/parameters"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test cancelling the caller that started a fetch does not cancel it for the others."""
+        fake_gateway.faults.latency = 0.05
+        first = asyncio.create_task(gateway_api.async_fetch_all_params())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(gateway_api.async_fetch_all_params())
+        await asyncio.sleep(0)
+
+        first.cancel()
+
+        assert "10" in await second
+        assert fake_gateway.requests["/api/parameters"] == 1
+
+
+class TestStream:
+    """Test the pushed change stream."""
+
+    @pytest.mark.asyncio
+    async def test_changes_pushed(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test writes and drift reach an open stream as index-keyed values."""
+        fake_gateway.stream = True
+        stream = gateway_api.async_stream_changes()
+        try:
+            assert await anext(stream) == {}
+
+            await gateway_api.async_set_param("HDWTSetPoint", 50)
+            assert await anext(stream) == {"103": 50}
+
+            fake_gateway.tick(5)
+            drifted = await anext(stream)
+        finally:
+            await stream.aclose()
+
+        assert drifted
+        assert all(isinstance(value, float) for value in drifted.values())
+
+    @pytest.mark.asyncio
+    async def test_unsupported(self, gateway_api: EconextApi) -> None:
+        """Test a gateway without the stream endpoint is reported as such."""
+        with pytest.raises(EconextUnsupportedError):
+            await anext(gateway_api.async_stream_changes())
+
+    @pytest.mark.asyncio
+    async def test_dropped_by_gateway(self, gateway_api: EconextApi, fake_gateway: FakeGateway) -> None:
+        """Test the stream ends when the gateway closes it."""
+        fake_gateway.stream = True
+        stream = gateway_api.async_stream_changes()
+        assert await anext(stream) == {}
+
+        await fake_gateway.async_drop_streams()
+
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+
+
+class TestDedicatedSession:
+    """Test the per-gateway connection pool."""
+
+    @pytest.mark.asyncio
+    async def test_connection_reused(self, fake_gateway: FakeGateway) -> None:
+        """Test successive polls share one kept-alive connection."""
+        stats = PoolStats()
+        session = create_gateway_session(stats)
+        try:
+            api = EconextApi("127.0.0.1", fake_gateway.port, session, pool_stats=stats)
+            for _ in range(3):
+                await api.async_fetch_all_params()
+            await api.async_fetch_alarms()
+        finally:
+            await session.close()
+
+        assert stats.requests == 4
+        assert stats.connections_created == 1
+        assert stats.connections_reused == 3
+        assert stats.as_dict()["reuse_ratio"] == 0.75
@@ -0,0 +1,75 @@
+"""Tests for the event loop lag monitor."""
+
+import asyncio
+import time
+
+import pytest
+
+from custom_components.econext.loop_lag import LoopLagMonitor
+
+
+class TestPressure:
+    """Test when the loop counts as under pressure."""
+
+    def test_no_samples(self) -> None:
+        """Test the loop is not under pressure before anything was measured."""
+        assert not LoopLagMonitor().under_pressure
+
+    def test_median_over_threshold(self) -> None:
+        """Test pressure follows the median, so one slow callback does not trigger it."""
+        monitor = LoopLagMonitor(threshold_ms=100, window=5)
+        for lag in (1, 1, 500, 1, 1):
+            monitor.lag_ms.add(lag)
+        assert not monitor.under_pressure
+
+        for lag in (150, 200, 300):
+            monitor.lag_ms.add(lag)
+        assert monitor.under_pressure
+        assert monitor.as_dict()["under_pressure"] is True
+
+
+class TestSampling:
+    """Test lag measured on a running loop."""
+
+    @pytest.mark.asyncio
+    async def test_idle_loop(self) -> None:
+        """Test an idle loop shows next to no lag."""
+        monitor = LoopLagMonitor(interval=0.01, threshold_ms=50)
+        monitor.start(asyncio.get_running_loop())
+        await asyncio.sleep(0.1)
+        monitor.stop()
+
+        assert monitor.lag_ms.count >= 3
+        assert not monitor.under_pressure
+
+    @pytest.mark.asyncio
+    async def test_blocked_loop(self) -> None:
+        """Test callbacks held up by blocking work are measured as lag."""
+        monitor = LoopLagMonitor(interval=0.01, threshold_ms=50, window=3)
+        loop = asyncio.get_running_loop()
+        monitor.start(loop)
+        for _ in range(4):
+            # A blocking callback holds up the loop past the next sample
+            loop.call_soon(time.sleep, 0.1)
+            await asyncio.sleep(0)
+        monitor.stop()
+
+        assert monitor.lag_ms.percentile(50) >= 50
+        assert monitor.under_pressure
+
+    @pytest.mark.asyncio
+    async def test_stop(self) -> None:
+        """Test no samples are taken once stopped, and starting twice runs one timer."""
+        monitor = LoopLagMonitor(interval=0.01)
+        loop = asyncio.get_running_loop()
+        monitor.start(loop)
+        monitor.start(loop)
+        await asyncio.sleep(0.05)
+        monitor.stop()
+        count = monitor.lag_ms.count
+
+        await asyncio.sleep(0.05)
+
+        assert 1 <= count <= 6
+        assert monitor.lag_ms.count == count
+        assert monitor.as_dict()["running"] is False
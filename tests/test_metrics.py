@@ -0,0 +1,66 @@
+"""Tests for the econext poll metrics."""
+
+from custom_components.econext.metrics import FetchStats, PollMetrics, RollingHistogram
+
+
+class TestRollingHistogram:
+    """Test the RollingHistogram class."""
+
+    def test_empty(self) -> None:
+        """Test an empty histogram."""
+        histogram = RollingHistogram(10)
+
+        assert histogram.count == 0
+        assert histogram.last is None
+        assert histogram.percentile(50) is None
+        assert histogram.summary() == {"count": 0}
+
+    def test_summary(self) -> None:
+        """Test the summary of a window of samples."""
+        histogram = RollingHistogram(100)
+        for value in range(1, 101):
+            histogram.add(value)
+
+        summary = histogram.summary()
+        assert summary["count"] == 100
+        assert summary["last"] == 100
+        assert summary["min"] == 1
+        assert summary["mean"] == 50.5
+        assert summary["p50"] == 50
+        assert summary["p95"] == 95
+        assert summary["max"] == 100
+
+    def test_window_drops_oldest(self) -> None:
+        """Test only the most recent samples are kept."""
+        histogram = RollingHistogram(3)
+        for value in (100, 1, 2, 3):
+            histogram.add(value)
+
+        assert histogram.count == 3
+        assert histogram.summary()["max"] == 3
+
+
+class TestPollMetrics:
+    """Test the PollMetrics class."""
+
+    def test_record_fetch(self) -> None:
+        """Test a fetch feeds the network and parsing histograms."""
+        metrics = PollMetrics()
+        metrics.record_fetch(FetchStats(latency_ms=120.0, bytes_received=250_000, decode_ms=4.0, mapping_ms=1.5))
+
+        assert metrics.polls == 1
+        assert metrics.latency_ms.last == 120.0
+        assert metrics.bytes_received.last == 250_000
+        assert metrics.decode_ms.last == 4.0
+        assert metrics.mapping_ms.last == 1.5
+
+    def test_as_dict(self) -> None:
+        """Test the summary covers every histogram."""
+        metrics = PollMetrics()
+        metrics.record_fanout(entities_notified=300, state_writes=12)
+
+        summary = metrics.as_dict()
+        assert summary["polls"] == 0
+        assert summary["entities_notified"]["last"] == 300
+        assert summary["state_writes"]["last"] == 12
+        assert set(summary) == {"polls", *metrics.histograms()}
@@ -0,0 +1,149 @@
+"""Tests for the econext coordinator profiler."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.econext.api import EconextApi, EconextConnectionError
+from custom_components.econext.coordinator import EconextCoordinator
+from custom_components.econext.profiler import CoordinatorProfiler
+
+
+@pytest.fixture(autouse=True)
+def patch_frame_helper():
+    """Patch Home Assistant frame helper for all tests."""
+    with patch("homeassistant.helpers.frame.report_usage"):
+        yield
+
+
+@pytest.fixture
+def mock_hass(tmp_path: Path) -> MagicMock:
+    """Create a mock Home Assistant instance with a temporary config dir."""
+    hass = MagicMock()
+    hass.config.path = lambda name: str(tmp_path / name)
+
+    async def run_in_executor(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = run_in_executor
+    return hass
+
+
+class TestCoordinatorProfiler:
+    """Test the CoordinatorProfiler class."""
+
+    def test_counts_cycles(self) -> None:
+        """Test each started and ended cycle counts once."""
+        profiler = CoordinatorProfiler(2)
+
+        profiler.end_cycle()  # Nothing running, ignored
+        assert profiler.remaining == 2
+
+        for _ in range(2):
+            profiler.start_cycle()
+            profiler.end_cycle()
+
+        assert profiler.finished
+        profiler.start_cycle()  # Finished profilers stay off
+        profiler.end_cycle()
+        assert profiler.remaining == 0
+
+    @pytest.mark.asyncio
+    async def test_write_report(self, mock_hass: MagicMock, tmp_path: Path) -> None:
+        """Test the .prof file and the text report land in the config dir."""
+        profiler = CoordinatorProfiler(1)
+        profiler.start_cycle()
+        sorted(range(1000))
+        profiler.end_cycle()
+
+        prof_path, text_path = await profiler.async_write_report(mock_hass, "uid")
+
+        assert Path(prof_path).parent == tmp_path
+        assert Path(prof_path).stat().st_size > 0
+        report = Path(text_path).read_text()
+        assert "1 cycle(s)" in report
+        assert "cumulative" in report
+
+
+class TestCoordinatorProfiling:
+    """Test profiling wired into the coordinator."""
+
+    @pytest.fixture
+    def coordinator(self, mock_hass: MagicMock, all_params_parsed: dict) -> EconextCoordinator:
+        """Create a coordinator whose API returns the fixture."""
+        api = MagicMock(spec=EconextApi)
+        api.async_fetch_all_params = AsyncMock(return_value=all_params_parsed)
+        api.async_fetch_alarms = AsyncMock(return_value=[])
+        api.last_fetch = None
+        return EconextCoordinator(mock_hass, api)
+
+    @pytest.mark.asyncio
+    async def test_switches_off_after_cycles(self, coordinator: EconextCoordinator, mock_hass: MagicMock) -> None:
+        """Test the profiler covers N polls including fan-out, then detaches and writes."""
+        coordinator.async_start_profiling(2)
+        profiler = coordinator.profiler
+
+        for _ in range(2):
+            coordinator.data = await coordinator._async_update_data()
+            coordinator.async_update_listeners()
+
+        assert profiler.finished
+        assert coordinator.profiler is None
+        mock_hass.async_create_background_task.assert_called_once()
+        mock_hass.async_create_background_task.call_args[0][0].close()
+
+    @pytest.mark.asyncio
+    async def test_failed_poll_ends_cycle(self, coordinator: EconextCoordinator) -> None:
+        """Test a failed poll still closes its cycle."""
+        coordinator.api.async_fetch_all_params = AsyncMock(side_effect=EconextConnectionError("timeout"))
+        coordinator.async_start_profiling(3)
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        coordinator.last_update_success = False
+        coordinator._async_refresh_finished()
+
+        assert coordinator.profiler.remaining == 2
+
+    @pytest.mark.asyncio
+    async def test_overlapping_gateways(self, mock_hass: MagicMock, all_params_parsed: dict) -> None:
+        """Test profiling two gateways whose polls overlap never fails a poll."""
+
+        async def _fetch() -> dict:
+            await asyncio.sleep(0.01)
+            return all_params_parsed
+
+        coordinators = []
+        for _ in range(2):
+            api = MagicMock(spec=EconextApi)
+            api.async_fetch_all_params = AsyncMock(side_effect=_fetch)
+            api.async_fetch_alarms = AsyncMock(return_value=[])
+            api.last_fetch = None
+            coordinator = EconextCoordinator(mock_hass, api)
+            coordinator.async_start_profiling(2)
+            coordinators.append(coordinator)
+        first, second = coordinators
+
+        results = await asyncio.gather(*(coordinator._async_update_data() for coordinator in coordinators))
+        for coordinator, params in zip(coordinators, results, strict=True):
+            coordinator.data = params
+            coordinator.async_update_listeners()
+
+        assert results == [all_params_parsed, all_params_parsed]
+        assert (first.profiler.remaining, first.profiler.skipped) == (1, 0)
+        assert (second.profiler.remaining, second.profiler.skipped) == (2, 1)
+
+        # Polled on its own, the second gateway is profiled
+        second.data = await second._async_update_data()
+        second.async_update_listeners()
+        assert second.profiler.remaining == 1
+
+    def test_writes_do_not_count_as_cycles(self, coordinator: EconextCoordinator) -> None:
+        """Test listener updates outside a poll leave the profile untouched."""
+        coordinator.async_start_profiling(1)
+        coordinator.async_update_listeners()
+
+        assert coordinator.profiler.remaining == 1
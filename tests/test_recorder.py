@@ -0,0 +1,210 @@
+"""Tests for recording gateway sessions."""
+
+import asyncio
+from datetime import timedelta
+import gzip
+from pathlib import Path
+import json
+import threading
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.helpers.redact import REDACTED
+
+from custom_components.econext.api import EconextApi, EconextApiError
+from custom_components.econext.const import DIAGNOSTICS_REDACT_PARAMS
+from custom_components.econext.coordinator import EconextCoordinator
+from custom_components.econext.recorder import SessionRecorder, read_session
+
+from .fake_gateway import FakeGateway, GatewayFaults
+
+
+@pytest.fixture(autouse=True)
+def patch_frame_helper():
+    """Patch Home Assistant frame helper for all tests."""
+    with patch("homeassistant.helpers.frame.report_usage"):
+        yield
+
+
+class TestSessionRecorder:
+    """Test the SessionRecorder class."""
+
+    @pytest.mark.asyncio
+    async def test_records_in_order(self, tmp_path: Path) -> None:
+        """Test records queued while a batch is being written all land in order."""
+        recorder = SessionRecorder(tmp_path / "session.jsonl.gz")
+
+        for index in range(5):
+            recorder.record("alarms", 200, {"alarms": [], "index": index})
+        await recorder.async_close()
+        recorder.record("write", 500, {"name": "HDWTSetPoint", "value": 50})
+        await recorder.async_close()
+
+        records = list(read_session(recorder.path))
+        assert recorder.records == 6
+        assert [record["body"].get("index") for record in records[:5]] == [0, 1, 2, 3, 4]
+        assert records[5]["kind"] == "write"
+        assert records[5]["status"] == 500
+        assert all(record["t"] > 0 for record in records)
+
+    @pytest.mark.asyncio
+    async def test_serialized_in_executor(self, tmp_path: Path) -> None:
+        """Test recording leaves serializing the payload to the executor."""
+        recorder = SessionRecorder(tmp_path / "session.jsonl.gz")
+        dumps = json.dumps
+        threads: list[int] = []
+
+        def _dumps(*args: Any, **kwargs: Any) -> str:
+            threads.append(threading.get_ident())
+            return dumps(*args, **kwargs)
+
+        with patch("custom_components.econext.recorder.json.dumps", _dumps):
+            recorder.record("alarms", 200, {"alarms": [{"code": 7}]})
+            recorder.record("alarms", 200, {"alarms": []})
+            await recorder.async_close()
+
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+
+        assert [record["body"] for record in read_session(recorder.path)] == [{"alarms": [{"code": 7}]}, {"alarms": []}]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [None, OSError("disk full")])
+    async def test_close_after_batch_finished(self, tmp_path: Path, error: OSError | None) -> None:
+        """Test closing returns when the batch finished but its done callback has not run yet."""
+        recorder = SessionRecorder(tmp_path / "session.jsonl.gz")
+        batch = asyncio.get_running_loop().create_future()
+        batch.add_done_callback(recorder._write_done)
+        recorder._writing = batch
+        if error is None:
+            batch.set_result(None)
+        else:
+            batch.set_exception(error)
+
+        shield = asyncio.shield
+        waits = 0
+
+        def _counting_shield(future: asyncio.Future[None]) -> asyncio.Future[None]:
+            nonlocal waits
+            waits += 1
+            # Waiting again and again on the same finished batch never yields to the loop
+            assert waits < 10, "async_close spins on a finished batch"
+            return shield(future)
+
+        with patch("custom_components.econext.recorder.asyncio.shield", _counting_shield):
+            await recorder.async_close()
+
+        assert recorder._writing is None
+
+    def test_read_truncated(self, tmp_path: Path) -> None:
+        """Test a session cut off mid-batch yields the records before the damage."""
+        path = tmp_path / "session.jsonl.gz"
+        with gzip.open(path, "wt") as file:
+            file.write('{"t": 1, "kind": "alarms", "status": 200, "body": {"alarms": []}}\n')
+        complete = path.read_bytes()
+        with gzip.open(path, "at") as file:
+            file.write('{"t": 2, "kind": "alarms", "status": 200, "body": {"alarms": []}}\n')
+        path.write_bytes(path.read_bytes()[: len(complete) + 20])
+
+        assert [record["t"] for record in read_session(path)] == [1]
+
+
+class TestApiRecording:
+    """Test the API client passes gateway responses to the recorder."""
+
+    @pytest.mark.asyncio
+    async def test_records_responses(self, gateway_api: EconextApi, fake_gateway: FakeGateway, tmp_path: Path) -> None:
+        """Test polls, alarms, writes and failures are recorded."""
+        gateway_api.recorder = SessionRecorder(tmp_path / "session.jsonl.gz")
+
+        await gateway_api.async_fetch_all_params()
+        await gateway_api.async_fetch_alarms()
+        await gateway_api.async_set_param("HDWTSetPoint", 50)
+        fake_gateway.faults = GatewayFaults(error_rate=1.0)
+        with pytest.raises(EconextApiError):
+            await gateway_api.async_fetch_all_params()
+        await gateway_api.recorder.async_close()
+
+        records = list(read_session(gateway_api.recorder.path))
+        assert [(record["kind"], record["status"]) for record in records] == [
+            ("parameters", 200),
+            ("alarms", 200),
+            ("write", 200),
+            ("parameters", 503),
+        ]
+        assert records[0]["body"]["parameters"]["10"]["value"] == "2L7SDPN6KQ38CIH2401K01U"
+        assert records[2]["body"] == {"name": "HDWTSetPoint", "value": 50}
+        assert records[3]["body"] is None
+
+    @pytest.mark.asyncio
+    async def test_network_details_redacted(
+        self, gateway_api: EconextApi, fake_gateway: FakeGateway, all_params_parsed: dict, tmp_path: Path
+    ) -> None:
+        """Test the WiFi and network parameters never reach the session file."""
+        gateway_api.recorder = SessionRecorder(tmp_path / "session.jsonl.gz")
+        fake_gateway.stream = True
+        stream = gateway_api.async_stream_changes()
+        try:
+            assert await anext(stream) == {}
+            await gateway_api.async_fetch_all_params()
+            await gateway_api.async_set_param("SSID", "Pretty Fly for a WiFi")
+            assert await anext(stream) == {"377": "Pretty Fly for a WiFi"}
+        finally:
+            await stream.aclose()
+        await gateway_api.recorder.async_close()
+
+        with gzip.open(gateway_api.recorder.path, "rt", encoding="utf-8") as file:
+            raw = file.read()
+        for index in DIAGNOSTICS_REDACT_PARAMS:
+            assert json.dumps(all_params_parsed[index]["value"])[1:-1] not in raw
+        assert "Pretty Fly for a WiFi" not in raw
+
+        poll, write, change = list(read_session(gateway_api.recorder.path))
+        assert poll["body"]["parameters"]["379"]["value"] == REDACTED
+        assert poll["body"]["parameters"]["10"]["value"] == "2L7SDPN6KQ38CIH2401K01U"
+        assert write["body"] == {"name": "SSID", "value": REDACTED}
+        assert change["body"]["values"] == {"377": REDACTED}
+
+
+class TestCoordinatorRecording:
+    """Test starting and stopping recordings on the coordinator."""
+
+    @pytest.fixture
+    def coordinator(self, tmp_path: Path, all_params_parsed: dict) -> EconextCoordinator:
+        """Create a coordinator writing to a temporary config dir."""
+        hass = MagicMock()
+        hass.config.path = lambda name: str(tmp_path / name)
+        coordinator = EconextCoordinator(hass, MagicMock(spec=EconextApi, recorder=None))
+        coordinator.data = all_params_parsed
+        return coordinator
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, coordinator: EconextCoordinator, tmp_path: Path) -> None:
+        """Test a recording attaches a recorder and stops after the duration."""
+        with patch("custom_components.econext.coordinator.async_call_later") as call_later:
+            path = await coordinator.async_start_recording(timedelta(minutes=5))
+
+        assert path.parent == tmp_path
+        assert path.name.startswith("econext_session_2L7SDPN6KQ38CIH2401K01U_")
+        assert coordinator.api.recorder.path == path
+        assert call_later.call_args[0][1] == timedelta(minutes=5)
+
+        coordinator.api.recorder.record("alarms", 200, {"alarms": []})
+        await call_later.call_args[0][2](None)
+
+        assert coordinator.api.recorder is None
+        assert [record["kind"] for record in read_session(path)] == ["alarms"]
+
+    @pytest.mark.asyncio
+    async def test_restart_cancels_timer(self, coordinator: EconextCoordinator) -> None:
+        """Test starting a new recording stops the previous one and its timer."""
+        with patch("custom_components.econext.coordinator.async_call_later") as call_later:
+            await coordinator.async_start_recording(timedelta(minutes=5))
+            first_unsub = call_later.return_value
+            first = coordinator.api.recorder
+            call_later.return_value = MagicMock()
+            await coordinator.async_start_recording(timedelta(minutes=5))
+
+        first_unsub.assert_called_once()
+        assert coordinator.api.recorder is not first
@@ -0,0 +1,141 @@
+"""Tests for replaying recorded gateway sessions."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.econext.api import EconextConnectionError
+from custom_components.econext.coordinator import EconextCoordinator
+from custom_components.econext.replay import ReplayApi, async_replay
+
+
+@pytest.fixture(autouse=True)
+def patch_frame_helper():
+    """Patch Home Assistant frame helper for all tests."""
+    with patch("homeassistant.helpers.frame.report_usage"):
+        yield
+
+
+def _poll(t: float, value: float) -> dict:
+    return {
+        "t": t,
+        "kind": "parameters",
+        "status": 200,
+        "body": {"parameters": {"10": {"name": "UID", "value": "uid"}, "61": {"name": "TempCWU", "value": value}}},
+    }
+
+
+def _alarms(t: float, codes: list[int]) -> dict:
+    return {"t": t, "kind": "alarms", "status": 200, "body": {"alarms": [{"code": code} for code in codes]}}
+
+
+RECORDS = [
+    _poll(1000.0, 45.0),
+    _alarms(1000.1, []),
+    {"t": 1005.0, "kind": "parameters", "status": 503, "body": None},
+    _poll(1010.0, 45.5),
+    _alarms(1010.1, [7]),
+    {"t": 1012.0, "kind": "write", "status": 200, "body": {"name": "HDWTSetPoint", "value": 50}},
+    _poll(1020.0, 46.0),
+]
+
+
+def _changes(t: float, values: dict) -> dict:
+    return {"t": t, "kind": "changes", "status": 200, "body": {"type": "changes", "values": values}}
+
+
+PUSHED = [
+    _changes(999.0, {"61": 44.0}),
+    _poll(1000.0, 45.0),
+    _changes(1003.0, {"61": 45.2}),
+    _changes(1006.0, {"61": 45.4}),
+    _poll(1010.0, 45.5),
+    _changes(1015.0, {"61": 46.5}),
+]
+
+
+class TestReplayApi:
+    """Test the ReplayApi class."""
+
+    @pytest.mark.asyncio
+    async def test_serves_polls_in_order(self) -> None:
+        """Test successful polls are served mapped, in order, then the replay ends."""
+        api = ReplayApi(RECORDS, speed=None)
+
+        values = [(await api.async_fetch_all_params())["61"]["value"] for _ in range(api.polls)]
+
+        assert values == [45.0, 45.5, 46.0]
+        assert api.finished
+        assert api.last_fetch.bytes_received > 0
+        with pytest.raises(EconextConnectionError):
+            await api.async_fetch_all_params()
+
+    @pytest.mark.asyncio
+    async def test_alarms_follow_polls(self) -> None:
+        """Test alarms are the latest recorded before the current poll."""
+        api = ReplayApi(RECORDS, speed=None)
+
+        assert await api.async_fetch_alarms() == []
+        await api.async_fetch_all_params()
+        await api.async_fetch_all_params()
+        assert await api.async_fetch_alarms() == []
+        await api.async_fetch_all_params()
+        assert await api.async_fetch_alarms() == [{"code": 7}]
+
+    @pytest.mark.asyncio
+    async def test_paced(self) -> None:
+        """Test polls are held back to the recorded pace divided by the speed."""
+        api = ReplayApi(RECORDS, speed=200)
+
+        start = time.monotonic()
+        while not api.finished:
+            await api.async_fetch_all_params()
+
+        # 20 recorded seconds at 200x
+        assert time.monotonic() - start >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_changes_between_polls(self) -> None:
+        """Test pushed changes are served after the poll they followed, and none before the first poll."""
+        api = ReplayApi(PUSHED, speed=None)
+        served = []
+        while not api.finished:
+            await api.async_fetch_all_params()
+            served.append([changes async for changes in api.async_changes()])
+
+        assert served == [[{"61": 45.2}, {"61": 45.4}], [{"61": 46.5}]]
+
+    @pytest.mark.asyncio
+    async def test_writes_collected(self) -> None:
+        """Test writes succeed without a gateway."""
+        api = ReplayApi(RECORDS, speed=None)
+
+        assert await api.async_set_param("HDWTSetPoint", 50)
+        assert api.writes == [("HDWTSetPoint", 50)]
+
+
+@pytest.mark.asyncio
+async def test_async_replay_drives_coordinator() -> None:
+    """Test a replay refreshes the coordinator once per recorded poll."""
+    coordinator = EconextCoordinator(MagicMock(), MagicMock())
+    api = ReplayApi(RECORDS, speed=None)
+
+    assert await async_replay(coordinator, api) == 3
+    assert coordinator.get_param_value(61) == 46.0
+    assert coordinator.alarms == [{"code": 7}]
+    assert coordinator.metrics.polls == 3
+
+
+@pytest.mark.asyncio
+async def test_async_replay_applies_changes() -> None:
+    """Test pushed changes reach the coordinator through its change path."""
+    coordinator = EconextCoordinator(MagicMock(), MagicMock())
+    api = ReplayApi(PUSHED, speed=None)
+    seen: list[float] = []
+    coordinator.async_add_listener(lambda: seen.append(coordinator.get_param_value(61)))
+
+    assert await async_replay(coordinator, api) == 2
+    assert coordinator.get_param_value(61) == 46.5
+    assert coordinator.stream.changes == 3
+    assert seen == [45.0, 45.2, 45.4, 45.5, 46.5]
@@ -0,0 +1,223 @@
+"""Tests for the schedule codec."""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.econext.schedule import (
+    NO_ACTIVE_PERIODS,
+    ScheduleTracker,
+    day_mask,
+    day_ranges,
+    decode_day,
+    decode_week,
+    decode_word,
+    encode_ranges,
+    encode_week,
+    is_slot_active,
+    mask_runs,
+    next_transition,
+    slot_matrix,
+    split_day_mask,
+    week_slot,
+)
+
+TZ = ZoneInfo("Europe/Warsaw")
+
+# Sunday 06:00-08:00 and 17:00-18:00, rest of the week off
+WEEK = (encode_ranges(["06:00-08:00", "17:00-18:00"]), 0, 0, 0, 0, 0, 0)
+
+
+class TestMaskRuns:
+    """Test run detection on bitmasks."""
+
+    def test_empty(self) -> None:
+        """Test an empty mask has no runs."""
+        assert mask_runs(0) == ()
+
+    def test_runs(self) -> None:
+        """Test separate runs are found in order, end exclusive."""
+        assert mask_runs(0b0111_0011) == ((0, 2), (4, 7))
+
+    def test_full_word(self) -> None:
+        """Test a run reaching the top bit ends one past it."""
+        assert mask_runs(0xFFFFFF) == ((0, 24),)
+
+
+class TestDecode:
+    """Test decoding words into time ranges."""
+
+    def test_decode_word_am(self) -> None:
+        """Test decoding an AM word."""
+        assert decode_word(258048, is_am=True) == "06:00-09:00"
+
+    def test_decode_word_pm(self) -> None:
+        """Test decoding a PM word offsets by 12 hours."""
+        assert decode_word(0b11, is_am=False) == "12:00-13:00"
+
+    def test_decode_word_ignores_high_bits(self) -> None:
+        """Test bits above the 24 slots are ignored."""
+        assert decode_word(1 << 24 | 1) == "00:00-00:30"
+
+    def test_decode_word_empty(self) -> None:
+        """Test an empty word."""
+        assert decode_word(0) == NO_ACTIVE_PERIODS
+
+    def test_decode_day_keeps_noon_split(self) -> None:
+        """Test periods are not merged across noon."""
+        assert decode_day(0xFFFFFF, 0xFFFFFF) == "00:00-12:00, 12:00-24:00"
+
+    def test_decode_day_empty_half(self) -> None:
+        """Test an empty half is left out."""
+        assert decode_day(0, 0b11) == "12:00-13:00"
+        assert decode_day(0, 0) == NO_ACTIVE_PERIODS
+
+    def test_decode_week(self) -> None:
+        """Test 14 words decode into seven day masks."""
+        words = (1792, 252) + (0, 0) * 6
+        week = decode_week(words)
+        assert len(week) == 7
+        assert week[0] == 1792 | 252 << 24
+        assert encode_week(week) == words
+
+    def test_decode_week_wrong_length(self) -> None:
+        """Test a partial week is rejected."""
+        with pytest.raises(ValueError):
+            decode_week((0, 0))
+
+    def test_slot_matrix(self) -> None:
+        """Test day masks expand into a 7x48 grid."""
+        matrix = slot_matrix(decode_week((0b1, 1 << 23) + (0, 0) * 6))
+        assert len(matrix) == 7
+        assert all(len(row) == 48 for row in matrix)
+        assert [i for i, on in enumerate(matrix[0]) if on] == [0, 47]
+
+
+class TestEncode:
+    """Test encoding time ranges into masks."""
+
+    def test_round_trip(self) -> None:
+        """Test ranges survive an encode/decode round trip."""
+        ranges = ["06:00-08:30", "11:30-13:00", "22:00-24:00"]
+        mask = encode_ranges(ranges)
+        assert day_ranges(mask) == ranges
+        am, pm = split_day_mask(mask)
+        assert day_mask(am, pm) == mask
+
+    def test_overlapping_ranges_merge(self) -> None:
+        """Test overlapping periods merge into one."""
+        assert day_ranges(encode_ranges(["06:00-08:00", "07:00-09:00"])) == ["06:00-09:00"]
+
+    @pytest.mark.parametrize("period", ["06:15-08:00", "08:00-06:00", "0600-0800", "25:00-26:00", "24:30-24:30"])
+    def test_invalid_ranges(self, period: str) -> None:
+        """Test invalid periods raise ValueError."""
+        with pytest.raises(ValueError):
+            encode_ranges([period])
+
+
+class TestTransitions:
+    """Test locating the current slot and the next state change."""
+
+    def test_week_slot(self) -> None:
+        """Test Sunday is day 0 and slots are half hours."""
+        assert week_slot(datetime(2026, 2, 1, 0, 0, tzinfo=TZ)) == 0  # Sunday
+        assert week_slot(datetime(2026, 2, 2, 6, 45, tzinfo=TZ)) == 48 + 13  # Monday
+
+    def test_is_slot_active(self) -> None:
+        """Test the slot containing a time is looked up."""
+        assert is_slot_active(WEEK, datetime(2026, 2, 1, 7, 59, tzinfo=TZ))
+        assert not is_slot_active(WEEK, datetime(2026, 2, 1, 8, 0, tzinfo=TZ))
+
+    def test_next_transition_same_day(self) -> None:
+        """Test the next change is found at its slot boundary."""
+        assert next_transition(WEEK, datetime(2026, 2, 1, 5, 10, tzinfo=TZ)) == datetime(2026, 2, 1, 6, 0, tzinfo=TZ)
+        assert next_transition(WEEK, datetime(2026, 2, 1, 6, 10, tzinfo=TZ)) == datetime(2026, 2, 1, 8, 0, tzinfo=TZ)
+
+    def test_next_transition_wraps_week(self) -> None:
+        """Test the search wraps from Saturday to Sunday."""
+        assert next_transition(WEEK, datetime(2026, 2, 7, 23, 45, tzinfo=TZ)) == datetime(2026, 2, 8, 6, 0, tzinfo=TZ)
+
+    def test_next_transition_matches_slot_walk(self) -> None:
+        """Test the bit scan agrees with walking the week slot by slot."""
+        week = (0xF0F0F0F0F0F0, 0, 1, 1 << 47, 0xFFFFFFFFFFFF, 0x3, 0)
+        start = datetime(2026, 2, 1, 0, 0, tzinfo=TZ)  # Sunday 00:00
+        for slot in range(0, 336, 7):
+            when = start + timedelta(minutes=30 * slot + 5)
+            state = is_slot_active(week, when)
+            offset = 1
+            while is_slot_active(week, when + timedelta(minutes=30 * offset)) == state:
+                offset += 1
+            expected = when.replace(minute=when.minute - when.minute % 30) + timedelta(minutes=30 * offset)
+            assert next_transition(week, when) == expected
+
+    def test_next_transition_constant(self) -> None:
+        """Test a schedule that never changes has no transition."""
+        assert next_transition((0,) * 7, datetime(2026, 2, 1, tzinfo=TZ)) is None
+        assert next_transition((0xFFFFFFFFFFFF,) * 7, datetime(2026, 2, 1, tzinfo=TZ)) is None
+
+
+class TestScheduleTracker:
+    """Test the point-in-time schedule tracker."""
+
+    @pytest.fixture
+    def track(self):
+        """Patch the point-in-time helper."""
+        with patch("custom_components.econext.schedule.async_track_point_in_time") as track:
+            yield track
+
+    def test_arms_next_transition(self, track: MagicMock) -> None:
+        """Test updating the words evaluates the slot and arms one timer."""
+        tracker = ScheduleTracker(MagicMock())
+        with patch(
+            "custom_components.econext.schedule.dt_util.now", return_value=datetime(2026, 2, 1, 5, 0, tzinfo=TZ)
+        ):
+            tracker.async_update(encode_week(WEEK))
+
+        assert tracker.active is False
+        assert tracker.next_transition == datetime(2026, 2, 1, 6, 0, tzinfo=TZ)
+        track.assert_called_once()
+        assert track.call_args[0][2] == datetime(2026, 2, 1, 6, 0, tzinfo=TZ)
+
+    def test_rearms_only_on_change(self, track: MagicMock) -> None:
+        """Test unchanged words do not re-arm the timer."""
+        tracker = ScheduleTracker(MagicMock())
+        tracker.async_update(encode_week(WEEK))
+        tracker.async_update(encode_week(WEEK))
+        assert track.call_count == 1
+
+        tracker.async_update(encode_week((0xFF,) + WEEK[1:]))
+        assert track.call_count == 2
+        track.return_value.assert_called_once()  # Previous timer cancelled
+
+    def test_transition_fires_action(self, track: MagicMock) -> None:
+        """Test a transition flips the state, re-arms and calls back every listener."""
+        actions = [MagicMock(), MagicMock()]
+        tracker = ScheduleTracker(MagicMock())
+        for action in actions:
+            tracker.async_add_listener(action)
+        with patch(
+            "custom_components.econext.schedule.dt_util.now", return_value=datetime(2026, 2, 1, 5, 0, tzinfo=TZ)
+        ):
+            tracker.async_update(encode_week(WEEK))
+
+        transition = track.call_args[0][1]
+        # Fired slightly early; the boundary is still evaluated as reached
+        with patch(
+            "custom_components.econext.schedule.dt_util.now", return_value=datetime(2026, 2, 1, 5, 59, tzinfo=TZ)
+        ):
+            transition(datetime(2026, 2, 1, 5, 59, tzinfo=TZ))
+
+        for action in actions:
+            action.assert_called_once()
+        assert tracker.active is True
+        assert tracker.next_transition == datetime(2026, 2, 1, 8, 0, tzinfo=TZ)
+        assert track.call_count == 2
+
+    def test_missing_words(self, track: MagicMock) -> None:
+        """Test a missing schedule clears the state without arming."""
+        tracker = ScheduleTracker(MagicMock())
+        tracker.async_update(None)
+        assert tracker.active is None
+        track.assert_not_called()
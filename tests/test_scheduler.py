@@ -0,0 +1,127 @@
+"""Tests for the poll scheduler shared by all gateways."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.econext.api import EconextApi
+from custom_components.econext.coordinator import EconextCoordinator
+from custom_components.econext.scheduler import PollScheduler, ScheduledEntry
+
+
+async def _poll(entry: ScheduledEntry, starts: list[float], work: float = 0.0) -> None:
+    """Take a slot, note when it was granted and hold it for ``work`` seconds."""
+    async with entry.async_slot():
+        starts.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(work)
+
+
+class TestSpacing:
+    """Test the gap kept between fetch starts."""
+
+    def test_single_entry_not_delayed(self) -> None:
+        """Test one gateway alone is never held back."""
+        scheduler = PollScheduler(interval=10)
+        scheduler.add_entry("a")
+
+        assert scheduler.spacing == 0
+
+    def test_spread_over_interval_and_capped(self) -> None:
+        """Test the gap is the interval shared among entries, but not longer than the cap."""
+        scheduler = PollScheduler(interval=10, spacing_max=1.0)
+        for index in range(4):
+            scheduler.add_entry(str(index))
+        assert scheduler.spacing == 1.0
+
+        for index in range(4, 40):
+            scheduler.add_entry(str(index))
+        assert scheduler.spacing == 0.25
+
+        scheduler.remove_entry("0")
+        assert len(scheduler.entries) == 39
+
+
+class TestSlots:
+    """Test fetches through the scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_aligned_polls_staggered(self) -> None:
+        """Test dozens of entries polling at once start one spacing apart, at most two at a time."""
+        scheduler = PollScheduler(interval=0.4, max_concurrent=2)
+        entries = [scheduler.add_entry(str(index)) for index in range(40)]
+        starts: list[float] = []
+
+        await asyncio.gather(*(_poll(entry, starts, 0.005) for entry in entries))
+
+        # A late wake-up shortens the following gap, but no start comes before its turn
+        assert all(start - starts[0] >= index * scheduler.spacing * 0.95 for index, start in enumerate(starts))
+        assert scheduler.polls == 40
+        assert scheduler.delayed == 39
+        assert scheduler.peak_running <= 2
+        assert entries[-1].stagger_ms.last >= 300
+        assert entries[0].as_dict()["polls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_capped(self) -> None:
+        """Test fetches beyond the cap queue for a free slot."""
+        scheduler = PollScheduler(max_concurrent=2, spacing_max=0)
+        entries = [scheduler.add_entry(str(index)) for index in range(6)]
+
+        await asyncio.gather(*(_poll(entry, [], 0.02) for entry in entries))
+
+        assert scheduler.peak_running == 2
+        assert scheduler.running == 0
+        assert max(entry.queue_ms.last for entry in entries) >= 30
+        assert scheduler.as_dict()["per_entry"]["5"]["polls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_coordinator_fetches_in_slot(self, all_params_parsed: dict) -> None:
+        """Test the coordinator's parameter fetch holds a scheduler slot."""
+        scheduler = PollScheduler()
+        running: list[int] = []
+
+        async def _fetch() -> dict:
+            running.append(scheduler.running)
+            return all_params_parsed
+
+        api = MagicMock(spec=EconextApi)
+        api.async_fetch_all_params = AsyncMock(side_effect=_fetch)
+        api.async_fetch_alarms = AsyncMock(return_value=[])
+        api.last_fetch = None
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = EconextCoordinator(MagicMock(), api, scheduler_entry=scheduler.add_entry("a"))
+
+        await coordinator._async_update_data()
+
+        assert running == [1]
+        assert scheduler.entries["a"].polls == 1
+
+    @pytest.mark.asyncio
+    async def test_backing_off_coordinator_skips_slots(self, all_params_parsed: dict) -> None:
+        """Test a coordinator retrying an unreachable gateway fetches without taking a shared slot."""
+        scheduler = PollScheduler(max_concurrent=1)
+        healthy = scheduler.add_entry("healthy")
+        running: list[int] = []
+
+        async def _fetch() -> dict:
+            running.append(scheduler.running)
+            # A healthy gateway polls while the retry is still waiting for its answer
+            await _poll(healthy, [])
+            return all_params_parsed
+
+        api = MagicMock(spec=EconextApi)
+        api.async_fetch_all_params = AsyncMock(side_effect=_fetch)
+        api.async_fetch_alarms = AsyncMock(return_value=[])
+        api.last_fetch = None
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = EconextCoordinator(MagicMock(), api, scheduler_entry=scheduler.add_entry("a"))
+        coordinator.connection.record_failure()
+
+        async with asyncio.timeout(1):
+            await coordinator._async_update_data()
+
+        assert running == [0]
+        assert scheduler.entries["a"].as_dict()["unshared"] == 1
+        assert scheduler.entries["a"].polls == 0
+        assert healthy.polls == 1
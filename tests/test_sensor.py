@@ -1,5 +1,6 @@
 """Tests for the econext sensor platform."""
 
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -8,7 +9,7 @@ from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTemperature
 
 from custom_components.econext.const import CONTROLLER_SENSORS, DeviceType, EconextSensorEntityDescription
 from custom_components.econext.coordinator import EconextCoordinator
-from custom_components.econext.sensor import EconextSensor
+from custom_components.econext.sensor import EconextDataUpdateSensor, EconextSensor
 
 
 @pytest.fixture(autouse=True)
@@ -433,6 +434,34 @@ class TestCircuitSensors:
         # Unique ID should include circuit device_id
         assert "circuit_2" in sensor.unique_id
 
+    def test_active_preset_mode_follows_tracked_schedule(self, coordinator: EconextCoordinator) -> None:
+        """Test the active mode comes from the tracked schedule in auto mode only."""
+        from custom_components.econext.climate import CIRCUITS
+        from custom_components.econext.sensor import EconextActiveScheduleModeSensor
+
+        circuit = CIRCUITS[2]
+        description = EconextSensorEntityDescription(
+            key="active_preset_mode", param_id=circuit.work_state_param, device_type=DeviceType.CIRCUIT
+        )
+        sensor = EconextActiveScheduleModeSensor(
+            coordinator,
+            description,
+            circuit.eco_param,
+            circuit.comfort_param,
+            circuit.room_temp_setpoint_param,
+            device_id="circuit_2",
+            work_state_param_id=circuit.work_state_param,
+            schedule_param_ids=circuit.schedule_param_ids,
+        )
+        coordinator.data["92"]["value"] = coordinator.data["288"]["value"]  # Setpoint says comfort
+        sensor._schedule_tracker = MagicMock(active=False)
+
+        coordinator.data["286"]["value"] = 3  # Auto
+        assert sensor.native_value == "eco"
+
+        coordinator.data["286"]["value"] = 1  # Forced comfort, schedule not followed
+        assert sensor.native_value == "comfort"
+
 
 class TestScheduleBitfieldDecoder:
     """Test the decode_schedule_bitfield function."""
@@ -729,3 +758,100 @@ class TestScheduleDiagnosticSensor:
 
         sensor = EconextScheduleDiagnosticSensor(coordinator, description)
         assert sensor.native_value == "00:00-12:00, 12:00-24:00"
+
+
+class TestScheduleNextChangeSensor:
+    """Test the next schedule change timestamp sensor."""
+
+    def test_unique_id_and_device(self, coordinator: EconextCoordinator) -> None:
+        """Test the sensor sits on the schedule's device."""
+        from custom_components.econext.const import DHW_SCHEDULE
+        from custom_components.econext.sensor import EconextScheduleNextChangeSensor
+
+        sensor = EconextScheduleNextChangeSensor(coordinator, DHW_SCHEDULE)
+
+        assert sensor.unique_id == "2L7SDPN6KQ38CIH2401K01U_dhw_hdw_schedule_next_change"
+        assert sensor.device_class == SensorDeviceClass.TIMESTAMP
+
+    def test_native_value_without_tracker(self, coordinator: EconextCoordinator) -> None:
+        """Test the next change is computed from the words before a timer is armed."""
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+
+        from custom_components.econext.const import DHW_SCHEDULE
+        from custom_components.econext.sensor import EconextScheduleNextChangeSensor
+
+        # From fixture, Sunday AM (120) = 1792 -> 04:00-05:30
+        now = datetime(2026, 2, 1, 3, 10, tzinfo=ZoneInfo("Europe/Warsaw"))
+        sensor = EconextScheduleNextChangeSensor(coordinator, DHW_SCHEDULE)
+
+        with patch("custom_components.econext.sensor.dt_util.now", return_value=now):
+            assert sensor.native_value == now.replace(hour=4, minute=0)
+
+    def test_native_value_from_tracker(self, coordinator: EconextCoordinator) -> None:
+        """Test the tracked transition is reported once armed."""
+        from datetime import datetime
+
+        from custom_components.econext.const import DHW_SCHEDULE
+        from custom_components.econext.sensor import EconextScheduleNextChangeSensor
+
+        sensor = EconextScheduleNextChangeSensor(coordinator, DHW_SCHEDULE)
+        sensor._schedule_tracker = MagicMock(next_transition=datetime(2026, 2, 1, 4, 0), active=False)
+
+        assert sensor.native_value == datetime(2026, 2, 1, 4, 0)
+        assert sensor.extra_state_attributes == {"active": False}
+
+    def test_unavailable_when_word_missing(self, coordinator: EconextCoordinator) -> None:
+        """Test the sensor is unavailable if any schedule word is missing."""
+        from custom_components.econext.const import DHW_SCHEDULE
+        from custom_components.econext.sensor import EconextScheduleNextChangeSensor
+
+        coordinator.last_update_success = True
+        del coordinator.data["133"]
+        sensor = EconextScheduleNextChangeSensor(coordinator, DHW_SCHEDULE)
+
+        assert sensor.available is False
+        assert sensor.native_value is None
+
+
+class TestPollMetricSensor:
+    """Test the poll metric diagnostic sensors."""
+
+    def test_latest_sample_and_summary(self, coordinator: EconextCoordinator) -> None:
+        """Test the state is the latest sample and attributes hold the window summary."""
+        from custom_components.econext.const import POLL_METRIC_SENSORS
+        from custom_components.econext.metrics import FetchStats
+        from custom_components.econext.sensor import EconextPollMetricSensor
+
+        description = next(d for d in POLL_METRIC_SENSORS if d.key == "poll_latency")
+        sensor = EconextPollMetricSensor(coordinator, description)
+        assert sensor.native_value is None
+
+        for latency in (100.04, 80.0):
+            coordinator.metrics.record_fetch(
+                FetchStats(latency_ms=latency, bytes_received=1000, decode_ms=1.0, mapping_ms=1.0)
+            )
+
+        assert sensor.native_value == 80.0
+        assert sensor.extra_state_attributes["max"] == 100.04
+        assert sensor.entity_category == EntityCategory.DIAGNOSTIC
+        assert sensor.entity_registry_enabled_default is False
+        assert sensor.unique_id == "2L7SDPN6KQ38CIH2401K01U_poll_latency"
+
+
+class TestDataUpdateSensor:
+    """Test the last data update diagnostic sensor."""
+
+    def test_stays_available_while_polls_fail(self, coordinator: EconextCoordinator) -> None:
+        """Test the sensor reports the last successful poll and stays available after failures."""
+        sensor = EconextDataUpdateSensor(coordinator)
+        assert sensor.available is False
+
+        updated = datetime(2026, 2, 1, 12, 0, tzinfo=UTC)
+        coordinator.last_data_update = updated
+        coordinator.last_update_success = False
+        coordinator.connection.record_failure()
+
+        assert sensor.available is True
+        assert sensor.native_value == updated
+        assert sensor.extra_state_attributes == {"failed_polls": 1}
@@ -0,0 +1,91 @@
+"""Tests for the econext integration services."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.econext.const import DOMAIN, SERVICE_PROFILE, SERVICE_RECORD_SESSION
+from custom_components.econext.services import PROFILE_SCHEMA, RECORD_SESSION_SCHEMA, async_setup_services
+
+
+@pytest.fixture
+def hass() -> MagicMock:
+    """Create a mock Home Assistant instance with two loaded entries."""
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            "entry_1": {"coordinator": MagicMock()},
+            "entry_2": {"coordinator": MagicMock()},
+        }
+    }
+    return hass
+
+
+def _get_handler(hass: MagicMock, service: str):
+    """Register the services and return the handler of one."""
+    async_setup_services(hass)
+    for call in hass.services.async_register.call_args_list:
+        if call[0][1] == service:
+            return call[0][2]
+    raise AssertionError(f"{service} not registered")
+
+
+class TestProfileService:
+    """Test the econext.profile service."""
+
+    @pytest.mark.asyncio
+    async def test_profiles_all_controllers(self, hass: MagicMock) -> None:
+        """Test the service starts profiling on every loaded controller by default."""
+        handler = _get_handler(hass, SERVICE_PROFILE)
+
+        await handler(MagicMock(data=PROFILE_SCHEMA({"cycles": 5})))
+
+        for entry_data in hass.data[DOMAIN].values():
+            entry_data["coordinator"].async_start_profiling.assert_called_once_with(5)
+
+    @pytest.mark.asyncio
+    async def test_profiles_one_controller(self, hass: MagicMock) -> None:
+        """Test a config entry id limits profiling to that controller."""
+        handler = _get_handler(hass, SERVICE_PROFILE)
+
+        await handler(MagicMock(data=PROFILE_SCHEMA({"config_entry_id": "entry_2"})))
+
+        hass.data[DOMAIN]["entry_1"]["coordinator"].async_start_profiling.assert_not_called()
+        hass.data[DOMAIN]["entry_2"]["coordinator"].async_start_profiling.assert_called_once_with(3)
+
+    @pytest.mark.asyncio
+    async def test_unknown_entry(self, hass: MagicMock) -> None:
+        """Test an unknown config entry is rejected."""
+        handler = _get_handler(hass, SERVICE_PROFILE)
+
+        with pytest.raises(ServiceValidationError):
+            await handler(MagicMock(data=PROFILE_SCHEMA({"config_entry_id": "nope"})))
+
+
+class TestRecordSessionService:
+    """Test the econext.record_session service."""
+
+    @pytest.mark.asyncio
+    async def test_starts_recording(self, hass: MagicMock) -> None:
+        """Test the service records every loaded controller for the given minutes."""
+        handler = _get_handler(hass, SERVICE_RECORD_SESSION)
+        for entry_data in hass.data[DOMAIN].values():
+            entry_data["coordinator"].async_start_recording = AsyncMock()
+
+        await handler(MagicMock(data=RECORD_SESSION_SCHEMA({"duration": 15})))
+
+        for entry_data in hass.data[DOMAIN].values():
+            entry_data["coordinator"].async_start_recording.assert_awaited_once_with(timedelta(minutes=15))
+
+    @pytest.mark.asyncio
+    async def test_zero_stops_recording(self, hass: MagicMock) -> None:
+        """Test a duration of 0 stops the recording in progress."""
+        handler = _get_handler(hass, SERVICE_RECORD_SESSION)
+        coordinator = hass.data[DOMAIN]["entry_1"]["coordinator"]
+        coordinator.async_stop_recording = AsyncMock()
+
+        await handler(MagicMock(data=RECORD_SESSION_SCHEMA({"duration": 0, "config_entry_id": "entry_1"})))
+
+        coordinator.async_stop_recording.assert_awaited_once()
@@ -0,0 +1,179 @@
+"""Soak test: days of polls against the stand-in gateway on an accelerated clock.
+
+Drives the coordinator and every platform's entities through a simulated
+uptime (telemetry drift, alarms raised and cleared, optimistic writes and
+schedule edits) and samples traced memory and the live object count as it
+goes. The test fails if either grows steadily once the rolling poll metrics
+have filled up.
+
+Only runs with ``--soak``; ``--soak-days`` sets the simulated uptime:
+
+    pytest tests/test_soak.py --soak --soak-days 2
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import gc
+import itertools
+import json
+import statistics
+import tracemalloc
+
+import aiohttp
+import pytest
+from homeassistant.util import dt as dt_util
+
+from benchmarks.common import gateway_payload, seven_circuit_params
+from benchmarks.run import Environment, stub_state_machine
+from custom_components.econext.api import EconextApi
+from custom_components.econext.climate import CIRCUITS
+from custom_components.econext.const import METRICS_WINDOW, UPDATE_INTERVAL
+
+from .fake_gateway import FakeGateway
+
+# Steady growth beyond these over the measured part of a run fails the soak
+MAX_MEMORY_GROWTH = 256 * 1024
+MAX_OBJECT_GROWTH = 1000
+
+SAMPLES = 40
+
+# Scenario, in polls
+ALARM_EVERY = 360
+ALARM_CLEARED_AFTER = 60
+ALARMS_KEPT = 30
+WRITE_EVERY = 30
+SCHEDULE_WRITE_EVERY = 90
+
+
+def is_steady_growth(samples: list[float], threshold: float) -> bool:
+    """Return True if the samples grow quarter over quarter by more than ``threshold`` overall.
+
+    Comparing quarter medians ignores the short spikes of garbage that has
+    not been collected yet; only growth that persists throughout the run
+    counts.
+    """
+    if len(samples) < 4:
+        return False
+    size = len(samples) // 4
+    medians = [statistics.median(samples[index * size : (index + 1) * size]) for index in range(4)]
+    rising = all(later > earlier for earlier, later in itertools.pairwise(medians))
+    return rising and medians[-1] - medians[0] > threshold
+
+
+class TestSteadyGrowth:
+    """Test the growth detector itself."""
+
+    def test_flat_with_noise(self) -> None:
+        """Test noise around a plateau is not growth."""
+        assert not is_steady_growth([1000, 1500, 900, 1200] * 10, threshold=100)
+
+    def test_steady_growth(self) -> None:
+        """Test a steady climb beyond the threshold is growth."""
+        assert is_steady_growth([1000 + 50 * index for index in range(40)], threshold=1000)
+
+    def test_small_growth(self) -> None:
+        """Test a climb below the threshold is tolerated."""
+        assert not is_steady_growth([1000 + index for index in range(40)], threshold=1000)
+
+
+@dataclass
+class Clock:
+    """A wall clock that only moves when told to."""
+
+    now: datetime = field(default_factory=lambda: datetime(2026, 1, 5, 6, 0, tzinfo=dt_util.UTC))
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self.now += timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    """Replace Home Assistant's clock with one the soak advances per poll."""
+    clock = Clock()
+    monkeypatch.setattr(dt_util, "now", lambda time_zone=None: clock.now)
+    monkeypatch.setattr(dt_util, "utcnow", lambda: clock.now)
+    return clock
+
+
+@pytest.fixture
+async def soak_gateway() -> Iterator[FakeGateway]:
+    """Serve a seven-circuit controller from the stand-in gateway."""
+    params = json.loads(gateway_payload(seven_circuit_params()))["parameters"]
+    gateway = FakeGateway(params, drift_interval=None, seed=0)
+    await gateway.async_start()
+    yield gateway
+    await gateway.async_stop()
+
+
+async def _async_scenario(env: Environment, gateway: FakeGateway, poll: int) -> None:
+    """Apply the events due at a poll."""
+    coordinator = env.coordinator
+    gateway.tick()
+
+    if poll % ALARM_EVERY == 0:
+        gateway.add_alarm(code=poll // ALARM_EVERY % 20 + 1)
+        del gateway.alarms[ALARMS_KEPT:]
+    if poll % ALARM_EVERY == ALARM_CLEARED_AFTER and gateway.alarms:
+        gateway.alarms[0]["to_date"] = dt_util.now().isoformat()
+
+    if poll % WRITE_EVERY == 0:
+        await coordinator.async_set_param("103", 45 + poll // WRITE_EVERY % 5)
+    if poll % SCHEDULE_WRITE_EVERY == 0:
+        param_ids = CIRCUITS[2].schedule_param_ids
+        shift = poll // SCHEDULE_WRITE_EVERY % 8
+        week = [((1 << 12) - 1) << (12 + shift)] * 7
+        await coordinator.async_set_params(coordinator.build_schedule_values(param_ids, week))
+
+
+def _sample() -> tuple[int, int]:
+    """Return the traced memory and live object count after a full collection."""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0], len(gc.get_objects())
+
+
+@pytest.mark.soak
+@pytest.mark.asyncio
+async def test_soak(request: pytest.FixtureRequest, clock: Clock, soak_gateway: FakeGateway) -> None:
+    """Test memory and object counts plateau over a long simulated uptime."""
+    polls = int(request.config.getoption("--soak-days") * 86400 / UPDATE_INTERVAL)
+    # Skip the warm-up while the rolling metrics and caches fill
+    warmup = max(METRICS_WINDOW, polls // 10)
+    sample_every = max((polls - warmup) // SAMPLES, 1)
+
+    memory: list[float] = []
+    objects: list[float] = []
+
+    with stub_state_machine():
+        env = Environment(seven_circuit_params())
+        await env.async_add_entities()
+        coordinator = env.coordinator
+        # The soak drives refreshes itself
+        coordinator.update_interval = None
+
+        async with aiohttp.ClientSession() as session:
+            coordinator.api = EconextApi("127.0.0.1", soak_gateway.port, session)
+            tracemalloc.start()
+            try:
+                for poll in range(polls):
+                    clock.advance(UPDATE_INTERVAL)
+                    await _async_scenario(env, soak_gateway, poll)
+                    await coordinator.async_refresh()
+                    assert coordinator.last_update_success
+
+                    if poll == warmup:
+                        baseline = tracemalloc.take_snapshot()
+                    if poll >= warmup and (poll - warmup) % sample_every == 0:
+                        current, count = _sample()
+                        memory.append(current)
+                        objects.append(count)
+
+                top = tracemalloc.take_snapshot().compare_to(baseline, "lineno")[:10]
+            finally:
+                tracemalloc.stop()
+
+    growth = "\n".join(str(stat) for stat in top)
+    assert not is_steady_growth(memory, MAX_MEMORY_GROWTH), f"Traced memory keeps growing: {memory}\n{growth}"
+    assert not is_steady_growth(objects, MAX_OBJECT_GROWTH), f"Object count keeps growing: {objects}\n{growth}"
+    assert coordinator.metrics.writes.failed == 0
@@ -4,8 +4,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from custom_components.econext.const import CONTROLLER_SWITCHES, EconextSwitchEntityDescription
+from custom_components.econext.const import CONTROLLER_SWITCHES, SHED_MAX_DEFER_SECONDS, EconextSwitchEntityDescription
 from custom_components.econext.coordinator import EconextCoordinator
+from custom_components.econext.loop_lag import LoopLagMonitor
 from custom_components.econext.switch import EconextSwitch
 
 
@@ -331,3 +332,41 @@ class TestBitfieldSwitches:
 
         # Should set bit 20 (inverted logic): 0 | 1048576 = 1048576
         coordinator.async_set_param.assert_called_once_with("231", 1048576)
+
+
+class TestLoadShedding:
+    """Test switch updates are deferred while the event loop lags."""
+
+    def test_updates_deferred_until_delivered(self, coordinator: EconextCoordinator) -> None:
+        """Test a switch skips updates while shedding until the coordinator delivers them."""
+        coordinator.loop_lag = LoopLagMonitor(threshold_ms=100)
+        coordinator.loop_lag.lag_ms.add(250)
+        switch = EconextSwitch(coordinator, CONTROLLER_SWITCHES[0])
+        switch.async_write_ha_state = MagicMock()
+        coordinator.async_add_listener(switch._handle_coordinator_update)
+
+        with patch("custom_components.econext.coordinator.async_call_later") as call_later:
+            for _ in range(7):
+                switch._handle_coordinator_update()
+
+        switch.async_write_ha_state.assert_not_called()
+        assert coordinator.metrics.deferred == {"entity_updates": 7}
+        call_later.assert_called_once()
+        assert call_later.call_args[0][1] == SHED_MAX_DEFER_SECONDS
+
+        call_later.call_args[0][2](None)
+
+        switch.async_write_ha_state.assert_called_once()
+
+    def test_updates_flow_without_pressure(self, coordinator: EconextCoordinator) -> None:
+        """Test every update is written when the loop keeps up."""
+        coordinator.loop_lag = LoopLagMonitor(threshold_ms=100)
+        coordinator.loop_lag.lag_ms.add(5)
+        switch = EconextSwitch(coordinator, CONTROLLER_SWITCHES[0])
+        switch.async_write_ha_state = MagicMock()
+
+        switch._handle_coordinator_update()
+        switch._handle_coordinator_update()
+
+        assert switch.async_write_ha_state.call_count == 2
+        assert not coordinator.metrics.deferred
@@ -0,0 +1,142 @@
+"""Tests for the econext websocket API."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant
+
+from custom_components.econext.api import EconextApiError
+from custom_components.econext.coordinator import EconextCoordinator
+from custom_components.econext.websocket_api import ws_get_schedules, ws_set_schedules
+
+
+@pytest.fixture(autouse=True)
+def patch_frame_helper():
+    """Patch Home Assistant frame helper for all tests."""
+    with patch("homeassistant.helpers.frame.report_usage"):
+        yield
+
+
+@pytest.fixture
+def mock_hass() -> MagicMock:
+    """Create a mock Home Assistant instance."""
+    hass = MagicMock(spec=HomeAssistant)
+    hass.data = {}
+    return hass
+
+
+@pytest.fixture
+def coordinator(mock_hass: MagicMock, all_params_parsed: dict) -> EconextCoordinator:
+    """Create a coordinator with data, registered under a config entry."""
+    coordinator = EconextCoordinator(mock_hass, MagicMock())
+    coordinator.data = all_params_parsed
+    coordinator.async_set_params = AsyncMock(return_value=True)
+    mock_hass.data["econext"] = {"test_entry": {"coordinator": coordinator}}
+    return coordinator
+
+
+@pytest.fixture
+def connection() -> MagicMock:
+    """Create a mock websocket connection."""
+    return MagicMock()
+
+
+class TestGetSchedules:
+    """Test the econext/schedules/get command."""
+
+    def test_returns_all_schedules(self, mock_hass: MagicMock, coordinator, connection: MagicMock) -> None:
+        """Test every schedule comes back in one message."""
+        ws_get_schedules(mock_hass, connection, {"id": 1, "type": "econext/schedules/get"})
+
+        connection.send_result.assert_called_once()
+        result = connection.send_result.call_args[0][1]
+        schedules = result["schedules"]
+        assert set(schedules) == {
+            "dhw_hdw_schedule",
+            "heatpump_heatpump_schedule",
+            "heatpump_silent_mode_schedule",
+            "circuit_2_schedule",
+        }
+        # From fixture, DHW Sunday AM (120) = 1792 and PM (121) = 252
+        assert schedules["dhw_hdw_schedule"]["slots"][0] == 1792 | 252 << 24
+        assert schedules["circuit_2_schedule"]["device"] == "circuit_2"
+        assert len(schedules["circuit_2_schedule"]["slots"]) == 7
+
+    def test_unknown_entry(self, mock_hass: MagicMock, coordinator, connection: MagicMock) -> None:
+        """Test an unknown entry id returns an error."""
+        ws_get_schedules(mock_hass, connection, {"id": 1, "type": "econext/schedules/get", "entry_id": "nope"})
+
+        connection.send_error.assert_called_once()
+        assert connection.send_error.call_args[0][1] == websocket_api.ERR_NOT_FOUND
+
+    def test_entry_required_with_several_entries(
+        self, mock_hass: MagicMock, coordinator, connection: MagicMock
+    ) -> None:
+        """Test the entry id may only be left out with a single entry."""
+        mock_hass.data["econext"]["other_entry"] = {"coordinator": coordinator}
+
+        ws_get_schedules(mock_hass, connection, {"id": 1, "type": "econext/schedules/get"})
+        connection.send_error.assert_called_once()
+
+        ws_get_schedules(mock_hass, connection, {"id": 2, "type": "econext/schedules/get", "entry_id": "other_entry"})
+        connection.send_result.assert_called_once()
+
+
+class TestSetSchedules:
+    """Test the econext/schedules/set command."""
+
+    @pytest.mark.asyncio
+    async def test_writes_all_schedules_in_one_batch(
+        self, mock_hass: MagicMock, coordinator: EconextCoordinator, connection: MagicMock
+    ) -> None:
+        """Test edits to several schedules go out as one batched write."""
+        week = [0xFFFFFF] + [0] * 6
+        msg = {
+            "id": 1,
+            "type": "econext/schedules/set",
+            "schedules": {"dhw_hdw_schedule": week, "circuit_2_schedule": week},
+        }
+
+        await ws_set_schedules.__wrapped__(mock_hass, connection, msg)
+
+        coordinator.async_set_params.assert_called_once()
+        values = coordinator.async_set_params.call_args[0][0]
+        assert len(values) == 28
+        assert values["120"] == 0xFFFFFF
+        assert values["297"] == 0xFFFFFF
+        assert values["298"] == 0
+        connection.send_result.assert_called_once_with(1, {"success": True})
+
+    @pytest.mark.asyncio
+    async def test_unknown_schedule(
+        self, mock_hass: MagicMock, coordinator: EconextCoordinator, connection: MagicMock
+    ) -> None:
+        """Test an unknown schedule id is rejected without writing anything."""
+        msg = {"id": 1, "type": "econext/schedules/set", "schedules": {"circuit_5_schedule": [0] * 7}}
+
+        await ws_set_schedules.__wrapped__(mock_hass, connection, msg)
+
+        coordinator.async_set_params.assert_not_called()
+        assert connection.send_error.call_args[0][1] == websocket_api.ERR_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_write_error(
+        self, mock_hass: MagicMock, coordinator: EconextCoordinator, connection: MagicMock
+    ) -> None:
+        """Test a gateway error is reported back to the frontend."""
+        coordinator.async_set_params = AsyncMock(side_effect=EconextApiError("status 500"))
+        msg = {"id": 1, "type": "econext/schedules/set", "schedules": {"dhw_hdw_schedule": [0] * 7}}
+
+        await ws_set_schedules.__wrapped__(mock_hass, connection, msg)
+
+        assert connection.send_error.call_args[0][1] == websocket_api.ERR_HOME_ASSISTANT_ERROR
+
+    def test_schema_requires_full_week(self) -> None:
+        """Test a week must have exactly seven day masks."""
+        schema = ws_set_schedules._ws_schema
+        with pytest.raises(vol.Invalid):
+            schema({"id": 1, "type": "econext/schedules/set", "schedules": {"dhw_hdw_schedule": [0] * 6}})
+        with pytest.raises(vol.Invalid):
+            schema({"id": 1, "type": "econext/schedules/set", "schedules": {"dhw_hdw_schedule": [1 << 48] * 7}})
@@ -0,0 +1,52 @@
+"""Tests for the binary wire format."""
+
+import pytest
+
+from custom_components.econext.api import map_gateway_params
+from custom_components.econext.wire import ParameterSchema, binary_supported, unpack
+
+from .fake_gateway import SCHEMA_FIELDS, load_gateway_params
+
+
+@pytest.fixture
+def gateway_params() -> dict:
+    """Return the fixture in the gateway format."""
+    return load_gateway_params()
+
+
+@pytest.fixture
+def schema(gateway_params: dict) -> ParameterSchema:
+    """Return a schema of the fixture parameters."""
+    return ParameterSchema(
+        "abc", [{field: param[field] for field in SCHEMA_FIELDS} for param in gateway_params.values()]
+    )
+
+
+def test_map_values_matches_json(schema: ParameterSchema, gateway_params: dict) -> None:
+    """Test positional values map to the same parameters as the JSON payload."""
+    values = [param["value"] for param in gateway_params.values()]
+
+    assert schema.map_values(values) == map_gateway_params({"parameters": gateway_params})
+
+
+def test_map_values_length_mismatch(schema: ParameterSchema) -> None:
+    """Test a value array of the wrong length is rejected."""
+    with pytest.raises(ValueError, match=f"Expected {len(schema)} values, got 2"):
+        schema.map_values([1, 2])
+
+
+def test_gateway_format_round_trip(schema: ParameterSchema, gateway_params: dict) -> None:
+    """Test the rebuilt JSON payload maps to the same parameters, so recorded sessions replay."""
+    values = [param["value"] for param in gateway_params.values()]
+
+    payload = schema.gateway_format("2026-02-06T12:00:00", values)
+
+    assert payload["timestamp"] == "2026-02-06T12:00:00"
+    assert map_gateway_params(payload) == schema.map_values(values)
+
+
+@pytest.mark.skipif(not binary_supported(), reason="msgpack not installed")
+def test_unpack_invalid() -> None:
+    """Test a corrupt body raises ValueError."""
+    with pytest.raises(ValueError):
+        unpack(b"\xc1")